@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.core.database import get_db
-from app.core.auth import create_access_token, verify_password, get_password_hash, get_current_user
+from app.core.database import get_async_db
+from app.core.auth import (
+    create_access_token, verify_password_async, get_password_hash_async, verify_and_update_password,
+    get_current_user, invalidate_principal
+)
 from app.models import User, Profile
+from app.services.user_directory import invalidate_user_directory
 from app.schemas import UserCreate, UserLogin, Token, ProfileResponse
 from pydantic import BaseModel
 
@@ -14,10 +19,11 @@ class ChangePasswordRequest(BaseModel):
     new_password: str
 
 @router.post("/register", response_model=ProfileResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    result = await db.execute(select(User).filter(User.email == user.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -25,7 +31,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         password_hash=hashed_password,
@@ -33,8 +39,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         is_verified=True
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Create profile
     db_profile = Profile(
@@ -42,23 +48,33 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         email=user.email
     )
     db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
+    await db.commit()
+    await db.refresh(db_profile)
+    invalidate_user_directory()
     
     return db_profile
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user and return access token."""
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    result = await db.execute(select(User).filter(User.email == user_credentials.email))
+    user = result.scalars().first()
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_and_update_password(user_credentials.password, user.password_hash)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently upgrade hashes made with a different bcrypt cost
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -73,9 +89,10 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=ProfileResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_current_user_profile(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """Get current user profile."""
-    profile = db.query(Profile).filter(Profile.email == current_user.email).first()
+    result = await db.execute(select(Profile).filter(Profile.email == current_user.email))
+    profile = result.scalars().first()
     if not profile:
         # Create a profile if it doesn't exist
         profile = Profile(
@@ -83,26 +100,28 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
             email=current_user.email
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     return profile
 
 @router.post("/change-password")
 async def change_password(
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Change user password."""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
-    # Update password
-    current_user.password_hash = get_password_hash(password_data.new_password)
-    db.commit()
+    # Update password; current_user may be a cached, detached copy
+    user = await db.get(User, current_user.id)
+    user.password_hash = await get_password_hash_async(password_data.new_password)
+    await db.commit()
+    invalidate_principal(user_id=current_user.id)
     
     return {"message": "Password updated successfully"}
@@ -1,48 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_paginate, split_page
 from app.models import Blog
-from app.schemas import BlogCreate, BlogUpdate, BlogResponse
+from app.schemas import BlogCreate, BlogUpdate, BlogResponse, BlogSummary
 from app.core.auth import get_current_user
+from app.core.http_cache import ResponseCache, serialize
+from app.services.content_snapshots import categories_name, content_snapshots, item_name, list_name
 
 router = APIRouter(tags=["blogs"])
 
+blog_cache = ResponseCache("blogs", snapshots=content_snapshots)
+blog_list = TypeAdapter(List[BlogResponse])
+category_list = TypeAdapter(List[str])
+blog_summaries = TypeAdapter(List[BlogSummary])
+# Index pages never read the body, so summaries select only these columns
+SUMMARY_COLUMNS = [getattr(Blog, name) for name in BlogSummary.model_fields]
+
 @router.get("/", response_model=List[BlogResponse])
 def get_blogs(
+    request: Request,
     published_only: bool = True,
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all blog posts."""
-    query = db.query(Blog)
-    
-    if published_only:
-        query = query.filter(Blog.published == True)
+    def render():
+        query = db.query(Blog)
+        
+        if published_only:
+            query = query.filter(Blog.published == True)
+        
+        if category:
+            query = query.filter(Blog.category == category)
+        
+        blogs = query.order_by(Blog.publish_date.desc()).all()
+        return serialize(blog_list, blogs), None
     
-    if category:
-        query = query.filter(Blog.category == category)
-    
-    blogs = query.order_by(Blog.publish_date.desc()).all()
-    return blogs
+    snapshot = list_name("blogs") if published_only and not category else None
+    return blog_cache.respond(request, ("list", published_only, category), render, snapshot)
 
 @router.get("/{slug}", response_model=BlogResponse)
 def get_blog_by_slug(
+    request: Request,
     slug: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a blog post by slug."""
-    blog = db.query(Blog).filter(Blog.slug == slug, Blog.published == True).first()
-    if not blog:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Blog post not found"
-        )
-    return blog
+    def render():
+        blog = db.query(Blog).filter(Blog.slug == slug, Blog.published == True).first()
+        if not blog:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Blog post not found"
+            )
+        return BlogResponse.model_validate(blog).model_dump_json().encode(), blog.updated_at
+    
+    return blog_cache.respond(request, ("slug", slug), render, item_name("blogs", slug))
 
 @router.post("/", response_model=BlogResponse)
 def create_blog(
     blog: BlogCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -63,12 +84,15 @@ def create_blog(
     db.add(db_blog)
     db.commit()
     db.refresh(db_blog)
+    content_snapshots.refresh(background_tasks, "blogs", db_blog.slug)
+    blog_cache.invalidate()
     return db_blog
 
 @router.put("/{blog_id}", response_model=BlogResponse)
 def update_blog(
     blog_id: str,
     blog: BlogUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -89,6 +113,7 @@ def update_blog(
                 detail="A blog post with this slug already exists"
             )
     
+    previous_slug = db_blog.slug
     update_data = blog.dict(exclude_unset=True)
     update_data["updated_by"] = current_user["sub"]
     
@@ -97,11 +122,14 @@ def update_blog(
     
     db.commit()
     db.refresh(db_blog)
+    content_snapshots.refresh(background_tasks, "blogs", db_blog.slug, previous_slug)
+    blog_cache.invalidate()
     return db_blog
 
 @router.delete("/{blog_id}")
 def delete_blog(
     blog_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -113,14 +141,49 @@ def delete_blog(
             detail="Blog post not found"
         )
     
+    slug = db_blog.slug
     db.delete(db_blog)
     db.commit()
+    content_snapshots.refresh(background_tasks, "blogs", slug)
+    blog_cache.invalidate()
     return {"message": "Blog post deleted successfully"}
 
 @router.get("/categories/", response_model=List[str])
 def get_blog_categories(
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_read_db)
 ):
     """Get all unique blog categories."""
-    categories = db.query(Blog.category).filter(Blog.published == True).distinct().all()
-    return [cat[0] for cat in categories if cat[0]]
+    def render():
+        categories = db.query(Blog.category).filter(Blog.published == True).distinct().all()
+        return serialize(category_list, [cat[0] for cat in categories if cat[0]]), None
+    
+    return blog_cache.respond(request, ("categories",), render, categories_name("blogs"))
+
+@router.get("/summaries/", response_model=List[BlogSummary])
+def get_blog_summaries(
+    request: Request,
+    published_only: bool = True,
+    category: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get one page of published blog posts without their bodies, newest first."""
+    def render():
+        query = db.query(*SUMMARY_COLUMNS)
+        
+        if published_only:
+            query = query.filter(Blog.published == True)
+        
+        if category:
+            query = query.filter(Blog.category == category)
+        
+        query = keyset_paginate(query, Blog.publish_date, Blog.id, cursor=cursor, skip=skip, limit=limit, descending=True)
+        rows, next_cursor = split_page(query.all(), Blog.publish_date, Blog.id, limit)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return serialize(blog_summaries, rows), None, headers
+    
+    key = ("summaries", published_only, category, skip, limit, cursor)
+    return blog_cache.respond(request, key, render)
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime, timedelta
-from app.core.database import get_db
-from app.models import ChatMessage, ChatTypingIndicator, Profile
+from datetime import datetime
+from app.core.database import get_async_db, get_async_read_db
+from app.core.fast_json import FastJSONResponse
+from app.core.http_cache import etag_for, etag_matches, not_modified
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER, encode_cursor, keyset_paginate, split_page,
+)
+from app.models import ChatMessage
 from app.core.auth import get_current_user
+from app.services.display_names import resolve_display_names
+from app.services.chat_hub import typing_state, publish_message, publish_typing
 from pydantic import BaseModel
 
 router = APIRouter(tags=["chat"])
@@ -39,41 +47,83 @@ class TypingIndicatorResponse(BaseModel):
 
 @router.get("/messages", response_model=List[MessageResponse])
 async def get_messages(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get chat messages."""
-    messages = db.query(ChatMessage).order_by(ChatMessage.created_at.desc()).offset(skip).limit(limit).all()
+    """Get chat messages, oldest first.
+    
+    Without cursors this returns the latest ``limit`` messages. ``after``
+    returns only messages newer than the cursor and ``before`` the page of
+    older ones. ``X-Next-Cursor`` is the cursor to poll with next and is
+    sent unless paging with ``before``; ``X-Prev-Cursor`` is set, except
+    when polling with ``after``, while older messages remain.
+    
+    The response carries an ``ETag`` derived from the newest message and
+    the paging parameters, checked before the page is loaded. Send it back
+    in ``If-None-Match`` to get a bodyless ``304`` when no message arrived;
+    keep the cursors of the earlier response in that case.
+    """
+    if after and before:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either after or before, not both")
+    
+    # Messages are only ever appended, so the newest one (an index seek) validates every page
+    latest = (await db.execute(
+        select(ChatMessage.id, ChatMessage.created_at, ChatMessage.updated_at)
+        .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+        .limit(1)
+    )).first()
+    etag = etag_for({
+        "latest": list(latest) if latest else None,
+        "skip": skip, "limit": limit, "after": after, "before": before,
+    })
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    if after:
+        query = keyset_paginate(select(ChatMessage), ChatMessage.created_at, ChatMessage.id, after, limit=limit)
+        messages, _ = split_page((await db.execute(query)).scalars().all(), ChatMessage.created_at, ChatMessage.id, limit)
+        prev_cursor = None
+    else:
+        query = keyset_paginate(
+            select(ChatMessage), ChatMessage.created_at, ChatMessage.id, before, skip, limit, descending=True
+        )
+        newest_first, prev_cursor = split_page((await db.execute(query)).scalars().all(), ChatMessage.created_at, ChatMessage.id, limit)
+        messages = list(reversed(newest_first))  # Reverse to show oldest first
+    names = await resolve_display_names(db, (message.user_id for message in messages))
     
     result = []
-    for message in reversed(messages):  # Reverse to show oldest first
-        # Get user profile for user_name
-        profile = db.query(Profile).filter(Profile.id == message.user_id).first()
-        user_name = f"{profile.first_name} {profile.last_name}" if profile and profile.first_name and profile.last_name else profile.email if profile else "Unknown User"
-        
+    for message in messages:
         result.append({
             "id": message.id,
             "user_id": message.user_id,
-            "user_name": user_name,
+            "user_name": names[message.user_id],
             "content": message.content,
             "created_at": message.created_at.isoformat(),
             "updated_at": message.updated_at.isoformat(),
         })
     
-    return result
+    headers = {"ETag": etag}
+    if not before:
+        next_cursor = encode_cursor(messages[-1].created_at, messages[-1].id) if messages else after
+        if next_cursor:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+    if prev_cursor:
+        headers[PREV_CURSOR_HEADER] = prev_cursor
+    return FastJSONResponse(result, schema=List[MessageResponse], headers=headers)
 
 @router.post("/messages", response_model=MessageResponse)
 async def create_message(
     message: MessageCreate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new chat message."""
-    # Get user profile for user_name
-    profile = db.query(Profile).filter(Profile.id == current_user.id).first()
-    user_name = f"{profile.first_name} {profile.last_name}" if profile and profile.first_name and profile.last_name else profile.email if profile else "Unknown User"
+    user_name = (await resolve_display_names(db, [current_user.id]))[current_user.id]
     
     db_message = ChatMessage(
         user_id=current_user.id,
@@ -82,10 +132,10 @@ async def create_message(
         updated_at=datetime.now()
     )
     db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    await db.commit()
+    await db.refresh(db_message)
     
-    return {
+    response = {
         "id": db_message.id,
         "user_id": db_message.user_id,
         "user_name": user_name,
@@ -93,78 +143,26 @@ async def create_message(
         "created_at": db_message.created_at.isoformat(),
         "updated_at": db_message.updated_at.isoformat(),
     }
+    publish_message(response)
+    return response
 
 @router.get("/typing-indicators", response_model=List[TypingIndicatorResponse])
 async def get_typing_indicators(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user)
 ):
-    """Get current typing indicators."""
-    # Clean up old typing indicators (older than 5 seconds)
-    five_seconds_ago = datetime.now() - timedelta(seconds=5)
-    db.query(ChatTypingIndicator).filter(ChatTypingIndicator.updated_at < five_seconds_ago).delete()
-    db.commit()
-    
-    indicators = db.query(ChatTypingIndicator).filter(
-        ChatTypingIndicator.is_typing == True,
-        ChatTypingIndicator.user_id != current_user.id
-    ).all()
+    """Get current typing indicators.
     
-    result = []
-    for indicator in indicators:
-        # Get user profile for user_name
-        profile = db.query(Profile).filter(Profile.id == indicator.user_id).first()
-        user_name = f"{profile.first_name} {profile.last_name}" if profile and profile.first_name and profile.last_name else profile.email if profile else "Unknown User"
-        
-        result.append({
-            "id": indicator.id,
-            "user_id": indicator.user_id,
-            "user_name": user_name,
-            "is_typing": indicator.is_typing,
-            "created_at": indicator.created_at.isoformat(),
-            "updated_at": indicator.updated_at.isoformat(),
-        })
-    
-    return result
+    Typing state is kept in memory with a TTL; connect to ``/chat/ws`` to
+    have changes pushed instead of polling.
+    """
+    return typing_state.active(exclude_user_id=current_user.id)
 
 @router.post("/typing-indicators", response_model=TypingIndicatorResponse)
 async def update_typing_indicator(
     typing_data: TypingIndicatorCreate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update typing indicator for current user."""
-    # Get user profile for user_name
-    profile = db.query(Profile).filter(Profile.id == current_user.id).first()
-    user_name = f"{profile.first_name} {profile.last_name}" if profile and profile.first_name and profile.last_name else profile.email if profile else "Unknown User"
-    
-    # Check if indicator already exists
-    existing = db.query(ChatTypingIndicator).filter(
-        ChatTypingIndicator.user_id == current_user.id
-    ).first()
-    
-    if existing:
-        existing.is_typing = typing_data.is_typing
-        existing.updated_at = datetime.now()
-        db.commit()
-        db.refresh(existing)
-        indicator = existing
-    else:
-        indicator = ChatTypingIndicator(
-            user_id=current_user.id,
-            is_typing=typing_data.is_typing,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        db.add(indicator)
-        db.commit()
-        db.refresh(indicator)
-    
-    return {
-        "id": indicator.id,
-        "user_id": indicator.user_id,
-        "user_name": user_name,
-        "is_typing": indicator.is_typing,
-        "created_at": indicator.created_at.isoformat(),
-        "updated_at": indicator.updated_at.isoformat(),
-    }
+    user_name = (await resolve_display_names(db, [current_user.id]))[current_user.id]
+    return publish_typing(current_user.id, user_name, typing_data.is_typing)
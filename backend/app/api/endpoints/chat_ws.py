@@ -0,0 +1,86 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_async_db
+from app.core.auth import authenticate_token
+from app.services.display_names import resolve_display_names
+from app.services.chat_hub import chat_hub, typing_state, typing_event, publish_typing
+
+router = APIRouter(tags=["chat"])
+
+def websocket_token(websocket: WebSocket, token: Optional[str]) -> Optional[str]:
+    """Browsers cannot set headers on a WebSocket, so the token may come as ?token=."""
+    if token:
+        return token
+    authorization = websocket.headers.get("authorization", "")
+    scheme, _, credentials = authorization.partition(" ")
+    return credentials if scheme.lower() == "bearer" and credentials else None
+
+@router.websocket("/ws")
+async def chat_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Push new chat messages and typing changes to the client.
+    
+    Server events are ``{"type": "message", "message": {...}}``,
+    ``{"type": "typing", "typing": {...}}``, ``{"type": "notification",
+    "topic": "tickets.updated", "data": {...}}`` for ticket and inventory
+    changes, and ``{"type": "resync"}`` (the client fell behind and should
+    reload ``GET /chat/messages``). Clients
+    send ``{"type": "typing", "is_typing": bool}``; messages are still
+    posted to ``POST /chat/messages``. A frame that is not JSON text closes
+    the socket with 1003.
+    """
+    try:
+        user = await authenticate_token(
+            websocket_token(websocket, token) or "", db,
+            HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+        )
+        user_name = (await resolve_display_names(db, [user.id]))[user.id]
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        # Don't hold a pooled connection for the lifetime of the socket
+        await db.close()
+    
+    await websocket.accept()
+    subscription = chat_hub.subscribe()
+    
+    async def push():
+        for entry in typing_state.active(exclude_user_id=user.id):
+            await websocket.send_json(typing_event(entry))
+        while True:
+            event = await subscription.get()
+            if event.get("type") == "typing" and event["typing"]["user_id"] == user.id:
+                continue
+            await websocket.send_json(event)
+    
+    async def receive():
+        while True:
+            try:
+                data = await websocket.receive_json()
+            except (ValueError, KeyError):
+                # Not JSON, or a binary frame (no "text" in the message)
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+                return
+            if isinstance(data, dict) and data.get("type") == "typing":
+                publish_typing(user.id, user_name, bool(data.get("is_typing")))
+    
+    tasks = [asyncio.create_task(push()), asyncio.create_task(receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            # RuntimeError: the socket was closed while a send was in flight
+            if error is not None and not isinstance(error, (WebSocketDisconnect, RuntimeError)):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        chat_hub.unsubscribe(subscription)
+        if any(entry["user_id"] == user.id for entry in typing_state.active()):
+            publish_typing(user.id, user_name, False)
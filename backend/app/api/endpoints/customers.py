@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Optional
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.core.auth import get_current_profile
 from app.models import Customer, Profile
 from app.schemas import CustomerCreate, CustomerUpdate, CustomerResponse
@@ -10,19 +11,23 @@ router = APIRouter()
 
 @router.get("/", response_model=List[CustomerResponse])
 async def get_customers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get all customers with pagination."""
-    customers = db.query(Customer).offset(skip).limit(limit).all()
+    query = keyset_paginate(db.query(Customer), Customer.created_at, Customer.id, cursor, skip, limit)
+    customers, next_cursor = split_page(query.all(), Customer.created_at, Customer.id, limit)
+    set_next_cursor(response, next_cursor)
     return customers
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
 async def get_customer(
     customer_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get a specific customer by ID."""
@@ -1,55 +1,47 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.core.auth import get_current_user
-from app.models import Employee, InventoryItem, SalesLead, Profile
-from app.models.finance import FinanceInvoice
 from app.schemas import DashboardStats
-from decimal import Decimal
+from app.services.dashboard import (
+    DEFAULT_TOP_N, get_dashboard_snapshot, snapshot_metrics, rebuild_dashboard_snapshot,
+    top_employees_query, top_inventory_items_query, top_sales_leads_query
+)
 
 router = APIRouter()
 
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    top: int = Query(DEFAULT_TOP_N, ge=0, le=100),
+    legacy: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get dashboard statistics."""
+    """Get dashboard statistics.
     
-    # Get all data
-    invoices = db.query(FinanceInvoice).all()
-    employees = db.query(Employee).all()
-    inventory_items = db.query(InventoryItem).all()
-    sales_leads = db.query(SalesLead).all()
+    Totals are read from the materialized dashboard snapshot. The employee,
+    inventory and sales lead lists are limited to the ``top`` most relevant
+    rows; pass ``legacy=true`` to get the full tables as before.
+    """
+    metrics = snapshot_metrics(await db.run_sync(get_dashboard_snapshot))
+    limit = None if legacy else top
     
-    # Calculate stats
-    total_revenue = sum(
-        invoice.amount for invoice in invoices 
-        if invoice.status == 'paid'
-    ) if invoices else Decimal(0)
-    
-    total_orders = len(invoices)
-    # Since we don't have an active status field, count all employees
-    active_employees = len(employees)
-    total_inventory_items = len(inventory_items)
-    total_stock = sum(item.stock for item in inventory_items) if inventory_items else 0
-    low_stock_items = len([item for item in inventory_items if item.status == 'low stock'])
-    out_of_stock_items = len([item for item in inventory_items if item.status == 'out of stock'])
-    total_leads_value = sum(
-        lead.value for lead in sales_leads 
-        if lead.value is not None
-    ) if sales_leads else Decimal(0)
+    employees = await db.execute(top_employees_query(limit))
+    inventory_items = await db.execute(top_inventory_items_query(limit))
+    sales_leads = await db.execute(top_sales_leads_query(limit))
     
     return DashboardStats(
-        totalRevenue=total_revenue,
-        totalOrders=total_orders,
-        activeEmployees=active_employees,
-        totalInventoryItems=total_inventory_items,
-        totalStock=total_stock,
-        lowStockItems=low_stock_items,
-        outOfStockItems=out_of_stock_items,
-        totalLeadsValue=total_leads_value,
-        employees=employees,
-        inventoryItems=inventory_items,
-        salesLeads=sales_leads
+        **metrics,
+        employees=employees.scalars().all(),
+        inventoryItems=inventory_items.scalars().all(),
+        salesLeads=sales_leads.scalars().all()
     )
+
+@router.post("/stats/rebuild")
+async def rebuild_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Recompute the dashboard snapshot from the source tables."""
+    snapshot = await db.run_sync(rebuild_dashboard_snapshot)
+    return {"message": "Dashboard snapshot rebuilt", "refreshed_at": snapshot.refreshed_at.isoformat()}
@@ -1,48 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset_paginate, split_page
 from app.models import Doc
-from app.schemas import DocCreate, DocUpdate, DocResponse
+from app.schemas import DocCreate, DocUpdate, DocResponse, DocSummary
 from app.core.auth import get_current_user
+from app.core.http_cache import ResponseCache, serialize
+from app.services.content_snapshots import categories_name, content_snapshots, item_name, list_name
 
 router = APIRouter(tags=["docs"])
 
+doc_cache = ResponseCache("docs", snapshots=content_snapshots)
+doc_list = TypeAdapter(List[DocResponse])
+category_list = TypeAdapter(List[str])
+doc_summaries = TypeAdapter(List[DocSummary])
+# Index pages never read the body, so summaries select only these columns
+SUMMARY_COLUMNS = [getattr(Doc, name) for name in DocSummary.model_fields]
+
 @router.get("/", response_model=List[DocResponse])
 def get_docs(
+    request: Request,
     published_only: bool = True,
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all documentation pages."""
-    query = db.query(Doc)
-    
-    if published_only:
-        query = query.filter(Doc.published == True)
+    def render():
+        query = db.query(Doc)
+        
+        if published_only:
+            query = query.filter(Doc.published == True)
+        
+        if category:
+            query = query.filter(Doc.category == category)
+        
+        docs = query.order_by(Doc.category, Doc.title).all()
+        return serialize(doc_list, docs), None
     
-    if category:
-        query = query.filter(Doc.category == category)
-    
-    docs = query.order_by(Doc.category, Doc.title).all()
-    return docs
+    snapshot = list_name("docs") if published_only and not category else None
+    return doc_cache.respond(request, ("list", published_only, category), render, snapshot)
 
 @router.get("/{slug}", response_model=DocResponse)
 def get_doc_by_slug(
+    request: Request,
     slug: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a documentation page by slug."""
-    doc = db.query(Doc).filter(Doc.slug == slug, Doc.published == True).first()
-    if not doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Documentation page not found"
-        )
-    return doc
+    def render():
+        doc = db.query(Doc).filter(Doc.slug == slug, Doc.published == True).first()
+        if not doc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Documentation page not found"
+            )
+        return DocResponse.model_validate(doc).model_dump_json().encode(), doc.updated_at
+    
+    return doc_cache.respond(request, ("slug", slug), render, item_name("docs", slug))
 
 @router.post("/", response_model=DocResponse)
 def create_doc(
     doc: DocCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -63,12 +84,15 @@ def create_doc(
     db.add(db_doc)
     db.commit()
     db.refresh(db_doc)
+    content_snapshots.refresh(background_tasks, "docs", db_doc.slug)
+    doc_cache.invalidate()
     return db_doc
 
 @router.put("/{doc_id}", response_model=DocResponse)
 def update_doc(
     doc_id: str,
     doc: DocUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -89,6 +113,7 @@ def update_doc(
                 detail="A document with this slug already exists"
             )
     
+    previous_slug = db_doc.slug
     update_data = doc.dict(exclude_unset=True)
     update_data["updated_by"] = current_user["sub"]
     
@@ -97,11 +122,14 @@ def update_doc(
     
     db.commit()
     db.refresh(db_doc)
+    content_snapshots.refresh(background_tasks, "docs", db_doc.slug, previous_slug)
+    doc_cache.invalidate()
     return db_doc
 
 @router.delete("/{doc_id}")
 def delete_doc(
     doc_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -113,14 +141,49 @@ def delete_doc(
             detail="Documentation page not found"
         )
     
+    slug = db_doc.slug
     db.delete(db_doc)
     db.commit()
+    content_snapshots.refresh(background_tasks, "docs", slug)
+    doc_cache.invalidate()
     return {"message": "Documentation page deleted successfully"}
 
 @router.get("/categories/", response_model=List[str])
 def get_doc_categories(
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_read_db)
 ):
     """Get all unique documentation categories."""
-    categories = db.query(Doc.category).filter(Doc.published == True).distinct().all()
-    return [cat[0] for cat in categories if cat[0]]
+    def render():
+        categories = db.query(Doc.category).filter(Doc.published == True).distinct().all()
+        return serialize(category_list, [cat[0] for cat in categories if cat[0]]), None
+    
+    return doc_cache.respond(request, ("categories",), render, categories_name("docs"))
+
+@router.get("/summaries/", response_model=List[DocSummary])
+def get_doc_summaries(
+    request: Request,
+    published_only: bool = True,
+    category: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get one page of documentation pages without their bodies, in slug order."""
+    def render():
+        query = db.query(*SUMMARY_COLUMNS)
+        
+        if published_only:
+            query = query.filter(Doc.published == True)
+        
+        if category:
+            query = query.filter(Doc.category == category)
+        
+        query = keyset_paginate(query, Doc.slug, Doc.id, cursor=cursor, skip=skip, limit=limit)
+        rows, next_cursor = split_page(query.all(), Doc.slug, Doc.id, limit)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return serialize(doc_summaries, rows), None, headers
+    
+    key = ("summaries", published_only, category, skip, limit, cursor)
+    return doc_cache.respond(request, key, render)
@@ -1,32 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Literal, Optional
+from app.core.database import get_async_db, get_async_read_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.core.auth import get_current_profile
 from app.models import Employee, Profile
 from app.schemas import EmployeeCreate, EmployeeUpdate, EmployeeResponse
+from app.services.dashboard import apply_snapshot_delta, employee_contribution
+from app.services.exports import export_response
 
 router = APIRouter()
 
 @router.get("/", response_model=List[EmployeeResponse])
 async def get_employees(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get all employees with pagination."""
-    employees = db.query(Employee).offset(skip).limit(limit).all()
-    return employees
+    query = keyset_paginate(select(Employee), Employee.created_at, Employee.id, cursor, skip, limit)
+    result = await db.execute(query)
+    items, next_cursor = split_page(result.scalars().all(), Employee.created_at, Employee.id, limit)
+    set_next_cursor(response, next_cursor)
+    return items
+
+@router.get("/export")
+def export_employees(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    db: Session = Depends(get_read_db),
+    current_profile: Profile = Depends(get_current_profile)
+):
+    """Stream every employee as CSV, NDJSON or columnar row groups."""
+    return export_response(db, Employee, format)
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 async def get_employee(
     employee_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get a specific employee by ID."""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
@@ -34,30 +53,32 @@ async def get_employee(
 @router.post("/", response_model=EmployeeResponse)
 async def create_employee(
     employee: EmployeeCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Create a new employee."""
     # Check if employee_id is unique
-    existing = db.query(Employee).filter(Employee.employee_id == employee.employee_id).first()
+    result = await db.execute(select(Employee).filter(Employee.employee_id == employee.employee_id))
+    existing = result.scalars().first()
     if existing:
         raise HTTPException(status_code=400, detail="Employee ID already exists")
     
     db_employee = Employee(**employee.dict(), created_by=current_profile.id)
     db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
+    await db.run_sync(apply_snapshot_delta, {}, employee_contribution(db_employee))
+    await db.commit()
+    await db.refresh(db_employee)
     return db_employee
 
 @router.put("/{employee_id}", response_model=EmployeeResponse)
 async def update_employee(
     employee_id: str,
     employee_update: EmployeeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Update an employee."""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
@@ -65,21 +86,22 @@ async def update_employee(
     for field, value in update_data.items():
         setattr(employee, field, value)
     
-    db.commit()
-    db.refresh(employee)
+    await db.commit()
+    await db.refresh(employee)
     return employee
 
 @router.delete("/{employee_id}")
 async def delete_employee(
     employee_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Delete an employee."""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = await db.get(Employee, employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    db.delete(employee)
-    db.commit()
+    await db.delete(employee)
+    await db.run_sync(apply_snapshot_delta, employee_contribution(employee), {})
+    await db.commit()
     return {"message": "Employee deleted successfully"}
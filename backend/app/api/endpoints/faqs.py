@@ -1,48 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models import FAQ
 from app.schemas import FAQCreate, FAQUpdate, FAQResponse
 from app.core.auth import get_current_user
+from app.core.http_cache import ResponseCache, serialize
+from app.services.content_snapshots import categories_name, content_snapshots, item_name, list_name
 
 router = APIRouter(tags=["faqs"])
 
+faq_cache = ResponseCache("faqs", snapshots=content_snapshots)
+faq_list = TypeAdapter(List[FAQResponse])
+category_list = TypeAdapter(List[str])
+
 @router.get("/", response_model=List[FAQResponse])
 def get_faqs(
+    request: Request,
     published_only: bool = True,
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all FAQ items."""
-    query = db.query(FAQ)
-    
-    if published_only:
-        query = query.filter(FAQ.published == True)
-    
-    if category:
-        query = query.filter(FAQ.category == category)
+    def render():
+        query = db.query(FAQ)
+        
+        if published_only:
+            query = query.filter(FAQ.published == True)
+        
+        if category:
+            query = query.filter(FAQ.category == category)
+        
+        faqs = query.order_by(FAQ.order_index).all()
+        return serialize(faq_list, faqs), None
     
-    faqs = query.order_by(FAQ.order_index).all()
-    return faqs
+    snapshot = list_name("faqs") if published_only and not category else None
+    return faq_cache.respond(request, ("list", published_only, category), render, snapshot)
 
 @router.get("/{faq_id}", response_model=FAQResponse)
 def get_faq(
+    request: Request,
     faq_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific FAQ item."""
-    faq = db.query(FAQ).filter(FAQ.id == faq_id, FAQ.published == True).first()
-    if not faq:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="FAQ not found"
-        )
-    return faq
+    def render():
+        faq = db.query(FAQ).filter(FAQ.id == faq_id, FAQ.published == True).first()
+        if not faq:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="FAQ not found"
+            )
+        return FAQResponse.model_validate(faq).model_dump_json().encode(), faq.updated_at
+    
+    return faq_cache.respond(request, ("id", faq_id), render, item_name("faqs", faq_id))
 
 @router.post("/", response_model=FAQResponse)
 def create_faq(
     faq: FAQCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -55,12 +72,15 @@ def create_faq(
     db.add(db_faq)
     db.commit()
     db.refresh(db_faq)
+    content_snapshots.refresh(background_tasks, "faqs", db_faq.id)
+    faq_cache.invalidate()
     return db_faq
 
 @router.put("/{faq_id}", response_model=FAQResponse)
 def update_faq(
     faq_id: str,
     faq: FAQUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -80,11 +100,14 @@ def update_faq(
     
     db.commit()
     db.refresh(db_faq)
+    content_snapshots.refresh(background_tasks, "faqs", faq_id)
+    faq_cache.invalidate()
     return db_faq
 
 @router.delete("/{faq_id}")
 def delete_faq(
     faq_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
@@ -98,12 +121,18 @@ def delete_faq(
     
     db.delete(db_faq)
     db.commit()
+    content_snapshots.refresh(background_tasks, "faqs", faq_id)
+    faq_cache.invalidate()
     return {"message": "FAQ deleted successfully"}
 
 @router.get("/categories/", response_model=List[str])
 def get_faq_categories(
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_read_db)
 ):
     """Get all unique FAQ categories."""
-    categories = db.query(FAQ.category).filter(FAQ.published == True).distinct().all()
-    return [cat[0] for cat in categories if cat[0]]
+    def render():
+        categories = db.query(FAQ.category).filter(FAQ.published == True).distinct().all()
+        return serialize(category_list, [cat[0] for cat in categories if cat[0]]), None
+    
+    return faq_cache.respond(request, ("categories",), render, categories_name("faqs"))
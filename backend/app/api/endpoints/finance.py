@@ -1,33 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import List, Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, get_async_db
+from app.core.pagination import keyset_paginate, split_page
+from app.core.counts import CountMode, table_count, invalidate_count
 from app.core.auth import get_current_user
+from app.core.fast_json import FastJSONResponse
 from app.models import User, Profile
 from app.models.finance import Transaction, FinanceInvoice, FinanceExpense
 from app.schemas.finance import (
     TransactionCreate, TransactionUpdate, TransactionOut,
     FinanceInvoiceCreate, FinanceInvoiceUpdate, FinanceInvoiceOut,
     FinanceExpenseCreate, FinanceExpenseUpdate, FinanceExpenseOut,
-    TransactionList, FinanceInvoiceList, FinanceExpenseList
+    TransactionList, FinanceInvoiceList, FinanceExpenseList,
+    TransactionImportSummary, TransactionImportProgress
+)
+from app.services.dashboard import apply_snapshot_delta, invoice_contribution
+from app.services.exports import export_response
+from app.services.transaction_import import (
+    TransactionImporter, detect_format, get_import_progress, iter_csv_records, iter_ndjson_records
 )
 
 router = APIRouter()
 
+def commit_transaction(db: Session):
+    """Commit a created or updated transaction; ``reference`` is unique."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A transaction with this reference already exists"
+        )
+
 # Transaction endpoints
 @router.get("/transactions/", response_model=TransactionList)
 def read_transactions(
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count: Optional[CountMode] = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Retrieve all transactions.
+    
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+    ``total`` is counted according to ``count`` (see ``app.core.counts``);
+    ask for ``exact`` only when the precise number matters.
     """
-    transactions = db.query(Transaction).offset(skip).limit(limit).all()
-    total = db.query(Transaction).count()
-    return {"items": transactions, "total": total}
+    query = keyset_paginate(db.query(Transaction), Transaction.created_at, Transaction.id, cursor, skip, limit)
+    transactions, next_cursor = split_page(query.all(), Transaction.created_at, Transaction.id, limit)
+    total = table_count(db, Transaction, count)
+    return FastJSONResponse({"items": transactions, "total": total, "next_cursor": next_cursor}, schema=TransactionList)
 
 @router.post("/transactions/", response_model=TransactionOut)
 def create_transaction(
@@ -43,14 +72,72 @@ def create_transaction(
         created_by=current_user["id"]
     )
     db.add(db_transaction)
-    db.commit()
+    commit_transaction(db)
+    invalidate_count(Transaction)
     db.refresh(db_transaction)
     return db_transaction
 
+@router.post("/transactions/import", response_model=TransactionImportSummary)
+async def import_transactions(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    import_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Import transactions from a CSV or NDJSON request body.
+    
+    Send the file as the raw body (``Content-Type: text/csv`` or
+    ``application/x-ndjson``, or pass ``format``). CSV needs a header row
+    with the ``TransactionCreate`` field names. Every row needs a
+    ``reference``; rows whose reference is already stored are skipped, so
+    uploading the same statement twice is safe. Pass an ``import_id`` to
+    follow progress at ``GET /transactions/import/{import_id}``; it must not
+    name one of your imports that is still running.
+    """
+    if import_id is not None:
+        progress = get_import_progress(current_user.id, import_id)
+        if progress is not None and progress["status"] == "running":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Import {import_id} is already running"
+            )
+    parse = iter_ndjson_records if detect_format(request.headers.get("content-type"), format) == "ndjson" else iter_csv_records
+    importer = TransactionImporter(db, current_user.id, import_id)
+    return await importer.run(parse(request.stream()))
+
+@router.get("/transactions/import/{import_id}", response_model=TransactionImportProgress)
+def read_import_progress(
+    import_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Progress of one of your running or recently finished transaction imports.
+    """
+    progress = get_import_progress(current_user.id, import_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import not found"
+        )
+    return progress
+
+@router.get("/transactions/export")
+def export_transactions(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream every transaction as CSV, NDJSON or columnar row groups.
+    """
+    return export_response(db, Transaction, format)
+
 @router.get("/transactions/{transaction_id}", response_model=TransactionOut)
 def read_transaction(
     transaction_id: str, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -85,7 +172,7 @@ def update_transaction(
     for field, value in update_data.items():
         setattr(transaction, field, value)
     
-    db.commit()
+    commit_transaction(db)
     db.refresh(transaction)
     return transaction
 
@@ -107,6 +194,7 @@ def delete_transaction(
     
     db.delete(transaction)
     db.commit()
+    invalidate_count(Transaction)
     return {"message": "Transaction deleted successfully"}
 
 # Invoice endpoints
@@ -114,15 +202,22 @@ def delete_transaction(
 def read_invoices(
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count: Optional[CountMode] = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Retrieve all invoices.
+    
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+    ``total`` is counted according to ``count`` (see ``app.core.counts``);
+    ask for ``exact`` only when the precise number matters.
     """
-    invoices = db.query(FinanceInvoice).offset(skip).limit(limit).all()
-    total = db.query(FinanceInvoice).count()
-    return {"items": invoices, "total": total}
+    query = keyset_paginate(db.query(FinanceInvoice), FinanceInvoice.created_at, FinanceInvoice.id, cursor, skip, limit)
+    invoices, next_cursor = split_page(query.all(), FinanceInvoice.created_at, FinanceInvoice.id, limit)
+    total = table_count(db, FinanceInvoice, count)
+    return {"items": invoices, "total": total, "next_cursor": next_cursor}
 
 @router.post("/invoices/", response_model=FinanceInvoiceOut)
 def create_invoice(
@@ -138,14 +233,27 @@ def create_invoice(
         created_by=current_user["id"]
     )
     db.add(db_invoice)
+    apply_snapshot_delta(db, {}, invoice_contribution(db_invoice))
     db.commit()
+    invalidate_count(FinanceInvoice)
     db.refresh(db_invoice)
     return db_invoice
 
+@router.get("/invoices/export")
+def export_invoices(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream every invoice as CSV, NDJSON or columnar row groups.
+    """
+    return export_response(db, FinanceInvoice, format)
+
 @router.get("/invoices/{invoice_id}", response_model=FinanceInvoiceOut)
 def read_invoice(
     invoice_id: str, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -176,10 +284,12 @@ def update_invoice(
             detail="Invoice not found"
         )
     
+    before = invoice_contribution(invoice)
     update_data = invoice_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(invoice, field, value)
     
+    apply_snapshot_delta(db, before, invoice_contribution(invoice))
     db.commit()
     db.refresh(invoice)
     return invoice
@@ -201,7 +311,9 @@ def delete_invoice(
         )
     
     db.delete(invoice)
+    apply_snapshot_delta(db, invoice_contribution(invoice), {})
     db.commit()
+    invalidate_count(FinanceInvoice)
     return {"message": "Invoice deleted successfully"}
 
 # Expense endpoints
@@ -209,15 +321,22 @@ def delete_invoice(
 def read_expenses(
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    count: Optional[CountMode] = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Retrieve all expenses.
+    
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+    ``total`` is counted according to ``count`` (see ``app.core.counts``);
+    ask for ``exact`` only when the precise number matters.
     """
-    expenses = db.query(FinanceExpense).offset(skip).limit(limit).all()
-    total = db.query(FinanceExpense).count()
-    return {"items": expenses, "total": total}
+    query = keyset_paginate(db.query(FinanceExpense), FinanceExpense.created_at, FinanceExpense.id, cursor, skip, limit)
+    expenses, next_cursor = split_page(query.all(), FinanceExpense.created_at, FinanceExpense.id, limit)
+    total = table_count(db, FinanceExpense, count)
+    return {"items": expenses, "total": total, "next_cursor": next_cursor}
 
 @router.post("/expenses/", response_model=FinanceExpenseOut)
 def create_expense(
@@ -234,13 +353,25 @@ def create_expense(
     )
     db.add(db_expense)
     db.commit()
+    invalidate_count(FinanceExpense)
     db.refresh(db_expense)
     return db_expense
 
+@router.get("/expenses/export")
+def export_expenses(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream every expense as CSV, NDJSON or columnar row groups.
+    """
+    return export_response(db, FinanceExpense, format)
+
 @router.get("/expenses/{expense_id}", response_model=FinanceExpenseOut)
 def read_expense(
     expense_id: str, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -297,4 +428,5 @@ def delete_expense(
     
     db.delete(expense)
     db.commit()
+    invalidate_count(FinanceExpense)
     return {"message": "Expense deleted successfully"}
@@ -1,32 +1,61 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Literal, Optional
+from app.core.database import get_async_db, get_async_read_db, get_read_db
+from app.core.events import event_bus
+from app.core.fast_json import FastJSONResponse
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.core.auth import get_current_profile
 from app.models import InventoryItem, Profile
-from app.schemas import InventoryItemCreate, InventoryItemUpdate, InventoryItemResponse
+from app.core.config import settings
+from app.schemas import (
+    InventoryItemCreate, InventoryItemUpdate, InventoryItemResponse, InventoryBulkRequest, InventoryBulkResponse,
+)
+from app.services.dashboard import apply_snapshot_delta, inventory_contribution
+from app.services.exports import export_response
+from app.services.inventory_bulk import InventoryBulkWriter
 
 router = APIRouter()
 
+def inventory_event(item: InventoryItem) -> dict:
+    """Payload of the ``inventory.*`` events."""
+    return {"id": item.id, "name": item.name, "category": item.category, "stock": item.stock, "status": item.status}
+
 @router.get("/", response_model=List[InventoryItemResponse])
 async def get_inventory_items(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get all inventory items with pagination."""
-    items = db.query(InventoryItem).offset(skip).limit(limit).all()
-    return items
+    query = keyset_paginate(select(InventoryItem), InventoryItem.created_at, InventoryItem.id, cursor, skip, limit)
+    result = await db.execute(query)
+    items, next_cursor = split_page(result.scalars().all(), InventoryItem.created_at, InventoryItem.id, limit)
+    page = FastJSONResponse(items, schema=List[InventoryItemResponse])
+    set_next_cursor(page, next_cursor)
+    return page
+
+@router.get("/export")
+def export_inventory_items(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    db: Session = Depends(get_read_db),
+    current_profile: Profile = Depends(get_current_profile)
+):
+    """Stream every inventory item as CSV, NDJSON or columnar row groups."""
+    return export_response(db, InventoryItem, format)
 
 @router.get("/{item_id}", response_model=InventoryItemResponse)
 async def get_inventory_item(
     item_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get a specific inventory item by ID."""
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+    item = await db.get(InventoryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     return item
@@ -34,47 +63,78 @@ async def get_inventory_item(
 @router.post("/", response_model=InventoryItemResponse)
 async def create_inventory_item(
     item: InventoryItemCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Create a new inventory item."""
     db_item = InventoryItem(**item.dict(), created_by=current_profile.id)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.run_sync(apply_snapshot_delta, {}, inventory_contribution(db_item))
+    await db.commit()
+    await db.refresh(db_item)
+    event_bus.publish("inventory.created", inventory_event(db_item))
     return db_item
 
+@router.post("/bulk", response_model=InventoryBulkResponse)
+async def bulk_inventory_items(
+    batch: InventoryBulkRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_profile: Profile = Depends(get_current_profile)
+):
+    """Create, update and delete many inventory items; returns a result per row.
+    
+    Invalid or missing rows are reported individually and do not stop the
+    others. Rows are written in chunked transactions.
+    """
+    total = len(batch.create) + len(batch.update) + len(batch.delete)
+    if total > settings.inventory_bulk_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.inventory_bulk_max_rows} rows per request",
+        )
+    
+    summary = await InventoryBulkWriter(db, current_profile.id).apply(batch)
+    if summary["created"] or summary["updated"] or summary["deleted"]:
+        event_bus.publish("inventory.bulk", {key: summary[key] for key in ("created", "updated", "deleted")})
+    return summary
+
 @router.put("/{item_id}", response_model=InventoryItemResponse)
 async def update_inventory_item(
     item_id: str,
     item_update: InventoryItemUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Update an inventory item."""
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+    item = await db.get(InventoryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     
+    before = inventory_contribution(item)
     update_data = item_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(item, field, value)
     
-    db.commit()
-    db.refresh(item)
+    await db.run_sync(apply_snapshot_delta, before, inventory_contribution(item))
+    await db.commit()
+    await db.refresh(item)
+    event_bus.publish("inventory.updated", inventory_event(item))
     return item
 
 @router.delete("/{item_id}")
 async def delete_inventory_item(
     item_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Delete an inventory item."""
-    item = db.query(InventoryItem).filter(InventoryItem.id == item_id).first()
+    item = await db.get(InventoryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     
-    db.delete(item)
-    db.commit()
+    event = inventory_event(item)
+    await db.delete(item)
+    await db.run_sync(apply_snapshot_delta, inventory_contribution(item), {})
+    await db.commit()
+    event_bus.publish("inventory.deleted", event)
     return {"message": "Inventory item deleted successfully"}
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.models import WorkOrder
 from app.schemas import WorkOrderCreate, WorkOrderUpdate, WorkOrderResponse
 from app.core.auth import get_current_user
@@ -10,19 +11,23 @@ router = APIRouter(tags=["manufacturing"])
 
 @router.get("/work-orders/", response_model=List[WorkOrderResponse])
 def get_work_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all work orders."""
-    work_orders = db.query(WorkOrder).offset(skip).limit(limit).all()
+    query = keyset_paginate(db.query(WorkOrder), WorkOrder.created_at, WorkOrder.id, cursor, skip, limit)
+    work_orders, next_cursor = split_page(query.all(), WorkOrder.created_at, WorkOrder.id, limit)
+    set_next_cursor(response, next_cursor)
     return work_orders
 
 @router.get("/work-orders/{work_order_id}", response_model=WorkOrderResponse)
 def get_work_order(
     work_order_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get a specific work order by ID."""
@@ -1,20 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models import Profile, UserPreference
 from app.schemas import ProfileCreate, ProfileUpdate, ProfileResponse
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, invalidate_principal
+from app.services.display_names import invalidate_display_name
+from app.services.user_directory import invalidate_user_directory
 
 router = APIRouter(tags=["profile"])
 
 @router.get("/", response_model=ProfileResponse)
 async def get_current_profile(
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's profile."""
-    profile = db.query(Profile).filter(Profile.email == current_user.email).first()
+    result = await db.execute(select(Profile).filter(Profile.email == current_user.email))
+    profile = result.scalars().first()
     if not profile:
         # Create a profile if it doesn't exist
         profile = Profile(
@@ -22,18 +26,19 @@ async def get_current_profile(
             email=current_user.email
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     return profile
 
 @router.put("/", response_model=ProfileResponse)
 async def update_profile(
     profile_update: ProfileUpdate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's profile."""
-    profile = db.query(Profile).filter(Profile.email == current_user.email).first()
+    result = await db.execute(select(Profile).filter(Profile.email == current_user.email))
+    profile = result.scalars().first()
     if not profile:
         # Create a profile if it doesn't exist
         profile = Profile(
@@ -41,37 +46,42 @@ async def update_profile(
             email=current_user.email
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     
     # Update profile fields
     for field, value in profile_update.dict(exclude_unset=True).items():
         setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
+    invalidate_principal(user_id=profile.id)
+    invalidate_display_name(profile.id)
+    invalidate_user_directory()
     return profile
 
 @router.get("/notifications")
 async def get_notification_preferences(
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's notification preferences."""
     # Get the profile first to get the correct ID
-    profile = db.query(Profile).filter(Profile.email == current_user.email).first()
+    result = await db.execute(select(Profile).filter(Profile.email == current_user.email))
+    profile = result.scalars().first()
     if not profile:
         profile = Profile(
             id=current_user.id,
             email=current_user.email
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     
-    preferences = db.query(UserPreference).filter(
+    result = await db.execute(select(UserPreference).filter(
         UserPreference.user_id == profile.id
-    ).first()
+    ))
+    preferences = result.scalars().first()
     
     if not preferences:
         # Create default preferences if none exist
@@ -88,8 +98,8 @@ async def get_notification_preferences(
             timezone='utc'
         )
         db.add(preferences)
-        db.commit()
-        db.refresh(preferences)
+        await db.commit()
+        await db.refresh(preferences)
     
     return {
         "email_notifications": preferences.email_notifications,
@@ -107,23 +117,25 @@ async def get_notification_preferences(
 async def update_notification_preferences(
     notifications: dict,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user's notification preferences."""
     # Get the profile first to get the correct ID
-    profile = db.query(Profile).filter(Profile.email == current_user.email).first()
+    result = await db.execute(select(Profile).filter(Profile.email == current_user.email))
+    profile = result.scalars().first()
     if not profile:
         profile = Profile(
             id=current_user.id,
             email=current_user.email
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     
-    preferences = db.query(UserPreference).filter(
+    result = await db.execute(select(UserPreference).filter(
         UserPreference.user_id == profile.id
-    ).first()
+    ))
+    preferences = result.scalars().first()
     
     if not preferences:
         preferences = UserPreference(user_id=profile.id)
@@ -134,8 +146,8 @@ async def update_notification_preferences(
         if hasattr(preferences, field):
             setattr(preferences, field, value)
     
-    db.commit()
-    db.refresh(preferences)
+    await db.commit()
+    await db.refresh(preferences)
     
     # Return the updated preferences
     return {
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Optional
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.core.auth import get_current_profile
 from app.models import Project, Profile
 from app.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
@@ -10,19 +11,23 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ProjectResponse])
 async def get_projects(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get all projects with pagination."""
-    projects = db.query(Project).offset(skip).limit(limit).all()
+    query = keyset_paginate(db.query(Project), Project.created_at, Project.id, cursor, skip, limit)
+    projects, next_cursor = split_page(query.all(), Project.created_at, Project.id, limit)
+    set_next_cursor(response, next_cursor)
     return projects
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get a specific project by ID."""
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.models import PurchaseOrder, Supplier
 from app.schemas import PurchaseOrderCreate, PurchaseOrderUpdate, PurchaseOrderResponse
 from app.core.auth import get_current_user
@@ -10,19 +11,23 @@ router = APIRouter(tags=["purchase-orders"])
 
 @router.get("/", response_model=List[PurchaseOrderResponse])
 def get_purchase_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all purchase orders."""
-    purchase_orders = db.query(PurchaseOrder).offset(skip).limit(limit).all()
+    query = keyset_paginate(db.query(PurchaseOrder), PurchaseOrder.created_at, PurchaseOrder.id, cursor, skip, limit)
+    purchase_orders, next_cursor = split_page(query.all(), PurchaseOrder.created_at, PurchaseOrder.id, limit)
+    set_next_cursor(response, next_cursor)
     return purchase_orders
 
 @router.get("/{po_id}", response_model=PurchaseOrderResponse)
 def get_purchase_order(
     po_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get a specific purchase order by ID."""
@@ -1,28 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from typing import List, Optional
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.core.auth import get_current_profile
 from app.models import SalesLead, Profile
 from app.schemas import SalesLeadCreate, SalesLeadUpdate, SalesLeadResponse
+from app.services.dashboard import apply_snapshot_delta, lead_contribution
 
 router = APIRouter()
 
 @router.get("/", response_model=List[SalesLeadResponse])
 async def get_sales_leads(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get all sales leads with pagination."""
-    leads = db.query(SalesLead).offset(skip).limit(limit).all()
+    query = keyset_paginate(db.query(SalesLead), SalesLead.created_at, SalesLead.id, cursor, skip, limit)
+    leads, next_cursor = split_page(query.all(), SalesLead.created_at, SalesLead.id, limit)
+    set_next_cursor(response, next_cursor)
     return leads
 
 @router.get("/{lead_id}", response_model=SalesLeadResponse)
 async def get_sales_lead(
     lead_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_profile: Profile = Depends(get_current_profile)
 ):
     """Get a specific sales lead by ID."""
@@ -40,6 +46,7 @@ async def create_sales_lead(
     """Create a new sales lead."""
     db_lead = SalesLead(**lead.dict(), created_by=current_profile.id)
     db.add(db_lead)
+    apply_snapshot_delta(db, {}, lead_contribution(db_lead))
     db.commit()
     db.refresh(db_lead)
     return db_lead
@@ -56,10 +63,12 @@ async def update_sales_lead(
     if not lead:
         raise HTTPException(status_code=404, detail="Sales lead not found")
     
+    before = lead_contribution(lead)
     update_data = lead_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(lead, field, value)
     
+    apply_snapshot_delta(db, before, lead_contribution(lead))
     db.commit()
     db.refresh(lead)
     return lead
@@ -76,5 +85,6 @@ async def delete_sales_lead(
         raise HTTPException(status_code=404, detail="Sales lead not found")
     
     db.delete(lead)
+    apply_snapshot_delta(db, lead_contribution(lead), {})
     db.commit()
     return {"message": "Sales lead deleted successfully"}
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Response, status, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime, timedelta
 import uuid
 import os
 import shutil
 
-from app.core.database import get_db
-from app.models import Ticket, TicketComment, TicketAttachment, TicketHistory
-from app.models.tickets import TicketStatus as ModelTicketStatus, TicketPriority as ModelTicketPriority
+from app.core.auth import get_current_user
+from app.core.database import get_db, get_read_db
+from app.core.events import event_bus
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
+from app.services.ticket_search import apply_ticket_search, index_ticket, unindex_ticket
+from app.services import ticket_stats as ticket_stats_service
+from app.services.exports import export_response
+from app.models import Ticket, TicketComment, TicketAttachment, TicketHistory, User
 from app.schemas.tickets import (
     TicketCreate, TicketUpdate, TicketResponse, TicketListResponse, 
     TicketCommentCreate, TicketCommentResponse, TicketStatsResponse,
@@ -24,6 +28,18 @@ def generate_ticket_number() -> str:
     return f"TK-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
 
 
+def ticket_event(ticket) -> dict:
+    """Payload of the ``tickets.*`` events; it is sent to the chat sockets as JSON."""
+    return {
+        "id": ticket.id,
+        "ticket_number": ticket.ticket_number,
+        "title": ticket.title,
+        # Enum members once loaded, plain strings when a value was just assigned
+        "status": getattr(ticket.status, "value", ticket.status),
+        "priority": getattr(ticket.priority, "value", ticket.priority),
+        "assigned_to": ticket.assigned_to,
+    }
+
 def log_ticket_change(db: Session, ticket_id: str, field_name: str, old_value: str, new_value: str, changed_by: str):
     """Log ticket field changes to history"""
     if old_value != new_value:
@@ -67,16 +83,21 @@ def create_ticket(
     )
     
     db.add(db_ticket)
+    db.flush()
+    index_ticket(db, db_ticket)
     db.commit()
     db.refresh(db_ticket)
+    event_bus.publish("tickets.created", ticket_event(db_ticket))
     
     return db_ticket
 
 
 @router.get("/", response_model=List[TicketListResponse])
 def get_tickets(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     status: Optional[TicketStatus] = None,
     priority: Optional[TicketPriority] = None,
     ticket_type: Optional[str] = None,
@@ -84,11 +105,31 @@ def get_tickets(
     assigned_to: Optional[str] = None,
     created_by: Optional[str] = None,
     search: Optional[str] = None,
-    sort_by: str = "created_at",
+    sort_by: Optional[str] = None,
     sort_order: str = "desc",
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get tickets with filtering and pagination"""
+    """Get tickets with filtering and pagination
+    
+    With ``search`` and no ``sort_by`` the results are ranked by relevance
+    and paged with ``skip``; otherwise they are sorted by ``sort_by``
+    (default ``created_at``) and can be paged with ``cursor``.
+    """
+    # ``status`` is the filter parameter here, so errors use plain status codes
+    rank_by_relevance = bool(search) and sort_by is None
+    sort_by = sort_by or "created_at"
+    sort_column = Ticket.__table__.columns.get(sort_by)
+    if sort_column is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot sort by {sort_by}"
+        )
+    if rank_by_relevance and cursor:
+        raise HTTPException(
+            status_code=400,
+            detail="Relevance-ranked search is paged with skip; pass sort_by to use a cursor"
+        )
+    
     query = db.query(Ticket)
     
     # Apply filters
@@ -105,25 +146,30 @@ def get_tickets(
     if created_by:
         query = query.filter(Ticket.created_by == created_by)
     if search:
-        query = query.filter(
-            or_(
-                Ticket.title.contains(search),
-                Ticket.description.contains(search),
-                Ticket.ticket_number.contains(search)
-            )
-        )
+        query, relevance = apply_ticket_search(db, query, search)
+        if rank_by_relevance:
+            return query.order_by(relevance.desc(), Ticket.id).offset(skip).limit(limit).all()
     
-    # Apply sorting
-    if sort_order == "desc":
-        query = query.order_by(desc(getattr(Ticket, sort_by)))
-    else:
-        query = query.order_by(asc(getattr(Ticket, sort_by)))
-    
-    return query.offset(skip).limit(limit).all()
+    # Apply sorting and pagination; (sort_by, id) keeps the order stable for cursors
+    query = keyset_paginate(
+        query, sort_column, Ticket.id, cursor, skip, limit, descending=sort_order == "desc"
+    )
+    tickets, next_cursor = split_page(query.all(), sort_column, Ticket.id, limit)
+    set_next_cursor(response, next_cursor)
+    return tickets
 
 
+@router.get("/export")
+def export_tickets(
+    format: Literal["csv", "ndjson", "columnar"] = "csv",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every ticket as CSV, NDJSON or columnar row groups"""
+    return export_response(db, Ticket, format)
+
 @router.get("/{ticket_id}", response_model=TicketResponse)
-def get_ticket(ticket_id: str, db: Session = Depends(get_db)):
+def get_ticket(ticket_id: str, db: Session = Depends(get_read_db)):
     """Get a specific ticket by ID"""
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     if not ticket:
@@ -168,8 +214,12 @@ def update_ticket(
     if ticket_update.status == TicketStatus.RESOLVED and db_ticket.resolved_at is None:
         db_ticket.resolved_at = datetime.now()
     
+    if update_data.keys() & {"title", "description"}:
+        index_ticket(db, db_ticket)
+    
     db.commit()
     db.refresh(db_ticket)
+    event_bus.publish("tickets.updated", ticket_event(db_ticket))
     
     return db_ticket
 
@@ -184,8 +234,11 @@ def delete_ticket(ticket_id: str, db: Session = Depends(get_db)):
             detail="Ticket not found"
         )
     
+    event = ticket_event(db_ticket)
+    unindex_ticket(db, ticket_id)
     db.delete(db_ticket)
     db.commit()
+    event_bus.publish("tickets.deleted", event)
     
     return {"message": "Ticket deleted successfully"}
 
@@ -224,7 +277,7 @@ def add_comment(
 def get_comments(
     ticket_id: str,
     include_internal: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get comments for a ticket"""
     query = db.query(TicketComment).filter(TicketComment.ticket_id == ticket_id)
@@ -236,31 +289,6 @@ def get_comments(
 
 
 @router.get("/stats/summary", response_model=TicketStatsResponse)
-def get_ticket_stats(db: Session = Depends(get_db)):
-    """Get ticket statistics"""
-    total_tickets = db.query(Ticket).count()
-    open_tickets = db.query(Ticket).filter(Ticket.status == ModelTicketStatus.OPEN.value).count()
-    in_progress_tickets = db.query(Ticket).filter(Ticket.status == ModelTicketStatus.IN_PROGRESS.value).count()
-    resolved_tickets = db.query(Ticket).filter(Ticket.status == ModelTicketStatus.RESOLVED.value).count()
-    closed_tickets = db.query(Ticket).filter(Ticket.status == ModelTicketStatus.CLOSED.value).count()
-    urgent_tickets = db.query(Ticket).filter(Ticket.priority == ModelTicketPriority.URGENT.value).count()
-    high_priority_tickets = db.query(Ticket).filter(Ticket.priority == ModelTicketPriority.HIGH.value).count()
-    
-    # Overdue tickets (due_date < now and status not resolved/closed)
-    overdue_tickets = db.query(Ticket).filter(
-        and_(
-            Ticket.due_date < datetime.now(),
-            Ticket.status.not_in([ModelTicketStatus.RESOLVED.value, ModelTicketStatus.CLOSED.value])
-        )
-    ).count()
-    
-    return TicketStatsResponse(
-        total_tickets=total_tickets,
-        open_tickets=open_tickets,
-        in_progress_tickets=in_progress_tickets,
-        resolved_tickets=resolved_tickets,
-        closed_tickets=closed_tickets,
-        urgent_tickets=urgent_tickets,
-        high_priority_tickets=high_priority_tickets,
-        overdue_tickets=overdue_tickets
-    )
+def get_ticket_stats(db: Session = Depends(get_read_db)):
+    """Get ticket statistics with department, module and assignee breakdowns"""
+    return TicketStatsResponse(**ticket_stats_service.get_ticket_stats(db))
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models import Profile, User, UserRole
 from app.schemas import ProfileResponse, ProfileUpdate
-from app.core.auth import get_current_user, get_password_hash
+from app.core.auth import get_current_user, get_password_hash, invalidate_principal
+from app.core.pagination import set_next_cursor
+from app.services.display_names import invalidate_display_name
+from app.services.user_directory import directory_query, get_user_page, invalidate_user_directory, user_row
 from pydantic import BaseModel
 
 router = APIRouter(tags=["users"])
@@ -36,62 +39,38 @@ class PasswordReset(BaseModel):
 
 @router.get("/", response_model=List[UserResponse])
 def get_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    locked: Optional[bool] = None,
+    search: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    """Get all users (admin only)."""
+    """Get users (admin only), filtered by status, lock state and name/email prefix."""
     # For now, assume admin if user exists - you can enhance this with proper role checking
-    profiles = db.query(Profile).all()
-    
-    # Convert profiles to user response format
-    users = []
-    for profile in profiles:
-        user_data = {
-            "id": profile.id,
-            "email": profile.email,
-            "first_name": profile.first_name,
-            "last_name": profile.last_name,
-            "phone": profile.phone,
-            "job_title": profile.job_title,
-            "bio": profile.bio,
-            "status": profile.status or "active",
-            "last_login": profile.last_login.isoformat() if profile.last_login else None,
-            "account_locked": profile.account_locked or False,
-            "created_at": profile.created_at.isoformat(),
-        }
-        users.append(user_data)
-    
-    return users
+    body, next_cursor = get_user_page(db, status, locked, search, cursor, skip, limit)
+    page = Response(content=body, media_type="application/json")
+    set_next_cursor(page, next_cursor)
+    return page
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific user by ID (admin only)."""
-    profile = db.query(Profile).filter(Profile.id == user_id).first()
+    profile = directory_query(db).filter(Profile.id == user_id).first()
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    user_data = {
-        "id": profile.id,
-        "email": profile.email,
-        "first_name": profile.first_name,
-        "last_name": profile.last_name,
-        "phone": profile.phone,
-        "job_title": profile.job_title,
-        "bio": profile.bio,
-        "status": profile.status or "active",
-        "last_login": profile.last_login.isoformat() if profile.last_login else None,
-        "account_locked": profile.account_locked or False,
-        "created_at": profile.created_at.isoformat(),
-    }
-    
-    return user_data
+    return user_row(profile)
 
 @router.put("/{user_id}/status")
 def update_user_status(
@@ -111,6 +90,8 @@ def update_user_status(
     profile.status = status_update.status
     db.commit()
     db.refresh(profile)
+    invalidate_principal(user_id=user_id)
+    invalidate_user_directory()
     
     return {"message": "User status updated successfully"}
 
@@ -135,6 +116,9 @@ def update_user_profile(
     
     db.commit()
     db.refresh(profile)
+    invalidate_principal(user_id=user_id)
+    invalidate_user_directory()
+    invalidate_display_name(user_id)
     
     return {"message": "User profile updated successfully"}
 
@@ -155,6 +139,7 @@ def reset_user_password(
     
     user.password_hash = get_password_hash(password_reset.new_password)
     db.commit()
+    invalidate_principal(user_id=user_id)
     
     return {"message": "Password reset successfully"}
 
@@ -174,6 +159,8 @@ def unlock_user_account(
     
     profile.account_locked = False
     db.commit()
+    invalidate_principal(user_id=user_id)
+    invalidate_user_directory()
     
     return {"message": "User account unlocked successfully"}
 
@@ -204,5 +191,8 @@ def delete_user(
     db.delete(profile)
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id=user_id)
+    invalidate_user_directory()
+    invalidate_display_name(user_id)
     
     return {"message": "User deleted successfully"}
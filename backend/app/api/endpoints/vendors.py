@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import keyset_paginate, split_page, set_next_cursor
 from app.models import Supplier
 from app.schemas import SupplierCreate, SupplierUpdate, SupplierResponse
 from app.core.auth import get_current_user
@@ -10,19 +11,23 @@ router = APIRouter(tags=["vendors"])
 
 @router.get("/", response_model=List[SupplierResponse])
 def get_vendors(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all vendors/suppliers."""
-    vendors = db.query(Supplier).offset(skip).limit(limit).all()
+    query = keyset_paginate(db.query(Supplier), Supplier.created_at, Supplier.id, cursor, skip, limit)
+    vendors, next_cursor = split_page(query.all(), Supplier.created_at, Supplier.id, limit)
+    set_next_cursor(response, next_cursor)
     return vendors
 
 @router.get("/{vendor_id}", response_model=SupplierResponse)
 def get_vendor(
     vendor_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """Get a specific vendor by ID."""
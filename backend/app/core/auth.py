@@ -1,18 +1,32 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
+import time
+import uuid
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.hashing import PasswordHashPool
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models import User, Profile
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers, max_queue=settings.password_hash_max_queue
+)
 security = HTTPBearer()
 
+# Resolved principals: (token id, subject) -> User, and user id -> Profile.
+# Cached objects are detached from any session and must be treated as read-only.
+principal_cache = TTLCache(ttl=settings.auth_cache_ttl_seconds, maxsize=settings.auth_cache_max_entries)
+profile_cache = TTLCache(ttl=settings.auth_cache_ttl_seconds, maxsize=settings.auth_cache_max_entries)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -21,6 +35,18 @@ def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hash pool."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hash pool."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses outdated settings."""
+    return await password_hash_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -29,24 +55,57 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-def verify_token(token: str, credentials_exception):
-    """Verify a JWT token."""
+def decode_token(token: str, credentials_exception) -> dict:
+    """Verify a JWT token and return its claims."""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        return email
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+def verify_token(token: str, credentials_exception):
+    """Verify a JWT token."""
+    return decode_token(token, credentials_exception)["sub"]
+
+def principal_cache_key(token: str, payload: dict) -> tuple:
+    """Cache key for a token: its ``jti`` (or digest for older tokens) and subject."""
+    token_id = payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+    return (token_id, payload["sub"])
+
+def invalidate_principal(user_id: Optional[str] = None, email: Optional[str] = None):
+    """Drop cached users and profiles after a delete, lock or password change."""
+    def matches(key, cached):
+        return (user_id is not None and cached.id == user_id) or (email is not None and cached.email == email)
+    principal_cache.delete_where(matches)
+    profile_cache.delete_where(matches)
+
+async def authenticate_token(token: str, db: AsyncSession, credentials_exception) -> User:
+    """Resolve the user a bearer token belongs to, via the principal cache."""
+    payload = decode_token(token, credentials_exception)
+    cache_key = principal_cache_key(token, payload)
+    
+    user = principal_cache.get(cache_key)
+    if user is not None:
+        return user
+    
+    result = await db.execute(select(User).filter(User.email == payload["sub"]))
+    user = result.scalars().first()
+    if user is None:
+        raise credentials_exception
+    
+    db.expunge(user)
+    principal_cache.set(cache_key, user, ttl=payload.get("exp", 0) - time.time())
+    return user
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the current authenticated user."""
     credentials_exception = HTTPException(
@@ -54,22 +113,19 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    token = credentials.credentials
-    email = verify_token(token, credentials_exception)
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    
-    return user
+    return await authenticate_token(credentials.credentials, db, credentials_exception)
 
 async def get_current_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the current user's profile."""
-    profile = db.query(Profile).filter(Profile.email == current_user.email).first()
+    profile = profile_cache.get(current_user.id)
+    if profile is not None:
+        return profile
+    
+    result = await db.execute(select(Profile).filter(Profile.email == current_user.email))
+    profile = result.scalars().first()
     if not profile:
         # Create a profile if it doesn't exist
         profile = Profile(
@@ -77,7 +133,9 @@ async def get_current_profile(
             email=current_user.email
         )
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
     
+    db.expunge(profile)
+    profile_cache.set(current_user.id, profile)
     return profile
@@ -0,0 +1,148 @@
+"""Response compression (gzip, plus brotli and zstd when installed).
+
+``CompressionMiddleware`` compresses complete response bodies of at least
+``compression_minimum_size`` bytes. It uses the best coding the client
+accepts, preferring brotli, then zstd, then gzip. These responses are left
+as they are:
+
+* streaming bodies (exports, imports): they are sent chunk by chunk and
+  compressing them would mean buffering the whole download;
+* responses that already carry a ``Content-Encoding``, such as the
+  precompressed content snapshots;
+* content types that do not compress (images, archives).
+
+Bodies with a strong ``ETag`` are the cached responses (content cache,
+snapshots), and the ETag is a hash of the body. Their compressed bytes are
+kept in ``compressed_cache`` under that ETag, so a popular cached page is
+compressed once per worker rather than on every request. The ETag of a
+compressed response is sent weak, as the bytes differ from the identity
+body, and ``If-None-Match`` keeps matching because the comparison is weak.
+"""
+import gzip
+from typing import Callable, Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.http_cache import choose_encoding
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+# Bodies this large are compressed in the threadpool instead of on the event loop
+THREADPOOL_SIZE = 256 * 1024
+
+# (ETag, body length, coding) -> compressed body of a cached response
+compressed_cache = TTLCache(ttl=600, maxsize=512)
+
+
+def compressors(
+    gzip_level: Optional[int] = None,
+    brotli_quality: Optional[int] = None,
+    zstd_level: Optional[int] = None,
+) -> Dict[str, Callable[[bytes], bytes]]:
+    """Available codings, in order of preference, with their compress functions."""
+    gzip_level = settings.compression_gzip_level if gzip_level is None else gzip_level
+    brotli_quality = settings.compression_brotli_quality if brotli_quality is None else brotli_quality
+    zstd_level = settings.compression_zstd_level if zstd_level is None else zstd_level
+    available = {}
+    if brotli is not None:
+        available["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+    if zstandard is not None:
+        available["zstd"] = zstandard.ZstdCompressor(level=zstd_level).compress
+    available["gzip"] = lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    return available
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """Compresses complete, compressible response bodies for clients that accept it."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None, **levels):
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+        self.compressors = compressors(**levels)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.compressors)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= self.minimum_size:
+                body = await self.compress(coding, body, headers.get("etag"))
+                headers["Content-Encoding"] = coding
+                headers["Content-Length"] = str(len(body))
+                if headers.get("etag", "").startswith('"'):
+                    headers["ETag"] = "W/" + headers["etag"]
+            headers.add_vary_header("Accept-Encoding")
+            passthrough = True
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def compress(self, coding: str, body: bytes, etag: Optional[str]) -> bytes:
+        key = (etag, len(body), coding) if etag and etag.startswith('"') else None
+        if key is not None:
+            cached = compressed_cache.get(key)
+            if cached is not None:
+                return cached
+        compress = self.compressors[coding]
+        if len(body) >= THREADPOOL_SIZE:
+            compressed = await run_in_threadpool(compress, body)
+        else:
+            compressed = compress(body)
+        if key is not None:
+            compressed_cache.set(key, compressed)
+        return compressed
@@ -10,6 +10,22 @@ class Settings(BaseSettings):
     database_password: str = ""
     database_port: int = 3306
     database_name: str = "erpnew"
+    # Async URL for the async endpoints; derived from database_url when unset
+    async_database_url: Optional[str] = None
+    
+    # Connection pool settings, per engine and per uvicorn worker
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 300
+    db_pool_use_lifo: bool = True  # reuse the most recently returned connection
+    db_pool_pre_ping: str = "idle"  # always, idle or never
+    db_pool_pre_ping_idle_seconds: int = 30
+    
+    # Read replica settings; reads use the primary when no replica is configured
+    database_replica_url: Optional[str] = None
+    async_database_replica_url: Optional[str] = None
+    read_your_writes_seconds: int = 5  # reads stay on the primary this long after a write
     
     # API settings
     api_v1_str: str = "/api/v1"
@@ -19,6 +35,60 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-here-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    auth_cache_ttl_seconds: int = 60  # how long a resolved user/profile is reused per worker
+    auth_cache_max_entries: int = 10000
+    bcrypt_rounds: int = 12  # existing hashes are upgraded on the next successful login
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64  # waiting hash jobs before login/register return 503
+    
+    # Event bus settings
+    event_bus_backend: str = "local"  # local (single process) or outbox (shared table, multiple workers)
+    event_bus_poll_interval_seconds: float = 0.25
+    event_bus_retention_seconds: int = 300
+    event_bus_gap_timeout_seconds: float = 30  # how long a skipped outbox id is re-checked for a late commit
+    
+    # Finance import settings
+    transaction_import_batch_size: int = 1000  # rows per INSERT/transaction
+    transaction_import_max_errors: int = 100  # per-row errors returned in the summary
+    
+    # Public content (blogs, docs, FAQs) response cache
+    content_cache_ttl_seconds: int = 300  # how long a worker reuses a serialized response
+    content_cache_max_age_seconds: int = 60  # Cache-Control max-age sent to browsers and CDNs
+    content_snapshot_dir: Optional[str] = None  # pre-rendered snapshots are disabled when unset
+    content_snapshot_max_age_seconds: int = 7200  # older snapshots are ignored
+    content_snapshot_rebuild_seconds: int = 3600  # full rebuild period; 0 disables it
+    
+    # Response compression (brotli and zstd are used when their packages are installed)
+    compression_minimum_size: int = 1024  # smaller bodies are sent uncompressed
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_zstd_level: int = 3
+    
+    # Export settings
+    export_batch_size: int = 1000  # rows fetched and streamed per batch by the /export endpoints
+    
+    # List count settings
+    default_count_mode: str = "cached"  # exact, cached or estimated
+    count_cache_ttl_seconds: int = 30
+    
+    # Chat settings
+    display_name_cache_seconds: int = 300
+    chat_typing_ttl_seconds: int = 5
+    chat_subscriber_queue_size: int = 100  # pending events per WebSocket before it is asked to resync
+    
+    # Inventory settings
+    inventory_bulk_chunk_size: int = 1000  # rows per transaction in /inventory/bulk
+    inventory_bulk_max_rows: int = 50000
+    
+    # User directory settings
+    user_directory_cache_seconds: int = 60
+    user_directory_cache_max_pages: int = 256
+    
+    # Ticket settings
+    ticket_stats_cache_seconds: int = 15
+    
+    # Dashboard settings
+    dashboard_snapshot_rebuild_seconds: int = 900  # 0 disables the periodic rebuild
     
     class Config:
         env_file = ".env"
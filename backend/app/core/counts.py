@@ -0,0 +1,67 @@
+"""Total-row counts for paginated lists.
+
+``SELECT COUNT(*)`` on a large InnoDB table scans a whole index, often
+costing more than the page itself. Lists therefore accept a ``count``
+mode:
+
+* ``exact`` - run ``COUNT(*)`` every time.
+* ``cached`` - reuse an exact count for ``count_cache_ttl_seconds``. Write
+  paths that insert or delete rows call ``invalidate_count``.
+* ``estimated`` - read the row estimate from the table statistics
+  (``information_schema.TABLES.TABLE_ROWS`` on MySQL). This is instant
+  but can be off by a large margin. Backends without statistics fall
+  back to ``cached``.
+"""
+from typing import Literal, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+CountMode = Literal["exact", "cached", "estimated"]
+
+# Table name -> exact row count
+count_cache = TTLCache(ttl=settings.count_cache_ttl_seconds, maxsize=256)
+
+
+def exact_count(db: Session, model) -> int:
+    return db.execute(select(func.count()).select_from(model.__table__)).scalar_one()
+
+
+def cached_count(db: Session, model) -> int:
+    table_name = model.__tablename__
+    total = count_cache.get(table_name)
+    if total is None:
+        total = exact_count(db, model)
+        count_cache.set(table_name, total)
+    return total
+
+
+def estimated_count(db: Session, model) -> Optional[int]:
+    """Row estimate from the table statistics, or None if unavailable."""
+    if db.get_bind().dialect.name != "mysql":
+        return None
+    return db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ),
+        {"table_name": model.__tablename__},
+    ).scalar()
+
+
+def table_count(db: Session, model, mode: Optional[CountMode] = None) -> int:
+    """Count the rows of ``model``'s table using ``mode`` (default from settings)."""
+    mode = mode or settings.default_count_mode
+    if mode == "exact":
+        return exact_count(db, model)
+    if mode == "estimated":
+        estimate = estimated_count(db, model)
+        if estimate is not None:
+            return estimate
+    return cached_count(db, model)
+
+
+def invalidate_count(model):
+    """Forget the cached count after rows were inserted into or deleted from ``model``."""
+    count_cache.delete(model.__tablename__)
@@ -1,18 +1,85 @@
+import hashlib
+import time
+from typing import Dict, Optional
+from fastapi import Request
+from starlette.datastructures import Headers
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.pool import PoolMetrics, pool_options, instrument_engine
+
+# Sync driver -> async driver used when no explicit async URL is configured
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+mysqlconnector": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
 
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
+engine_metrics = PoolMetrics("primary")
+engine = instrument_engine(
+    create_engine(settings.database_url, **pool_options(settings.database_url, engine_metrics)),
+    engine_metrics,
+)
+
+# Create async database engine for the async def endpoints
+async_database_url = settings.async_database_url or to_async_url(settings.database_url)
+async_engine_metrics = PoolMetrics("primary_async")
+async_engine = instrument_engine(
+    create_async_engine(async_database_url, **pool_options(async_database_url, async_engine_metrics, is_async=True)),
+    async_engine_metrics,
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Objects stay loaded after commit so they can be returned without extra I/O
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replica engines; without a replica URL reads fall back to the primary
+if settings.database_replica_url:
+    replica_engine_metrics = PoolMetrics("replica")
+    replica_engine = instrument_engine(
+        create_engine(settings.database_replica_url, **pool_options(settings.database_replica_url, replica_engine_metrics)),
+        replica_engine_metrics,
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+else:
+    replica_engine = engine
+    ReplicaSessionLocal = SessionLocal
+
+async_database_replica_url = settings.async_database_replica_url or (
+    to_async_url(settings.database_replica_url) if settings.database_replica_url else None
+)
+if async_database_replica_url:
+    async_replica_engine_metrics = PoolMetrics("replica_async")
+    async_replica_engine = instrument_engine(
+        create_async_engine(
+            async_database_replica_url,
+            **pool_options(async_database_replica_url, async_replica_engine_metrics, is_async=True)
+        ),
+        async_replica_engine_metrics,
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        bind=async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+else:
+    async_replica_engine = async_engine
+    AsyncReplicaSessionLocal = AsyncSessionLocal
+
 # Create Base class
 Base = declarative_base()
 
@@ -23,3 +90,72 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Read-your-writes: client key -> monotonic time until which reads use the primary
+_primary_pins: Dict[str, float] = {}
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+def read_your_writes_key(headers: Headers, client=None) -> Optional[str]:
+    """Identify the caller by bearer token, falling back to the client address."""
+    authorization = headers.get("authorization")
+    if authorization:
+        return hashlib.sha256(authorization.encode()).hexdigest()
+    if client:
+        return client[0]
+    return None
+
+def mark_write(key: Optional[str]):
+    """Pin ``key`` to the primary for ``read_your_writes_seconds``."""
+    if key is None or settings.read_your_writes_seconds <= 0:
+        return
+    now = time.monotonic()
+    if len(_primary_pins) > 10000:
+        for stale in [k for k, until in _primary_pins.items() if until <= now]:
+            _primary_pins.pop(stale, None)
+    _primary_pins[key] = now + settings.read_your_writes_seconds
+
+def wrote_recently(key: Optional[str]) -> bool:
+    return key is not None and _primary_pins.get(key, 0) > time.monotonic()
+
+def _reads_from_primary(request: Request) -> bool:
+    return wrote_recently(read_your_writes_key(request.headers, request.client))
+
+# Dependency to get a session for read-only handlers
+def get_read_db(request: Request):
+    factory = SessionLocal if _reads_from_primary(request) else ReplicaSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async session for read-only handlers
+async def get_async_read_db(request: Request):
+    factory = AsyncSessionLocal if _reads_from_primary(request) else AsyncReplicaSessionLocal
+    async with factory() as db:
+        yield db
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary for a short window after a successful write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        key = read_your_writes_key(Headers(scope=scope), scope.get("client"))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                mark_write(key)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
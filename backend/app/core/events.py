@@ -0,0 +1,232 @@
+"""Event bus for notifications that must reach every worker process.
+
+Handlers subscribe to a topic such as ``chat.message`` or to a whole
+family such as ``tickets.*``. ``publish`` is safe to call from async
+handlers and from sync handlers running in the threadpool. Once the bus is
+started, handlers always run on the event loop.
+
+Backends (``event_bus_backend``):
+
+* ``local`` - delivers only inside this process. This is the default and
+  is fine for a single uvicorn worker and for tests.
+* ``outbox`` - also appends each event to the shared ``event_outbox``
+  table. Every worker polls the table every
+  ``event_bus_poll_interval_seconds`` and delivers events published by
+  other processes. That works across workers and hosts sharing the
+  database without sticky sessions, and rows older than
+  ``event_bus_retention_seconds`` are purged.
+
+Outbox ids are allocated when a row is inserted but become visible when its
+transaction commits, so concurrent writers can commit out of order. When a
+poll sees an id jump (12 after 10), the missing ids are remembered as gaps
+and re-checked on later polls for ``event_bus_gap_timeout_seconds``. After
+that they are given up, as ids of rolled-back inserts never appear.
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import delete, func, insert, or_, select
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.events import EventOutbox
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS_BACKENDS = ("local", "outbox")
+
+Handler = Callable[[str, dict], None]
+
+# Ids re-checked per jump at most; a larger jump is a bulk rollback, not a race
+MAX_TRACKED_GAPS = 1000
+
+
+class EventBus:
+    """In-process delivery; the base for other backends."""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, topic: str, handler: Handler):
+        """Call ``handler(topic, payload)`` for ``topic``; ``family.*`` matches a whole family."""
+        self._handlers[topic].append(handler)
+
+    def publish(self, topic: str, payload: dict):
+        self.published += 1
+        self._deliver(topic, payload)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        self._loop = None
+
+    def _deliver(self, topic: str, payload: dict):
+        loop = self._loop
+        if loop is not None and loop.is_running() and not _on_loop(loop):
+            loop.call_soon_threadsafe(self._dispatch, topic, payload)
+        else:
+            self._dispatch(topic, payload)
+
+    def _dispatch(self, topic: str, payload: dict):
+        family = topic.split(".", 1)[0] + ".*"
+        for handler in self._handlers.get(topic, []) + self._handlers.get(family, []):
+            try:
+                handler(topic, payload)
+            except Exception:
+                logger.exception("Event handler for %s failed", topic)
+        self.delivered += 1
+
+
+def _on_loop(loop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class OutboxEventBus(EventBus):
+    """Shares events between processes through the ``event_outbox`` table."""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        poll_interval: float = 0.25,
+        retention_seconds: int = 300,
+        gap_timeout: float = 30,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.gap_timeout = gap_timeout
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.last_id: Optional[int] = None
+        self.gaps: Dict[int, float] = {}  # id not seen yet -> monotonic deadline
+        self._pending: "queue.Queue" = queue.Queue()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    def publish(self, topic: str, payload: dict):
+        """Deliver locally right away and queue the event for the other workers."""
+        super().publish(topic, payload)
+        self._pending.put((topic, json.dumps(payload, default=str)))
+        if self._writer is None:
+            self.flush()
+        else:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write queued events to the outbox."""
+        rows = []
+        while True:
+            try:
+                topic, payload = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            rows.append({"topic": topic, "payload": payload, "origin": self.origin, "created_at": datetime.utcnow()})
+        if rows:
+            with self.session_factory() as db:
+                db.execute(insert(EventOutbox), rows)
+                db.commit()
+
+    def poll(self) -> int:
+        """Deliver events other processes committed since the last poll; returns how many."""
+        now = time.monotonic()
+        self.gaps = {row_id: deadline for row_id, deadline in self.gaps.items() if deadline > now}
+        with self.session_factory() as db:
+            if self.last_id is None:
+                self.last_id = db.execute(select(func.max(EventOutbox.id))).scalar() or 0
+                return 0
+            condition = EventOutbox.id > self.last_id
+            if self.gaps:
+                condition = or_(condition, EventOutbox.id.in_(self.gaps))
+            rows = db.execute(select(EventOutbox).where(condition).order_by(EventOutbox.id)).scalars().all()
+        for row in rows:
+            if row.id > self.last_id:
+                first_missing = max(self.last_id + 1, row.id - MAX_TRACKED_GAPS)
+                self.gaps.update(dict.fromkeys(range(first_missing, row.id), now + self.gap_timeout))
+                self.last_id = row.id
+            else:
+                del self.gaps[row.id]  # committed after a higher id was read
+            if row.origin != self.origin:
+                self._deliver(row.topic, json.loads(row.payload))
+        return len(rows)
+
+    def purge(self) -> int:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        with self.session_factory() as db:
+            deleted = db.execute(delete(EventOutbox).where(EventOutbox.created_at < cutoff)).rowcount
+            db.commit()
+        return deleted
+
+    async def start(self):
+        await super().start()
+        await asyncio.to_thread(self.poll)
+        self._stopping.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="event-outbox-writer", daemon=True)
+        self._writer.start()
+        self._poller = asyncio.create_task(self._poll_loop())
+
+    async def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        if self._writer is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            await asyncio.to_thread(self._writer.join, 5)
+            self._writer = None
+        self.flush()
+        await super().stop()
+
+    def _write_loop(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing events to the outbox failed")
+
+    async def _poll_loop(self):
+        polls = 0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.to_thread(self.poll)
+                polls += 1
+                if polls % 200 == 0:
+                    await asyncio.to_thread(self.purge)
+            except Exception:
+                logger.exception("Polling the event outbox failed")
+
+
+def create_event_bus() -> EventBus:
+    if settings.event_bus_backend not in EVENT_BUS_BACKENDS:
+        raise ValueError(
+            f"event_bus_backend must be one of {', '.join(EVENT_BUS_BACKENDS)}, got {settings.event_bus_backend!r}"
+        )
+    if settings.event_bus_backend == "outbox":
+        return OutboxEventBus(
+            poll_interval=settings.event_bus_poll_interval_seconds,
+            retention_seconds=settings.event_bus_retention_seconds,
+            gap_timeout=settings.event_bus_gap_timeout_seconds,
+        )
+    return EventBus()
+
+
+event_bus = create_event_bus()
@@ -0,0 +1,171 @@
+"""Fast JSON responses for large lists.
+
+When a handler returns ORM objects, FastAPI validates every row into its
+``response_model`` and then serializes the models again. For a page of
+1,000 rows that round trip costs more CPU than the query. ``FastJSONResponse``
+is an opt-in shortcut. The handler returns it directly with the schema it
+documents, and the rows are serialized in one pass by a function compiled
+once per schema. The bytes are encoded with orjson when it is installed.
+
+    return FastJSONResponse(items, schema=List[InventoryItemResponse])
+
+The compiled serializer reads each schema field from ORM objects, Core
+result rows or dicts. Only the conversions that change the JSON are
+applied: floats, Decimals as strings (as pydantic does), enums and nested
+models. Nothing is validated, so use it only where the rows come straight
+from the database and already match the schema. Everywhere else,
+``response_model`` remains the safe default.
+"""
+import enum
+import json
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+Serializer = Callable[[Any], Any]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, time)):
+        text = value.isoformat()
+        # pydantic writes UTC offsets as "Z", and so does orjson with OPT_UTC_Z
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` the way pydantic's JSON mode would."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _unwrap_optional(annotation):
+    """``X`` for ``Optional[X]``; None values are never converted."""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _converter(annotation) -> Optional[Serializer]:
+    """Conversion for a non-None value of ``annotation``; None when it encodes as is."""
+    annotation = _unwrap_optional(annotation)
+    origin = get_origin(annotation)
+    if origin in (list, List, tuple, set, frozenset):
+        args = get_args(annotation)
+        item = _converter(args[0]) if args else None
+        if item is None:
+            return None if origin in (list, List) else list
+        return lambda values: [None if value is None else item(value) for value in values]
+    if origin in (dict, Dict) or annotation is Any:
+        return None
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return compile_serializer(annotation)
+        if issubclass(annotation, bool) or annotation in (str, int, datetime, date, time):
+            return None
+        if issubclass(annotation, enum.Enum):
+            return None  # encoded by value
+        if annotation is float:
+            return float
+        if annotation is Decimal:
+            return str
+    adapter = TypeAdapter(annotation)
+    return lambda value: adapter.dump_python(value, mode="json")
+
+
+def _dict_function(name: str, reads: List[tuple], namespace: dict) -> Callable:
+    """Compile ``lambda obj: {key: read, ...}`` from ``(key, read source, converter name)``."""
+    items = []
+    for key, read, convert in reads:
+        if convert is not None:
+            read = f"(None if (v := {read}) is None else {convert}(v))"
+        items.append(f"{key!r}: {read}")
+    source = f"def {name}(obj):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<serializer {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(schema) -> Serializer:
+    """Build the function turning rows into JSON-ready data for ``schema``.
+
+    ``schema`` is a pydantic model or ``List[model]``. The field reads are
+    generated as source once, so serializing a row is one dict literal.
+    Core rows are read by position, with one function per column layout.
+    """
+    origin = get_origin(schema)
+    if origin in (list, List):
+        item = compile_serializer(get_args(schema)[0])
+        return lambda rows: [item(row) for row in rows]
+    if not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+        return _converter(schema) or (lambda value: value)
+
+    namespace = {}
+    fields = []  # (name, output key, default name, converter name)
+    for index, (name, field) in enumerate(schema.model_fields.items()):
+        namespace[f"_d{index}"] = None if field.default is PydanticUndefined else field.default
+        convert = _converter(field.annotation)
+        if convert is not None:
+            namespace[f"_c{index}"] = convert
+        fields.append((name, field.serialization_alias or field.alias or name, f"_d{index}", convert and f"_c{index}"))
+
+    from_attributes = _dict_function(
+        "from_attributes", [(key, f"obj.{name}", convert) for name, key, _, convert in fields], namespace
+    )
+    from_mapping = _dict_function(
+        "from_mapping", [(key, f"obj.get({name!r}, {default})", convert) for name, key, default, convert in fields], namespace
+    )
+    layouts: Dict[tuple, Callable] = {}
+
+    def from_row(row: Row):
+        positional = layouts.get(row._fields)
+        if positional is None:
+            columns = {column: index for index, column in enumerate(row._fields)}
+            positional = layouts[row._fields] = _dict_function("from_row", [
+                (key, f"obj[{columns[name]}]" if name in columns else default, convert)
+                for name, key, default, convert in fields
+            ], dict(namespace))
+        return positional(row)
+
+    def serialize(obj):
+        if isinstance(obj, Row):
+            return from_row(obj)
+        if isinstance(obj, Mapping):
+            return from_mapping(obj)
+        return from_attributes(obj)
+
+    return serialize
+
+
+class FastJSONResponse(Response):
+    """JSON response whose content is serialized through ``compile_serializer(schema)``."""
+    media_type = "application/json"
+
+    def __init__(self, content: Any, schema=None, status_code: int = 200, headers: Optional[Dict[str, str]] = None, **kwargs):
+        self.serializer = compile_serializer(schema) if schema is not None else None
+        super().__init__(content, status_code=status_code, headers=headers, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.serializer is not None:
+            content = self.serializer(content)
+        return dumps(content)
@@ -0,0 +1,96 @@
+"""Bounded worker pool for password hashing.
+
+bcrypt is slow on purpose (about 250 ms at cost 12) and releases the GIL, so
+hashes run on a small dedicated thread pool instead of the event loop. The
+pool has ``password_hash_workers`` threads and accepts at most
+``password_hash_max_queue`` waiting jobs; beyond that requests get a 503
+rather than piling up behind a burst of logins.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from fastapi import HTTPException, status
+
+
+class PasswordHashPool:
+    """Size-limited executor for CPU-bound password work, with queue metrics."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def run(self, fn: Callable, *args):
+        """Run ``fn(*args)`` on the pool, raising 503 when the queue is full."""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent sign-in attempts, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.queued += 1
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            waited = started - submitted
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.queue_wait_total += waited
+                self.queue_wait_max = max(self.queue_wait_max, waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.run_time_total += time.perf_counter() - started
+
+        def on_done(future):
+            # A job cancelled before it started never decremented the queue
+            if future.cancelled():
+                with self._lock:
+                    self.queued -= 1
+
+        future = self._get_executor().submit(job)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_wait_avg_ms": (self.queue_wait_total / self.completed * 1000) if self.completed else 0.0,
+                "queue_wait_max_ms": self.queue_wait_max * 1000,
+                "hash_time_avg_ms": (self.run_time_total / self.completed * 1000) if self.completed else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,198 @@
+"""Conditional GET support and cached JSON responses.
+
+Endpoints build their response payload, derive an ``ETag`` from it, and
+answer ``304 Not Modified`` with no body when the client already holds
+that version.
+
+``ResponseCache`` goes further for public, rarely changing content. It
+keeps the serialized JSON body with its ``ETag`` and ``Last-Modified``,
+keyed by route and query parameters. Only single items carry a
+``Last-Modified``. A list changes when a row is deleted or unpublished,
+which no remaining ``updated_at`` records, so lists are validated by their
+``ETag`` alone. Repeated requests are then served
+without touching the database, and ``Cache-Control`` lets browsers and
+CDNs absorb most of the traffic. Write handlers call ``invalidate()``,
+which clears the namespace in every worker through the event bus. A cache
+can also read pre-rendered snapshot files (see
+``app.services.content_snapshots``) before falling back to the database.
+Their precompressed bodies are sent as-is to clients that accept them.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import event_bus
+
+
+def etag_for(payload: Any) -> str:
+    """Weak ETag for a JSON-serializable payload."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return f'W/"{hashlib.sha1(body.encode()).hexdigest()[:20]}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` names ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **(headers or {})})
+
+
+def serialize(adapter: TypeAdapter, value: Any) -> bytes:
+    """JSON for ``value`` (ORM objects or rows) as ``response_model`` would render it."""
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Content codings from an ``Accept-Encoding`` header with their q-values."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available) -> Optional[str]:
+    """The best of ``available`` (in preference order) the client accepts."""
+    accepted = accepted_encodings(accept_encoding)
+    for coding in available:
+        if accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return None
+
+
+@dataclass
+class CachedResponse:
+    """A serialized JSON response and its validators."""
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime] = None
+    extra_headers: Dict[str, str] = field(default_factory=dict)
+    # Content-Encoding -> precompressed body
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls, body: bytes, last_modified: Optional[datetime] = None, extra_headers: Optional[Dict[str, str]] = None
+    ) -> "CachedResponse":
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        if last_modified is not None and last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return cls(body=body, etag=etag, last_modified=last_modified, extra_headers=extra_headers or {})
+
+    def headers(self, cache_control: str) -> Dict[str, str]:
+        headers = {**self.extra_headers, "ETag": self.etag, "Cache-Control": cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.replace(microsecond=0), usegmt=True)
+        return headers
+
+    def not_modified_since(self, request: Request) -> bool:
+        """``If-None-Match`` wins; ``If-Modified-Since`` is only used without it."""
+        if request.headers.get("if-none-match"):
+            return etag_matches(request, self.etag)
+        since = request.headers.get("if-modified-since")
+        if not since or self.last_modified is None:
+            return False
+        try:
+            return self.last_modified.replace(microsecond=0) <= parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+
+
+class ResponseCache:
+    """Serialized responses of one namespace (e.g. ``blogs``), per worker."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: Optional[float] = None,
+        max_age: Optional[int] = None,
+        maxsize: int = 512,
+        snapshots=None,
+    ):
+        self.namespace = namespace
+        self.snapshots = snapshots
+        self.entries = TTLCache(ttl=settings.content_cache_ttl_seconds if ttl is None else ttl, maxsize=maxsize)
+        self.cache_control = f"public, max-age={settings.content_cache_max_age_seconds if max_age is None else max_age}"
+        self._generation = 0
+        self._lock = threading.Lock()
+        event_bus.subscribe(f"content.{namespace}", lambda topic, payload: self.clear())
+
+    def get(self, key: Hashable, render: Callable[[], tuple], snapshot: Optional[str] = None) -> CachedResponse:
+        """The cached entry for ``key``, loading or rendering it on a miss.
+
+        A fresh ``snapshot`` file, when named and available, is used instead
+        of ``render``.
+
+        ``render`` returns the JSON body, its last modification time (None
+        for lists) and optionally extra headers to replay (e.g.
+        ``X-Next-Cursor``). An
+        entry rendered while an invalidation happened is returned but not
+        stored, so it cannot outlive the write that made it stale.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            generation = self._generation
+            if snapshot and self.snapshots is not None:
+                entry = self.snapshots.load(snapshot)
+            if entry is None:
+                entry = CachedResponse.build(*render())
+            with self._lock:
+                if generation == self._generation:
+                    self.entries.set(key, entry)
+        return entry
+
+    def respond(
+        self, request: Request, key: Hashable, render: Callable[[], tuple], snapshot: Optional[str] = None
+    ) -> Response:
+        """200 with the cached body, or a bodyless 304 when the client's copy is current."""
+        entry = self.get(key, render, snapshot)
+        headers = entry.headers(self.cache_control)
+        if entry.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        if entry.not_modified_since(request):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        coding = choose_encoding(request.headers.get("accept-encoding", ""), entry.encoded)
+        if coding is None:
+            return Response(content=entry.body, media_type="application/json", headers=headers)
+        headers["Content-Encoding"] = coding
+        return Response(content=entry.encoded[coding], media_type="application/json", headers=headers)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.entries.clear()
+
+    def invalidate(self):
+        """Drop every cached response of this namespace here and in the other workers."""
+        self.clear()
+        event_bus.publish(f"content.{self.namespace}", {})
@@ -0,0 +1,124 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+Lists are ordered by ``(sort column, id)``. Each page returns an opaque
+``next_cursor`` holding the last row's key, and the next request resumes
+with ``WHERE (sort, id) > (last sort, last id)``. The database can seek
+straight to that point in the index instead of reading and discarding
+``skip`` rows. ``skip`` still works when no cursor is given.
+
+NULL sort values are handled the way MySQL and SQLite order them: first in
+ascending order and last in descending order.
+"""
+import base64
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(python_type, date):
+        return date.fromisoformat(value)
+    if issubclass(python_type, Decimal):
+        return Decimal(value)
+    if issubclass(python_type, enum.Enum):
+        return python_type[value]
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Opaque cursor for the row with key ``(sort_value, row_id)``."""
+    payload = json.dumps([_encode_value(sort_value), _encode_value(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column, id_column) -> Tuple[Any, Any]:
+    """Inverse of ``encode_cursor``; raises 400 for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _decode_value(sort_column, sort_value), _decode_value(id_column, row_id)
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after(sort_column, id_column, sort_value, row_id, descending: bool):
+    """Condition selecting rows strictly after ``(sort_value, row_id)``."""
+    if descending:
+        if sort_value is None:
+            return and_(sort_column.is_(None), id_column < row_id)
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id),
+            sort_column.is_(None),
+        )
+    if sort_value is None:
+        return or_(sort_column.isnot(None), and_(sort_column.is_(None), id_column > row_id))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+
+
+def keyset_paginate(
+    query,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = False,
+):
+    """Order ``query`` by ``(sort_column, id_column)`` and select one page.
+
+    Works with both ``Session.query()`` and ``select()``. One extra row is
+    fetched so that ``split_page`` can tell whether another page exists.
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column, id_column)
+        query = query.filter(_after(sort_column, id_column, sort_value, row_id, descending))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+
+def split_page(rows: Sequence, sort_column, id_column, limit: int) -> Tuple[List, Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]):
+    """Expose the cursor on list endpoints whose body is a bare array."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
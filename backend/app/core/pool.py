@@ -0,0 +1,180 @@
+"""Connection pool options, pre-ping policy and metrics.
+
+Every engine created in ``app.core.database`` is registered here so that
+``/health/db-pool`` can report how many connections are checked out, how
+many requests are waiting for one and how long checkouts take. Those
+numbers are what ``db_pool_size`` and ``db_max_overflow`` should be tuned
+against, multiplied by the number of uvicorn workers.
+"""
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from app.core.config import settings
+
+PRE_PING_POLICIES = ("always", "idle", "never")
+
+# Engine name -> metrics, e.g. "primary" and "primary_async"
+pool_metrics: Dict[str, "PoolMetrics"] = {}
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self._lock = threading.Lock()
+        self.waiters = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.connections_recycled = 0
+        self.connections_invalidated = 0
+        self.pre_pings = 0
+
+    def begin_wait(self):
+        with self._lock:
+            self.waiters += 1
+
+    def end_wait(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            self.waiters -= 1
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_wait_total += waited
+            self.checkout_wait_max = max(self.checkout_wait_max, waited)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        """Current pool state plus cumulative counters."""
+        pool = self.engine.pool if self.engine is not None else None
+        queue_pool = isinstance(pool, QueuePool)
+        with self._lock:
+            return {
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "pool_size": pool.size() if queue_pool else None,
+                "checked_out": pool.checkedout() if queue_pool else None,
+                "overflow": pool.overflow() if queue_pool else None,
+                "waiters": self.waiters,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_avg_ms": (self.checkout_wait_total / self.checkouts * 1000) if self.checkouts else 0.0,
+                "checkout_wait_max_ms": self.checkout_wait_max * 1000,
+                "connections_created": self.connections_created,
+                "connections_closed": self.connections_closed,
+                "connections_recycled": self.connections_recycled,
+                "connections_invalidated": self.connections_invalidated,
+                "pre_pings": self.pre_pings,
+            }
+
+
+def instrumented_pool_class(base, metrics: PoolMetrics):
+    """Subclass ``base`` so that time spent waiting in checkout is measured.
+
+    ``recreate()`` instantiates ``self.__class__``, so the instrumentation
+    survives ``engine.dispose()``.
+    """
+    def _do_get(self):
+        metrics.begin_wait()
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.end_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        except BaseException:
+            metrics.end_wait(time.perf_counter() - started)
+            raise
+        metrics.end_wait(time.perf_counter() - started)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def pool_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> dict:
+    """Keyword arguments for ``create_engine`` built from the pool settings."""
+    if settings.db_pool_pre_ping not in PRE_PING_POLICIES:
+        raise ValueError(
+            f"db_pool_pre_ping must be one of {', '.join(PRE_PING_POLICIES)}, got {settings.db_pool_pre_ping!r}"
+        )
+
+    options = {
+        "pool_pre_ping": settings.db_pool_pre_ping == "always",
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    # SQLite uses single-connection pools that take no sizing arguments
+    if make_url(url).get_backend_name() != "sqlite":
+        base = AsyncAdaptedQueuePool if is_async else QueuePool
+        options.update(
+            poolclass=instrumented_pool_class(base, metrics),
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_use_lifo=settings.db_pool_use_lifo,
+        )
+    return options
+
+
+def _ping(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    except Exception as err:
+        # Makes the pool discard this connection and retry with a new one
+        raise exc.DisconnectionError() from err
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    """Attach metric listeners and the ``idle`` pre-ping policy to ``engine``."""
+    metrics.engine = engine
+    pool_metrics[metrics.name] = metrics
+    # AsyncEngine wraps a sync engine which owns the pool events
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.increment("connections_created")
+
+    @event.listens_for(sync_engine, "close")
+    def on_close(dbapi_connection, connection_record):
+        metrics.increment("connections_closed")
+        recycle = settings.db_pool_recycle
+        if recycle > -1 and time.time() - connection_record.starttime > recycle:
+            metrics.increment("connections_recycled")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("connections_invalidated")
+
+    if settings.db_pool_pre_ping == "idle":
+        @event.listens_for(sync_engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            if connection_record is not None:
+                connection_record.info["checked_in_at"] = time.monotonic()
+
+        @event.listens_for(sync_engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            checked_in_at = connection_record.info.get("checked_in_at")
+            if checked_in_at is None:
+                return  # freshly connected
+            if time.monotonic() - checked_in_at >= settings.db_pool_pre_ping_idle_seconds:
+                metrics.increment("pre_pings")
+                _ping(dbapi_connection)
+
+    return engine
@@ -0,0 +1,13 @@
+"""Helpers for reporting pydantic validation errors per row.
+
+Bulk writers and importers validate rows one at a time and report invalid
+rows in their results instead of failing the whole request.
+"""
+from pydantic import ValidationError
+
+
+def validation_message(exc: ValidationError) -> str:
+    """One line such as ``"name: Field required; stock: Input should be a valid integer"``."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
@@ -1,8 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, ReadYourWritesMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.pool import pool_metrics
+from app.core.pagination import NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER
+from app.core.auth import password_hash_pool
+from app.core.events import event_bus
 from app.api import api_router
+from app.services.dashboard import rebuild_dashboard_snapshot_job
+from app.services.content_snapshots import content_snapshots
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import logging
 
 # Set up logging
@@ -25,8 +34,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, PREV_CURSOR_HEADER, "ETag"],
 )
 
+# Keep reads on the primary right after a client writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Compress large bodies; outermost so every response passes through it
+app.add_middleware(CompressionMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.api_v1_str)
 
@@ -40,8 +56,53 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db-pool")
+async def db_pool_metrics():
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+@app.get("/health/password-pool")
+async def password_pool_metrics():
+    return password_hash_pool.snapshot()
+
+async def rebuild_dashboard_snapshot_periodically(interval: int):
+    """Periodically rebuild the dashboard snapshot to correct any drift."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(rebuild_dashboard_snapshot_job)
+        except Exception:
+            logger.exception("Dashboard snapshot rebuild failed")
+
+async def rebuild_content_snapshots_periodically(interval: int):
+    """Write every content snapshot at startup and then on each interval."""
+    while True:
+        try:
+            await run_in_threadpool(content_snapshots.build_all_job)
+        except Exception:
+            logger.exception("Content snapshot rebuild failed")
+        await asyncio.sleep(interval)
+
+background_tasks = []
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("ERP Backend API starting up...")
     logger.info(f"CORS origins: {['*']}")
     logger.info(f"API prefix: {settings.api_v1_str}")
+    await event_bus.start()
+    if settings.dashboard_snapshot_rebuild_seconds > 0:
+        background_tasks.append(asyncio.create_task(
+            rebuild_dashboard_snapshot_periodically(settings.dashboard_snapshot_rebuild_seconds)
+        ))
+    if content_snapshots.enabled and settings.content_snapshot_rebuild_seconds > 0:
+        background_tasks.append(asyncio.create_task(
+            rebuild_content_snapshots_periodically(settings.content_snapshot_rebuild_seconds)
+        ))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    password_hash_pool.shutdown()
+    await event_bus.stop()
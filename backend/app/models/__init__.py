@@ -1,12 +1,13 @@
 from sqlalchemy import (
     Column, String, Boolean, Integer, Numeric, Date, DateTime, 
-    ForeignKey, Text, JSON, Enum
+    ForeignKey, Text, JSON, Enum, DDL, Index, PrimaryKeyConstraint, event
 )
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 import uuid
 import enum
+from app.models.tickets import ticket_indexes
 
 # --- Base Model and Declarative Base ---
 # Using declarative_base() from sqlalchemy.orm for modern SQLAlchemy
@@ -48,6 +49,14 @@ class TicketPriority(enum.Enum):
 class Profile(BaseModel):
     """Represents user profiles, the central entity for users."""
     __tablename__ = "profiles"
+    # The user directory filters by status/lock, searches name prefixes (email
+    # is covered by its unique index) and pages on (created_at, id)
+    __table_args__ = (
+        Index("ix_profiles_status_locked", "status", "account_locked"),
+        Index("ix_profiles_first_name", "first_name"),
+        Index("ix_profiles_last_name", "last_name"),
+        Index("ix_profiles_created_at_id", "created_at", "id"),
+    )
     
     email = Column(String(255), nullable=False, unique=True)
     first_name = Column(String(255), nullable=True)
@@ -73,6 +82,7 @@ class AdminUserAction(BaseModel):
 class Blog(BaseModel):
     """Model for blog posts."""
     __tablename__ = "blogs"
+    __table_args__ = (Index("ix_blogs_published_publish_date_id", "published", "publish_date", "id"),)
     
     title = Column(Text, nullable=False)
     slug = Column(String(255), nullable=False, unique=True)
@@ -90,6 +100,8 @@ class Blog(BaseModel):
 class Customer(BaseModel):
     """Model for customer information."""
     __tablename__ = "customers"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_customers_created_at_id", "created_at", "id"),)
     
     name = Column(Text, nullable=False)
     email = Column(String(255), nullable=False)
@@ -114,6 +126,8 @@ class Doc(BaseModel):
 class Employee(BaseModel):
     """Model for employee data."""
     __tablename__ = "employees"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_employees_created_at_id", "created_at", "id"),)
     
     # FIX: Changed from Text to String(255) to allow unique=True (indexing) in MySQL.
     # This resolves the "key specification without a key length" error.
@@ -173,6 +187,8 @@ class GroupMember(BaseModel):
 class InventoryItem(BaseModel):
     """Model for inventory items."""
     __tablename__ = "inventory_items"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_inventory_items_created_at_id", "created_at", "id"),)
     
     name = Column(Text, nullable=False)
     category = Column(Text, nullable=False)
@@ -217,6 +233,8 @@ class Message(BaseModel):
 class Project(BaseModel):
     """Model for projects."""
     __tablename__ = "projects"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_projects_created_at_id", "created_at", "id"),)
     
     name = Column(Text, nullable=False)
     description = Column(Text, nullable=True)
@@ -230,6 +248,8 @@ class Project(BaseModel):
 class Supplier(BaseModel):
     """Model for supplier information. Referenced by PurchaseOrder."""
     __tablename__ = "suppliers"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_suppliers_created_at_id", "created_at", "id"),)
     
     name = Column(Text, nullable=False)
     contact_person = Column(Text, nullable=True)
@@ -241,6 +261,8 @@ class Supplier(BaseModel):
 class PurchaseOrder(BaseModel):
     """Model for purchase orders."""
     __tablename__ = "purchase_orders"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_purchase_orders_created_at_id", "created_at", "id"),)
     
     po_number = Column(Text, nullable=False)
     supplier_id = Column(CHAR(36), ForeignKey('suppliers.id'), nullable=True)
@@ -264,6 +286,8 @@ class Report(BaseModel):
 class SalesLead(BaseModel):
     """Model for tracking sales leads."""
     __tablename__ = "sales_leads"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_sales_leads_created_at_id", "created_at", "id"),)
     
     name = Column(Text, nullable=False)
     email = Column(String(255), nullable=False)
@@ -305,6 +329,7 @@ class SystemSetting(BaseModel):
 class Ticket(BaseModel):
     """Model for support tickets."""
     __tablename__ = "tickets"
+    __table_args__ = ticket_indexes()
     
     ticket_number = Column(String(50), nullable=False, unique=True)
     title = Column(String(255), nullable=False)
@@ -320,6 +345,20 @@ class Ticket(BaseModel):
     assigned_to = Column(CHAR(36), ForeignKey('profiles.id'), nullable=True)
     group_id = Column(CHAR(36), ForeignKey('groups.id'), nullable=True)
 
+# Ticket search filters on ft_tickets_search and ranks with the per-column
+# indexes on MySQL; other backends use ticket_search_terms
+for _name, _columns in (
+    ("ft_tickets_search", "title, description, ticket_number"),
+    ("ft_tickets_ticket_number", "ticket_number"),
+    ("ft_tickets_title", "title"),
+    ("ft_tickets_description", "description"),
+):
+    event.listen(
+        Ticket.__table__,
+        "after_create",
+        DDL(f"CREATE FULLTEXT INDEX {_name} ON tickets ({_columns})").execute_if(dialect="mysql"),
+    )
+
 class TicketComment(BaseModel):
     """Model for comments on support tickets."""
     __tablename__ = "ticket_comments"
@@ -350,6 +389,15 @@ class TicketHistory(BaseModel):
     new_value = Column(String(255), nullable=True)
     changed_by = Column(CHAR(36), ForeignKey('profiles.id'), nullable=False)
 
+class TicketSearchTerm(Base):
+    """Inverted index of ticket words, used for search where FULLTEXT is unavailable."""
+    __tablename__ = "ticket_search_terms"
+    __table_args__ = (PrimaryKeyConstraint('term', 'ticket_id'),)
+    
+    term = Column(String(64), nullable=False)
+    ticket_id = Column(CHAR(36), ForeignKey('tickets.id', ondelete='CASCADE'), nullable=False, index=True)
+    weight = Column(Integer, nullable=False)
+
 class TypingIndicator(BaseModel):
     """Model to indicate if a user is currently typing."""
     __tablename__ = "typing_indicators"
@@ -401,6 +449,8 @@ class UserRole(BaseModel):
 class WorkOrder(BaseModel):
     """Model for work orders."""
     __tablename__ = "work_orders"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_work_orders_created_at_id", "created_at", "id"),)
     
     work_order_id = Column(Text, nullable=False)
     product = Column(Text, nullable=False)
@@ -425,6 +475,8 @@ class User(BaseModel):
 class ChatMessage(BaseModel):
     """Model for chat messages."""
     __tablename__ = "chat_messages"
+    # Message history and incremental sync seek on (created_at, id)
+    __table_args__ = (Index("ix_chat_messages_created_at_id", "created_at", "id"),)
     
     user_id = Column(CHAR(36), ForeignKey('profiles.id'), nullable=False)
     content = Column(Text, nullable=False)
@@ -439,3 +491,5 @@ class ChatTypingIndicator(BaseModel):
 # Import finance models to ensure they're included in metadata
 # This should be at the end to avoid circular dependencies
 from app.models.finance import Transaction, FinanceInvoice, FinanceExpense
+from app.models.dashboard import DashboardSnapshot
+from app.models.events import EventOutbox
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Float, Integer, Numeric, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DashboardSnapshot(Base):
+    """Materialized dashboard metrics, kept current by the write endpoints."""
+    __tablename__ = "dashboard_snapshots"
+
+    id = Column(String(36), primary_key=True)  # one row per scope, currently only "global"
+    total_revenue = Column(Float, nullable=False, default=0)
+    total_orders = Column(Integer, nullable=False, default=0)
+    active_employees = Column(Integer, nullable=False, default=0)
+    total_inventory_items = Column(Integer, nullable=False, default=0)
+    total_stock = Column(Integer, nullable=False, default=0)
+    low_stock_items = Column(Integer, nullable=False, default=0)
+    out_of_stock_items = Column(Integer, nullable=False, default=0)
+    total_leads_value = Column(Numeric(14, 2), nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=True)  # last full rebuild
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+
+
+class EventOutbox(Base):
+    """Events shared between worker processes by the outbox event bus."""
+    __tablename__ = "event_outbox"
+    __table_args__ = (Index("ix_event_outbox_created_at", "created_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    origin = Column(String(100), nullable=False)  # publishing process, skipped when it polls
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, Float, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,6 +6,8 @@ import uuid
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_transactions_created_at_id", "created_at", "id"),)
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     type = Column(String(50), nullable=False)  # income, expense, transfer
@@ -13,7 +15,7 @@ class Transaction(Base):
     description = Column(Text)
     date = Column(DateTime, nullable=False)
     category = Column(String(100), nullable=False)
-    reference = Column(String(100), nullable=True)
+    reference = Column(String(100), nullable=True, unique=True, index=True)  # imports de-duplicate on it
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(CHAR(36), nullable=True)  # Removed foreign key temporarily
@@ -21,6 +23,8 @@ class Transaction(Base):
 
 class FinanceInvoice(Base):
     __tablename__ = "finance_invoices"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_finance_invoices_created_at_id", "created_at", "id"),)
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     invoice_number = Column(String(100), nullable=False, unique=True)
@@ -37,6 +41,8 @@ class FinanceInvoice(Base):
 
 class FinanceExpense(Base):
     __tablename__ = "finance_expenses"
+    # The list endpoint seeks on (created_at, id)
+    __table_args__ = (Index("ix_finance_expenses_created_at_id", "created_at", "id"),)
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     expense_number = Column(String(100), nullable=False, unique=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, Enum, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, Enum, ForeignKey, Integer, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -30,8 +30,31 @@ class TicketType(enum.Enum):
     QUESTION = "question"
 
 
+# Secondary indexes for the filter/sort combinations used by GET /tickets.
+# The trailing created_at/due_date columns let a filtered queue be read in
+# sort order without a filesort (InnoDB appends the primary key, which the
+# keyset cursor uses as tie-breaker). app.models.Ticket maps the same table
+# and declares the same set.
+TICKET_INDEXES = (
+    ("ix_tickets_status_created_at", ("status", "created_at")),
+    ("ix_tickets_priority_created_at", ("priority", "created_at")),
+    ("ix_tickets_assigned_status_due", ("assigned_to", "status", "due_date")),
+    ("ix_tickets_department_priority", ("department", "priority")),
+    ("ix_tickets_type_created_at", ("ticket_type", "created_at")),
+    ("ix_tickets_created_by_created_at", ("created_by", "created_at")),
+    ("ix_tickets_created_at", ("created_at",)),
+    ("ix_tickets_due_date", ("due_date",)),
+)
+
+
+def ticket_indexes():
+    """New ``Index`` objects for ``TICKET_INDEXES``; an Index belongs to a single table."""
+    return tuple(Index(name, *columns) for name, columns in TICKET_INDEXES)
+
+
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = ticket_indexes()
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     ticket_number = Column(String(50), nullable=False, unique=True)
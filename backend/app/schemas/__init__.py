@@ -159,6 +159,27 @@ class InventoryItemResponse(InventoryItemBase, BaseSchema):
     updated_at: datetime
     created_by: Optional[str] = None
 
+class InventoryBulkRequest(BaseModel):
+    # Rows are validated one by one so that a bad row fails alone:
+    # create rows are InventoryItemCreate, update rows InventoryItemUpdate plus "id"
+    create: List[Dict[str, Any]] = []
+    update: List[Dict[str, Any]] = []
+    delete: List[str] = []
+
+class InventoryBulkRowResult(BaseModel):
+    operation: str  # create, update or delete
+    index: int  # position in the request list of that operation
+    id: Optional[str] = None
+    status: str  # created, updated, deleted or error
+    error: Optional[str] = None
+
+class InventoryBulkResponse(BaseModel):
+    created: int
+    updated: int
+    deleted: int
+    failed: int
+    results: List[InventoryBulkRowResult]
+
 # Sales Lead schemas
 class SalesLeadBase(BaseModel):
     name: str
@@ -426,6 +447,19 @@ class BlogResponse(BlogBase, BaseSchema):
     created_at: datetime
     updated_at: datetime
 
+class BlogSummary(BaseSchema):
+    """Blog index entry; the body is only served by the slug route."""
+    id: str
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    featured_image: Optional[str] = None
+    category: str
+    tags: Optional[List[str]] = None
+    featured: bool = False
+    publish_date: Optional[datetime] = None
+    updated_at: datetime
+
 # Doc schemas
 class DocBase(BaseModel):
     title: str
@@ -455,6 +489,16 @@ class DocResponse(DocBase, BaseSchema):
     created_at: datetime
     updated_at: datetime
 
+class DocSummary(BaseSchema):
+    """Documentation index entry without the page body."""
+    id: str
+    title: str
+    slug: str
+    category: str
+    tags: Optional[List[str]] = None
+    featured: bool = False
+    updated_at: datetime
+
 # Dashboard stats schema
 class DashboardStats(BaseModel):
     totalRevenue: Decimal
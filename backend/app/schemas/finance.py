@@ -37,6 +37,28 @@ class TransactionOut(TransactionBase):
 class TransactionList(BaseModel):
     items: List[TransactionOut]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class TransactionImportProgress(BaseModel):
+    import_id: str
+    status: str  # running, completed or failed
+    rows: int
+    inserted: int
+    duplicates: int  # reference already stored or repeated in the file
+    failed: int
+    batches: int
+
+
+class TransactionImportError(BaseModel):
+    line: int
+    reference: Optional[str] = None
+    error: str
+
+
+class TransactionImportSummary(TransactionImportProgress):
+    errors: List[TransactionImportError]
+    errors_truncated: bool = False
 
 
 # Invoice schemas
@@ -76,6 +98,7 @@ class FinanceInvoiceOut(FinanceInvoiceBase):
 class FinanceInvoiceList(BaseModel):
     items: List[FinanceInvoiceOut]
     total: int
+    next_cursor: Optional[str] = None
 
 
 # Expense schemas
@@ -111,3 +134,4 @@ class FinanceExpenseOut(FinanceExpenseBase):
 class FinanceExpenseList(BaseModel):
     items: List[FinanceExpenseOut]
     total: int
+    next_cursor: Optional[str] = None
@@ -139,7 +139,7 @@ class TicketListResponse(BaseModel):
         from_attributes = True
 
 
-class TicketStatsResponse(BaseModel):
+class TicketStatsCounts(BaseModel):
     total_tickets: int
     open_tickets: int
     in_progress_tickets: int
@@ -148,3 +148,13 @@ class TicketStatsResponse(BaseModel):
     urgent_tickets: int
     high_priority_tickets: int
     overdue_tickets: int
+
+
+class TicketStatsBreakdown(TicketStatsCounts):
+    key: Optional[str] = None
+
+
+class TicketStatsResponse(TicketStatsCounts):
+    by_department: List[TicketStatsBreakdown] = []
+    by_module: List[TicketStatsBreakdown] = []
+    by_assignee: List[TicketStatsBreakdown] = []
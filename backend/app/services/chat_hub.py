@@ -0,0 +1,166 @@
+"""In-process pub/sub for chat, plus in-memory typing state.
+
+Every WebSocket connection in ``app.api.endpoints.chat_ws`` subscribes to
+``chat_hub``. The chat REST handlers publish new messages and typing
+changes to it. Each subscriber has a bounded queue. A subscriber that
+falls behind has its queue replaced by a single ``resync`` event, which
+tells the client to backfill from ``GET /chat/messages``. A slow client
+never blocks the publisher.
+
+Typing indicators are short-lived and never need to survive a restart, so
+they live in ``typing_state`` with a TTL instead of in the
+``chat_typing_indicators`` table.
+
+Both objects belong to one process. Publishers therefore go through
+``app.core.events.event_bus`` (``publish_message`` and ``publish_typing``).
+The handlers at the bottom of this module feed bus events into the hub and
+the typing state of every worker. Ticket and inventory changes are
+forwarded to the sockets as ``notification`` events.
+"""
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from app.core.config import settings
+from app.core.events import event_bus
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """One subscriber's queue of pending events."""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflows = 0
+
+    def offer(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class ChatHub:
+    """Fans events out to every subscriber in this process."""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self.published = 0
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: dict):
+        """Queue ``event`` for every subscriber; must run on the event loop."""
+        self.published += 1
+        for subscription in list(self._subscribers):
+            subscription.offer(event)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+
+class TypingState:
+    """Who is typing right now; entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # user id -> (user name, started at, monotonic expiry)
+        self._typing: Dict[str, tuple] = {}
+
+    def set(self, user_id: str, user_name: str, is_typing: bool) -> dict:
+        """Record a typing change and return it as an event payload."""
+        now = datetime.now()
+        with self._lock:
+            if is_typing:
+                started_at = self._typing.get(user_id, (None, now))[1]
+                self._typing[user_id] = (user_name, started_at, time.monotonic() + self.ttl)
+            else:
+                self._typing.pop(user_id, None)
+                started_at = now
+        return self._entry(user_id, user_name, is_typing, started_at, now)
+
+    def active(self, exclude_user_id: Optional[str] = None) -> List[dict]:
+        """Unexpired typing entries, optionally without one user."""
+        now = time.monotonic()
+        with self._lock:
+            for user_id in [user_id for user_id, (_, _, expires_at) in self._typing.items() if expires_at <= now]:
+                del self._typing[user_id]
+            entries = list(self._typing.items())
+        updated_at = datetime.now()
+        return [
+            self._entry(user_id, user_name, True, started_at, updated_at)
+            for user_id, (user_name, started_at, _) in entries
+            if user_id != exclude_user_id
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._typing.clear()
+
+    def _entry(self, user_id, user_name, is_typing, started_at, updated_at) -> dict:
+        return {
+            "id": user_id,
+            "user_id": user_id,
+            "user_name": user_name,
+            "is_typing": is_typing,
+            "created_at": started_at.isoformat(),
+            "updated_at": updated_at.isoformat(),
+            "expires_in": self.ttl if is_typing else 0,
+        }
+
+
+def message_event(message: dict) -> dict:
+    return {"type": "message", "message": message}
+
+
+def typing_event(entry: dict) -> dict:
+    return {"type": "typing", "typing": entry}
+
+
+chat_hub = ChatHub(queue_size=settings.chat_subscriber_queue_size)
+typing_state = TypingState(ttl=settings.chat_typing_ttl_seconds)
+
+
+def publish_message(message: dict):
+    event_bus.publish("chat.message", message)
+
+
+def publish_typing(user_id: str, user_name: str, is_typing: bool) -> dict:
+    """Update this worker's typing state and tell the others; returns the entry."""
+    entry = typing_state.set(user_id, user_name, is_typing)
+    event_bus.publish("chat.typing", {"user_id": user_id, "user_name": user_name, "is_typing": is_typing})
+    return entry
+
+
+def _on_message(topic: str, message: dict):
+    chat_hub.publish(message_event(message))
+
+
+def _on_typing(topic: str, payload: dict):
+    chat_hub.publish(typing_event(typing_state.set(payload["user_id"], payload["user_name"], payload["is_typing"])))
+
+
+def _on_notification(topic: str, payload: dict):
+    chat_hub.publish({"type": "notification", "topic": topic, "data": payload})
+
+
+event_bus.subscribe("chat.message", _on_message)
+event_bus.subscribe("chat.typing", _on_typing)
+event_bus.subscribe("tickets.*", _on_notification)
+event_bus.subscribe("inventory.*", _on_notification)
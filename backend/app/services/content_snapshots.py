@@ -0,0 +1,279 @@
+"""Pre-rendered snapshots of published blogs, docs and FAQs.
+
+Public content changes rarely but is read on every page view. When
+``content_snapshot_dir`` is set, each published list, category index and
+page is written there as JSON together with gzip and (when the optional
+``brotli`` package is installed) brotli copies:
+
+    blogs/list.json           blogs/list.json.gz       blogs/list.json.br
+    blogs/categories.json     blogs/item-<slug>.json   faqs/item-<id>.json
+
+The content caches load a snapshot before falling back to the database,
+and the precompressed bytes are sent as they are. A snapshot is fresh
+until it is ``content_snapshot_max_age_seconds`` old. Write handlers
+discard the snapshots a change affects before answering, then rebuild
+them in the background. A periodic full rebuild keeps the rest fresh.
+Files are replaced atomically, so workers sharing the directory never
+read a partial snapshot.
+
+Writes win over rebuilds that were already running. Every write replaces
+its namespace's generation token (``<namespace>/.generation``). A build
+reads the token before querying and drops its snapshots when the token
+changed before they were written.
+"""
+import gzip
+import logging
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+from urllib.parse import quote
+from fastapi import BackgroundTasks
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http_cache import CachedResponse, serialize
+from app.models import Blog, Doc, FAQ
+from app.schemas import BlogResponse, DocResponse, FAQResponse
+
+try:
+    import brotli
+except ImportError:  # optional; gzip snapshots are always written
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+category_list = TypeAdapter(List[str])
+
+
+@dataclass(frozen=True)
+class ContentType:
+    """How one public namespace is queried and serialized."""
+    model: type
+    schema: type
+    order_by: tuple
+    key: str  # attribute naming an item snapshot: slug, or id for FAQs
+
+    def published(self, db: Session):
+        return db.query(self.model).filter(self.model.published == True)
+
+
+CONTENT_TYPES = {
+    "blogs": ContentType(Blog, BlogResponse, (Blog.publish_date.desc(),), "slug"),
+    "docs": ContentType(Doc, DocResponse, (Doc.category, Doc.title), "slug"),
+    "faqs": ContentType(FAQ, FAQResponse, (FAQ.order_index,), "id"),
+}
+
+
+def list_name(namespace: str) -> str:
+    return f"{namespace}/list"
+
+
+def categories_name(namespace: str) -> str:
+    return f"{namespace}/categories"
+
+
+def item_name(namespace: str, key: str) -> str:
+    return f"{namespace}/item-{quote(str(key), safe='')}"
+
+
+def is_item(name: str) -> bool:
+    return name.rpartition("/")[2].startswith("item-")
+
+
+class _Superseded(Exception):
+    """A write changed the namespace after its snapshots were rendered."""
+
+
+class ContentSnapshots:
+    """Reads and writes the snapshot files of one directory."""
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        max_age: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.directory = Path(directory) if directory else None
+        self.max_age = settings.content_snapshot_max_age_seconds if max_age is None else max_age
+        self.session_factory = session_factory
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def _path(self, name: str, suffix: str = "") -> Path:
+        return self.directory / f"{name}.json{suffix}"
+
+    def load(self, name: str) -> Optional[CachedResponse]:
+        """The snapshot ``name`` with its precompressed bodies, or None when missing or stale."""
+        if not self.enabled:
+            return None
+        path = self._path(name)
+        try:
+            stat = path.stat()
+            if self.max_age and time.time() - stat.st_mtime > self.max_age:
+                return None
+            # Lists and category indexes are validated by their ETag alone (see http_cache)
+            last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc) if is_item(name) else None
+            entry = CachedResponse.build(path.read_bytes(), last_modified)
+        except FileNotFoundError:
+            return None
+        for coding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            compressed = self._path(name, suffix)
+            try:
+                # A copy newer than the JSON belongs to a rebuild still in progress
+                if compressed.stat().st_mtime_ns <= stat.st_mtime_ns:
+                    entry.encoded[coding] = compressed.read_bytes()
+            except FileNotFoundError:
+                pass
+        return entry
+
+    def _replace(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def generation(self, namespace: str) -> str:
+        """Token replaced by every write to ``namespace``."""
+        try:
+            return (self.directory / namespace / ".generation").read_text()
+        except FileNotFoundError:
+            return ""
+
+    def _check(self, namespace: str, generation: Optional[str]):
+        if generation is not None and self.generation(namespace) != generation:
+            raise _Superseded(namespace)
+
+    def write(self, name: str, body: bytes, generation: Optional[str] = None):
+        """Write snapshot ``name``, unless its namespace left ``generation`` before or during the write."""
+        namespace = name.partition("/")[0]
+        self._check(namespace, generation)
+        # The JSON goes last: ``load`` only pairs it with copies written before it
+        if brotli is not None:
+            self._replace(self._path(name, ".br"), brotli.compress(body, quality=11))
+        else:
+            self.discard_files(self._path(name, ".br"))
+        self._replace(self._path(name, ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+        self._replace(self._path(name), body)
+        try:
+            self._check(namespace, generation)
+        except _Superseded:
+            self.discard([name])
+            raise
+
+    def discard(self, names: Iterable[str]):
+        """Make snapshots stale right away; the API falls back to the database."""
+        if not self.enabled:
+            return
+        for name in names:
+            self.discard_files(*(self._path(name, suffix) for suffix in ("", ".gz", ".br")))
+
+    @staticmethod
+    def discard_files(*paths: Path):
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def build_list(self, db: Session, namespace: str, generation: Optional[str] = None):
+        content = CONTENT_TYPES[namespace]
+        rows = content.published(db).order_by(*content.order_by).all()
+        self.write(list_name(namespace), serialize(TypeAdapter(List[content.schema]), rows), generation)
+
+    def build_categories(self, db: Session, namespace: str, generation: Optional[str] = None):
+        model = CONTENT_TYPES[namespace].model
+        categories = db.query(model.category).filter(model.published == True).distinct().all()
+        body = serialize(category_list, [cat[0] for cat in categories if cat[0]])
+        self.write(categories_name(namespace), body, generation)
+
+    def build_item(self, db: Session, namespace: str, key: str, generation: Optional[str] = None):
+        """Write the snapshot of one published item, or drop it when unpublished or gone."""
+        content = CONTENT_TYPES[namespace]
+        row = content.published(db).filter(getattr(content.model, content.key) == key).first()
+        if row is None:
+            self.discard([item_name(namespace, key)])
+            return
+        self._write_item(namespace, row, generation)
+
+    def _write_item(self, namespace: str, row, generation: Optional[str] = None) -> str:
+        content = CONTENT_TYPES[namespace]
+        name = item_name(namespace, getattr(row, content.key))
+        self.write(name, content.schema.model_validate(row).model_dump_json().encode(), generation)
+        return name
+
+    def build_all(self, db: Session):
+        """Write every snapshot and remove those of items no longer published."""
+        for namespace, content in CONTENT_TYPES.items():
+            # Read before the queries, so a write committed after them wins
+            generation = self.generation(namespace)
+            try:
+                self.build_list(db, namespace, generation)
+                self.build_categories(db, namespace, generation)
+                written = {self._write_item(namespace, row, generation) for row in content.published(db).all()}
+                existing = {f"{namespace}/{path.name[:-len('.json')]}" for path in (self.directory / namespace).glob("item-*.json")}
+                self._check(namespace, generation)
+                self.discard(existing - written)
+            except _Superseded:
+                logger.info("Skipped the %s snapshots: a write changed them during the rebuild", namespace)
+
+    def rebuild(self, namespace: str, keys: Iterable[str] = ()):
+        """Rebuild the list, category index and ``keys`` items of ``namespace``."""
+        if not self.enabled:
+            return
+        generation = self.generation(namespace)
+        db = self.session_factory()
+        try:
+            self.build_list(db, namespace, generation)
+            self.build_categories(db, namespace, generation)
+            for key in keys:
+                self.build_item(db, namespace, key, generation)
+        except _Superseded:
+            logger.info("Skipped the %s snapshots: a later write rebuilds them", namespace)
+        except Exception:
+            logger.exception("Rebuilding %s snapshots failed", namespace)
+        finally:
+            db.close()
+
+    def refresh(self, background_tasks: BackgroundTasks, namespace: str, *keys: Optional[str]):
+        """Discard the snapshots a write affects now and rebuild them after the response."""
+        if not self.enabled:
+            return
+        keys = sorted({key for key in keys if key})
+        # Builds already running see the new token and leave the files to this write's rebuild
+        self._replace(self.directory / namespace / ".generation", uuid.uuid4().hex.encode())
+        self.discard([list_name(namespace), categories_name(namespace)] + [item_name(namespace, key) for key in keys])
+        background_tasks.add_task(self.rebuild, namespace, keys)
+
+    def build_all_job(self):
+        """Full rebuild in its own session, for the periodic background task."""
+        if not self.enabled:
+            return
+        db = self.session_factory()
+        try:
+            self.build_all(db)
+        finally:
+            db.close()
+
+
+content_snapshots = ContentSnapshots(settings.content_snapshot_dir)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if not content_snapshots.enabled:
+        raise SystemExit("Set CONTENT_SNAPSHOT_DIR to build content snapshots")
+    content_snapshots.build_all_job()
+    logger.info("Content snapshots written to %s", content_snapshots.directory)
@@ -0,0 +1,234 @@
+"""Dashboard aggregation queries and the materialized snapshot.
+
+Builds the SQL behind ``/dashboard/stats`` so that revenue, stock and lead
+totals are computed by the database in a single round trip instead of
+loading whole tables into Python. The results are persisted in
+``dashboard_snapshots``; write endpoints apply deltas to that row and a
+periodic rebuild corrects any drift. The rebuild locks the row before it
+reads the totals, so deltas committed around it are neither lost nor
+counted twice.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import insert, select, update, func, case, true
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models import Employee, InventoryItem, SalesLead
+from app.models.finance import FinanceInvoice
+from app.models.dashboard import DashboardSnapshot
+
+PAID_INVOICE_STATUS = "paid"
+LOW_STOCK_STATUS = "low stock"
+OUT_OF_STOCK_STATUS = "out of stock"
+
+DEFAULT_TOP_N = 10
+
+SNAPSHOT_ID = "global"
+
+# DashboardStats field -> DashboardSnapshot column
+SNAPSHOT_COLUMNS = {
+    "totalRevenue": "total_revenue",
+    "totalOrders": "total_orders",
+    "activeEmployees": "active_employees",
+    "totalInventoryItems": "total_inventory_items",
+    "totalStock": "total_stock",
+    "lowStockItems": "low_stock_items",
+    "outOfStockItems": "out_of_stock_items",
+    "totalLeadsValue": "total_leads_value",
+}
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def dashboard_metrics_query():
+    """Return one SELECT producing every dashboard metric as a single row."""
+    invoices = select(
+        func.coalesce(
+            func.sum(case((FinanceInvoice.status == PAID_INVOICE_STATUS, FinanceInvoice.amount), else_=0)), 0
+        ).label("totalRevenue"),
+        func.count(FinanceInvoice.id).label("totalOrders"),
+    ).subquery("invoice_stats")
+
+    employees = select(
+        func.count(Employee.id).label("activeEmployees"),
+    ).subquery("employee_stats")
+
+    inventory = select(
+        func.count(InventoryItem.id).label("totalInventoryItems"),
+        func.coalesce(func.sum(InventoryItem.stock), 0).label("totalStock"),
+        _count_where(InventoryItem.status == LOW_STOCK_STATUS).label("lowStockItems"),
+        _count_where(InventoryItem.status == OUT_OF_STOCK_STATUS).label("outOfStockItems"),
+    ).subquery("inventory_stats")
+
+    leads = select(
+        func.coalesce(func.sum(SalesLead.value), 0).label("totalLeadsValue"),
+    ).subquery("lead_stats")
+
+    # Each subquery yields exactly one row, so the cross join is one row too.
+    return select(
+        invoices.c.totalRevenue,
+        invoices.c.totalOrders,
+        employees.c.activeEmployees,
+        inventory.c.totalInventoryItems,
+        inventory.c.totalStock,
+        inventory.c.lowStockItems,
+        inventory.c.outOfStockItems,
+        leads.c.totalLeadsValue,
+    ).select_from(
+        invoices.join(employees, true()).join(inventory, true()).join(leads, true())
+    )
+
+
+def dashboard_metrics(row) -> dict:
+    """Convert a row of ``dashboard_metrics_query`` into ``DashboardStats`` fields."""
+    return {
+        "totalRevenue": row.totalRevenue or 0,
+        "totalOrders": int(row.totalOrders or 0),
+        "activeEmployees": int(row.activeEmployees or 0),
+        "totalInventoryItems": int(row.totalInventoryItems or 0),
+        "totalStock": int(row.totalStock or 0),
+        "lowStockItems": int(row.lowStockItems or 0),
+        "outOfStockItems": int(row.outOfStockItems or 0),
+        "totalLeadsValue": row.totalLeadsValue or 0,
+    }
+
+
+def _limited(query, limit: Optional[int]):
+    return query if limit is None else query.limit(limit)
+
+
+def top_employees_query(limit: Optional[int] = DEFAULT_TOP_N):
+    """Most recently hired employees; ``limit=None`` returns everyone."""
+    return _limited(select(Employee).order_by(Employee.hire_date.desc(), Employee.id), limit)
+
+
+def top_inventory_items_query(limit: Optional[int] = DEFAULT_TOP_N):
+    """Inventory items with the least stock first; ``limit=None`` returns all items."""
+    return _limited(select(InventoryItem).order_by(InventoryItem.stock.asc(), InventoryItem.id), limit)
+
+
+def top_sales_leads_query(limit: Optional[int] = DEFAULT_TOP_N):
+    """Highest value sales leads; ``limit=None`` returns all leads."""
+    return _limited(select(SalesLead).order_by(SalesLead.value.desc(), SalesLead.id), limit)
+
+
+# Snapshot maintenance
+
+def _locked_snapshot(db: Session) -> DashboardSnapshot:
+    """The snapshot row locked until the caller commits, created first if missing."""
+    snapshot = db.get(DashboardSnapshot, SNAPSHOT_ID, with_for_update=True, populate_existing=True)
+    if snapshot is None:
+        # An empty row, not yet refreshed; a concurrent first rebuild may insert it too
+        try:
+            db.execute(insert(DashboardSnapshot).values(id=SNAPSHOT_ID))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        snapshot = db.get(DashboardSnapshot, SNAPSHOT_ID, with_for_update=True, populate_existing=True)
+    return snapshot
+
+
+def rebuild_dashboard_snapshot(db: Session) -> DashboardSnapshot:
+    """Recompute every metric from the source tables and store it.
+
+    The snapshot row is locked before the totals are read. A writer that
+    applied its delta earlier has committed by then, so its rows are
+    counted; one that applies it later waits and adds it to the new totals.
+    Call it at the start of a transaction, so the totals are read after the
+    lock (MySQL takes the read view at the first plain read).
+    """
+    snapshot = _locked_snapshot(db)
+    metrics = dashboard_metrics(db.execute(dashboard_metrics_query()).one())
+
+    for field, column in SNAPSHOT_COLUMNS.items():
+        setattr(snapshot, column, metrics[field])
+    snapshot.refreshed_at = datetime.utcnow()
+
+    db.commit()
+    db.refresh(snapshot)
+    return snapshot
+
+
+def rebuild_dashboard_snapshot_job():
+    """Rebuild the snapshot in its own session, for the periodic background task."""
+    db = SessionLocal()
+    try:
+        rebuild_dashboard_snapshot(db)
+    finally:
+        db.close()
+
+
+def get_dashboard_snapshot(db: Session) -> DashboardSnapshot:
+    """Primary-key lookup of the snapshot, building it on first use."""
+    snapshot = db.get(DashboardSnapshot, SNAPSHOT_ID)
+    if snapshot is None or snapshot.refreshed_at is None:
+        db.rollback()  # nothing was written; rebuild in a fresh transaction
+        snapshot = rebuild_dashboard_snapshot(db)
+    return snapshot
+
+
+def snapshot_metrics(snapshot: DashboardSnapshot) -> dict:
+    """Convert a snapshot row into ``DashboardStats`` fields."""
+    return {field: getattr(snapshot, column) for field, column in SNAPSHOT_COLUMNS.items()}
+
+
+def invoice_contribution(invoice) -> dict:
+    """What a single finance invoice adds to the snapshot."""
+    if invoice is None:
+        return {}
+    return {
+        "total_orders": 1,
+        "total_revenue": (invoice.amount or 0) if invoice.status == PAID_INVOICE_STATUS else 0,
+    }
+
+
+def employee_contribution(employee) -> dict:
+    """What a single employee adds to the snapshot."""
+    if employee is None:
+        return {}
+    return {"active_employees": 1}
+
+
+def inventory_contribution(item) -> dict:
+    """What a single inventory item adds to the snapshot."""
+    if item is None:
+        return {}
+    return {
+        "total_inventory_items": 1,
+        "total_stock": item.stock or 0,
+        "low_stock_items": int(item.status == LOW_STOCK_STATUS),
+        "out_of_stock_items": int(item.status == OUT_OF_STOCK_STATUS),
+    }
+
+
+def lead_contribution(lead) -> dict:
+    """What a single sales lead adds to the snapshot."""
+    if lead is None:
+        return {}
+    return {"total_leads_value": lead.value or 0}
+
+
+def snapshot_delta_statement(before: dict, after: dict):
+    """Build an UPDATE that moves the snapshot from ``before`` to ``after``.
+
+    Returns ``None`` when nothing changed. Columns are incremented in place
+    (``col = col + delta``) so concurrent writers never overwrite each other.
+    """
+    values = {}
+    for column in set(before) | set(after):
+        delta = after.get(column, 0) - before.get(column, 0)
+        if delta:
+            values[column] = getattr(DashboardSnapshot, column) + delta
+    if not values:
+        return None
+    return update(DashboardSnapshot).where(DashboardSnapshot.id == SNAPSHOT_ID).values(values)
+
+
+def apply_snapshot_delta(db: Session, before: dict, after: dict):
+    """Apply a contribution change inside the caller's transaction."""
+    statement = snapshot_delta_statement(before, after)
+    if statement is not None:
+        db.execute(statement)
@@ -0,0 +1,54 @@
+"""Display names for user ids, resolved in batches.
+
+Chat and other feeds show a name next to every row. Names are resolved
+with one ``IN`` query for the ids missing from a per-process cache, not
+one profile lookup per row. ``profile.py`` and ``users.py`` call
+``invalidate_display_name`` when a profile's name or email changes.
+Other workers pick up the change within ``display_name_cache_seconds``.
+"""
+from typing import Dict, Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import Profile
+
+UNKNOWN_USER = "Unknown User"
+
+display_name_cache = TTLCache(ttl=settings.display_name_cache_seconds, maxsize=10000)
+
+
+def display_name(first_name, last_name, email) -> str:
+    """Full name when both parts are set, otherwise the email."""
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return email or UNKNOWN_USER
+
+
+async def resolve_display_names(db: AsyncSession, user_ids: Iterable[str]) -> Dict[str, str]:
+    """Map each user id to its display name using at most one query."""
+    names = {}
+    missing = set()
+    for user_id in set(user_ids):
+        name = display_name_cache.get(user_id)
+        if name is None:
+            missing.add(user_id)
+        else:
+            names[user_id] = name
+
+    if missing:
+        result = await db.execute(
+            select(Profile.id, Profile.first_name, Profile.last_name, Profile.email).where(Profile.id.in_(missing))
+        )
+        for row in result:
+            name = display_name(row.first_name, row.last_name, row.email)
+            display_name_cache.set(row.id, name)
+            names[row.id] = name
+
+    for user_id in missing - names.keys():
+        names[user_id] = UNKNOWN_USER
+    return names
+
+
+def invalidate_display_name(user_id: str):
+    display_name_cache.delete(user_id)
@@ -0,0 +1,171 @@
+"""Bulk create, update and delete for inventory items.
+
+Catalog syncs send thousands of rows per request to ``POST /inventory/bulk``.
+Every row is validated before anything is written, and invalid rows are
+reported without blocking the others. Valid rows are written in chunks of
+``inventory_bulk_chunk_size``, one transaction per chunk. Each chunk runs a
+single executemany INSERT, UPDATE or DELETE plus one dashboard snapshot
+delta. If a chunk fails, only that chunk is rolled back and its rows are
+reported as errors.
+"""
+import logging
+import uuid
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.validation import validation_message
+from app.models import InventoryItem
+from app.schemas import InventoryBulkRequest, InventoryItemCreate, InventoryItemUpdate
+from app.services.dashboard import apply_snapshot_delta, inventory_contribution
+
+logger = logging.getLogger(__name__)
+
+CONTRIBUTION_COLUMNS = (InventoryItem.id, InventoryItem.stock, InventoryItem.status)
+
+
+def _chunks(rows: List, size: int) -> Iterable[List]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _total(contributions: Iterable[dict]) -> Dict[str, int]:
+    total = Counter()
+    for contribution in contributions:
+        total.update(contribution)
+    return dict(total)
+
+
+class InventoryBulkWriter:
+    """Applies one ``InventoryBulkRequest`` and collects per-row results."""
+
+    def __init__(self, db: AsyncSession, created_by: Optional[str], chunk_size: Optional[int] = None):
+        self.db = db
+        self.created_by = created_by
+        self.chunk_size = chunk_size or settings.inventory_bulk_chunk_size
+        self.results: List[dict] = []
+
+    def _result(self, operation: str, index: int, item_id: Optional[str], status: str, error: Optional[str] = None):
+        self.results.append({"operation": operation, "index": index, "id": item_id, "status": status, "error": error})
+
+    async def apply(self, request: InventoryBulkRequest) -> dict:
+        creates, updates, deletes = self.validate(request)
+        for chunk in _chunks(creates, self.chunk_size):
+            await self._write_chunk("create", chunk, self._create_chunk)
+        for chunk in _chunks(updates, self.chunk_size):
+            await self._write_chunk("update", chunk, self._update_chunk)
+        for chunk in _chunks(deletes, self.chunk_size):
+            await self._write_chunk("delete", chunk, self._delete_chunk)
+
+        self.results.sort(key=lambda result: (("create", "update", "delete").index(result["operation"]), result["index"]))
+        counts = Counter(result["status"] for result in self.results)
+        return {
+            "created": counts["created"],
+            "updated": counts["updated"],
+            "deleted": counts["deleted"],
+            "failed": counts["error"],
+            "results": self.results,
+        }
+
+    def validate(self, request: InventoryBulkRequest):
+        """Split the request into valid (index, id, values) rows, recording errors for the rest."""
+        now = datetime.utcnow()
+        creates, updates, deletes = [], [], []
+        for index, row in enumerate(request.create):
+            try:
+                values = InventoryItemCreate.model_validate(row).model_dump()
+            except ValidationError as exc:
+                self._result("create", index, None, "error", validation_message(exc))
+                continue
+            item_id = str(uuid.uuid4())
+            creates.append((index, item_id, {
+                **values, "id": item_id, "created_by": self.created_by, "created_at": now, "updated_at": now,
+            }))
+
+        seen = set()
+        for index, row in enumerate(request.update):
+            item_id = row.get("id") if isinstance(row, dict) else None
+            if not isinstance(item_id, str) or not item_id:
+                self._result("update", index, None, "error", "id: Field required")
+                continue
+            if item_id in seen:
+                self._result("update", index, item_id, "error", "Duplicate id in batch")
+                continue
+            try:
+                values = InventoryItemUpdate.model_validate(
+                    {key: value for key, value in row.items() if key != "id"}
+                ).model_dump(exclude_unset=True)
+            except ValidationError as exc:
+                self._result("update", index, item_id, "error", validation_message(exc))
+                continue
+            seen.add(item_id)
+            updates.append((index, item_id, {**values, "updated_at": now}))
+
+        seen = set()
+        for index, item_id in enumerate(request.delete):
+            if item_id in seen:
+                self._result("delete", index, item_id, "error", "Duplicate id in batch")
+                continue
+            seen.add(item_id)
+            deletes.append((index, item_id, None))
+        return creates, updates, deletes
+
+    async def _write_chunk(self, operation: str, chunk: List[tuple], write):
+        try:
+            statuses = await write(chunk)
+            await self.db.commit()
+        except Exception as exc:
+            await self.db.rollback()
+            logger.exception("Bulk inventory %s chunk failed", operation)
+            for index, item_id, _ in chunk:
+                self._result(operation, index, item_id, "error", f"Chunk rolled back: {exc.__class__.__name__}")
+            return
+        for (index, item_id, _), (status, error) in zip(chunk, statuses):
+            self._result(operation, index, item_id, status, error)
+
+    async def _existing(self, ids: List[str]) -> Dict[str, object]:
+        result = await self.db.execute(select(*CONTRIBUTION_COLUMNS).where(InventoryItem.id.in_(ids)))
+        return {row.id: row for row in result}
+
+    async def _create_chunk(self, chunk: List[tuple]) -> List[tuple]:
+        rows = [values for _, _, values in chunk]
+        await self.db.execute(insert(InventoryItem), rows)
+        after = _total(inventory_contribution(SimpleNamespace(**values)) for values in rows)
+        await self.db.run_sync(apply_snapshot_delta, {}, after)
+        return [("created", None)] * len(chunk)
+
+    async def _update_chunk(self, chunk: List[tuple]) -> List[tuple]:
+        existing = await self._existing([item_id for _, item_id, _ in chunk])
+        rows, before, after, statuses = [], [], [], []
+        for _, item_id, values in chunk:
+            current = existing.get(item_id)
+            if current is None:
+                statuses.append(("error", "Inventory item not found"))
+                continue
+            rows.append({"id": item_id, **values})
+            before.append(inventory_contribution(current))
+            after.append(inventory_contribution(SimpleNamespace(**{"stock": current.stock, "status": current.status, **values})))
+            statuses.append(("updated", None))
+        if rows:
+            await self.db.execute(update(InventoryItem), rows)
+            await self.db.run_sync(apply_snapshot_delta, _total(before), _total(after))
+        return statuses
+
+    async def _delete_chunk(self, chunk: List[tuple]) -> List[tuple]:
+        existing = await self._existing([item_id for _, item_id, _ in chunk])
+        if existing:
+            await self.db.execute(
+                delete(InventoryItem).where(InventoryItem.id.in_(list(existing))),
+                execution_options={"synchronize_session": False},
+            )
+            await self.db.run_sync(
+                apply_snapshot_delta, _total(inventory_contribution(row) for row in existing.values()), {}
+            )
+        return [
+            ("deleted", None) if item_id in existing else ("error", "Inventory item not found")
+            for _, item_id, _ in chunk
+        ]
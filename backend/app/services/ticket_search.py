@@ -0,0 +1,169 @@
+"""Ranked full-text search over tickets.
+
+On MySQL, search uses the ``ft_tickets_search`` FULLTEXT index through
+``MATCH ... AGAINST`` in boolean mode. Other backends (SQLite in tests and
+small deployments) use ``ticket_search_terms``. That table is an inverted
+index mapping each word to the tickets containing it, with a weight per
+ticket. The ticket endpoints keep it up to date on create, update and
+delete. ``rebuild_ticket_search_index`` backfills tickets written by other
+means. The seed scripts call it, and it can be run on its own:
+
+    python -m app.services.ticket_search
+
+Every query word must match. The last word also matches as a prefix, so
+results update while the user types. Matches in ``ticket_number`` rank
+above matches in ``title``, which rank above matches in ``description``.
+On MySQL each column has its own FULLTEXT index as well, so the scores can
+be weighted per column. Words shorter than ``MIN_INDEXED_LENGTH`` are not
+in either index (MySQL skips them by default). They are matched as
+substrings with LIKE instead, as the search did before it used an index.
+"""
+import logging
+import re
+from collections import Counter
+from typing import List, Tuple
+from sqlalchemy import case, delete, false, func, insert, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+from app.models import Ticket, TicketSearchTerm
+
+logger = logging.getLogger(__name__)
+
+FIELD_WEIGHTS = {"ticket_number": 5, "title": 3, "description": 1}
+# innodb_ft_min_token_size defaults to 3; shorter words are matched with LIKE
+MIN_INDEXED_LENGTH = 3
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+SEARCHABLE_FIELDS = tuple(FIELD_WEIGHTS)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of ``text``."""
+    if not text:
+        return []
+    return [word[:MAX_TERM_LENGTH] for word in _WORD.findall(text.lower())]
+
+
+def uses_fulltext(db: Session) -> bool:
+    return db.get_bind().dialect.name == "mysql"
+
+
+def ticket_terms(ticket) -> Counter:
+    """Weighted terms for one ticket."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(getattr(ticket, field, None)):
+            if len(term) >= MIN_INDEXED_LENGTH:
+                terms[term] += weight
+    return terms
+
+
+def index_ticket(db: Session, ticket):
+    """(Re)write the inverted index rows of ``ticket`` in the current transaction."""
+    if uses_fulltext(db):
+        return
+    db.execute(delete(TicketSearchTerm).where(TicketSearchTerm.ticket_id == ticket.id))
+    rows = [{"term": term, "ticket_id": ticket.id, "weight": weight} for term, weight in ticket_terms(ticket).items()]
+    if rows:
+        db.execute(insert(TicketSearchTerm), rows)
+
+
+def unindex_ticket(db: Session, ticket_id: str):
+    """Remove a ticket from the inverted index before it is deleted."""
+    if uses_fulltext(db):
+        return
+    db.execute(delete(TicketSearchTerm).where(TicketSearchTerm.ticket_id == ticket_id))
+
+
+def rebuild_ticket_search_index(db: Session, batch_size: int = 500) -> int:
+    """Re-index every ticket; returns the number of tickets indexed."""
+    if uses_fulltext(db):
+        return 0
+    db.execute(delete(TicketSearchTerm))
+    indexed = 0
+    columns = [Ticket.id] + [getattr(Ticket, field) for field in SEARCHABLE_FIELDS]
+    for ticket in db.execute(select(*columns).execution_options(yield_per=batch_size)):
+        rows = [{"term": term, "ticket_id": ticket.id, "weight": weight} for term, weight in ticket_terms(ticket).items()]
+        if rows:
+            db.execute(insert(TicketSearchTerm), rows)
+        indexed += 1
+    db.commit()
+    return indexed
+
+
+def _fulltext_query(terms: List[str], prefix: bool, required: bool = True) -> str:
+    """Boolean-mode query for ``terms``, with the last one as a prefix if ``prefix``."""
+    words = [f"{term}*" if prefix and i == len(terms) - 1 else term for i, term in enumerate(terms)]
+    return " ".join(f"+{word}" if required else word for word in words)
+
+
+def _fulltext_search(query, terms: List[str], prefix: bool):
+    """Filter on the combined FULLTEXT index and rank by the weighted per-column scores."""
+    matches_all = match(
+        Ticket.title, Ticket.description, Ticket.ticket_number, against=_fulltext_query(terms, prefix)
+    ).in_boolean_mode()
+    # Without "+" a column scores for each word it contains, even if it lacks the others
+    any_word = _fulltext_query(terms, prefix, required=False)
+    scores = [
+        weight * match(getattr(Ticket, field), against=any_word).in_boolean_mode()
+        for field, weight in FIELD_WEIGHTS.items()
+    ]
+    return query.filter(matches_all > 0), sum(scores[1:], scores[0])
+
+
+def _term_index_search(query, terms: List[str], prefix: bool):
+    """Join one aggregated ``ticket_search_terms`` subquery per word; all of them must match."""
+    relevance = None
+    for i, term in enumerate(terms):
+        condition = TicketSearchTerm.term.startswith(term, autoescape=True) if prefix and i == len(terms) - 1 else TicketSearchTerm.term == term
+        matches = (
+            select(TicketSearchTerm.ticket_id, func.sum(TicketSearchTerm.weight).label("score"))
+            .where(condition)
+            .group_by(TicketSearchTerm.ticket_id)
+            .subquery(f"search_term_{i}")
+        )
+        query = query.join(matches, matches.c.ticket_id == Ticket.id)
+        relevance = matches.c.score if relevance is None else relevance + matches.c.score
+    return query, relevance
+
+
+def _substring_search(query, term: str):
+    """Match a word too short for the indexes with LIKE, scored by the fields containing it."""
+    contains = {field: getattr(Ticket, field).contains(term, autoescape=True) for field in FIELD_WEIGHTS}
+    scores = [case((contains[field], weight), else_=0) for field, weight in FIELD_WEIGHTS.items()]
+    return query.filter(or_(*contains.values())), sum(scores[1:], scores[0])
+
+
+def apply_ticket_search(db: Session, query, search: str) -> Tuple[object, object]:
+    """Restrict ``query`` to tickets matching ``search``.
+
+    Returns the filtered query and a relevance expression to order by.
+    Filters already applied to ``query`` (status, priority, ...) are kept.
+    """
+    terms = list(dict.fromkeys(tokenize(search)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return query.filter(false()), Ticket.id
+
+    indexed = [term for term in terms if len(term) >= MIN_INDEXED_LENGTH]
+    relevance = None
+    if indexed:
+        prefix = indexed[-1] == terms[-1]
+        search_index = _fulltext_search if uses_fulltext(db) else _term_index_search
+        query, relevance = search_index(query, indexed, prefix)
+    for term in terms:
+        if len(term) < MIN_INDEXED_LENGTH:
+            query, score = _substring_search(query, term)
+            relevance = score if relevance is None else relevance + score
+    return query, relevance
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        if uses_fulltext(db):
+            raise SystemExit("MySQL searches its FULLTEXT indexes; there is nothing to rebuild")
+        logger.info("Indexed %d tickets for search", rebuild_ticket_search_index(db))
@@ -0,0 +1,93 @@
+"""Ticket statistics for /tickets/stats/summary.
+
+All counters and the department, module and assignee breakdowns come from
+one scan of ``tickets``. It groups by (department, module, assigned_to)
+with conditional aggregates, and the totals are summed from those groups
+in Python. Support agents refresh the panel constantly, so the result is
+cached for ``ticket_stats_cache_seconds``. The cache is dropped on every
+``tickets.*`` event, so a write in any worker invalidates it everywhere.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import event_bus
+from app.models import Ticket, TicketStatus, TicketPriority
+
+STATS_CACHE_KEY = "summary"
+COUNTERS = (
+    "total_tickets", "open_tickets", "in_progress_tickets", "resolved_tickets",
+    "closed_tickets", "urgent_tickets", "high_priority_tickets", "overdue_tickets",
+)
+BREAKDOWNS = {"by_department": "department", "by_module": "module", "by_assignee": "assigned_to"}
+
+ticket_stats_cache = TTLCache(ttl=settings.ticket_stats_cache_seconds, maxsize=1)
+
+
+def _count_where(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def ticket_stats_query(now: datetime):
+    """Conditional-aggregate counters per (department, module, assignee)."""
+    overdue = and_(
+        Ticket.due_date < now,
+        Ticket.status.not_in([TicketStatus.resolved, TicketStatus.closed]),
+    )
+    return (
+        select(
+            Ticket.department,
+            Ticket.module,
+            Ticket.assigned_to,
+            func.count().label("total_tickets"),
+            _count_where(Ticket.status == TicketStatus.open).label("open_tickets"),
+            _count_where(Ticket.status == TicketStatus.in_progress).label("in_progress_tickets"),
+            _count_where(Ticket.status == TicketStatus.resolved).label("resolved_tickets"),
+            _count_where(Ticket.status == TicketStatus.closed).label("closed_tickets"),
+            _count_where(Ticket.priority == TicketPriority.urgent).label("urgent_tickets"),
+            _count_where(Ticket.priority == TicketPriority.high).label("high_priority_tickets"),
+            _count_where(overdue).label("overdue_tickets"),
+        )
+        .group_by(Ticket.department, Ticket.module, Ticket.assigned_to)
+    )
+
+
+def compute_ticket_stats(db: Session, now: Optional[datetime] = None) -> dict:
+    """Totals plus per-department, per-module and per-assignee breakdowns."""
+    rows = db.execute(ticket_stats_query(now or datetime.now())).all()
+
+    totals = dict.fromkeys(COUNTERS, 0)
+    breakdowns: Dict[str, dict] = {name: defaultdict(lambda: dict.fromkeys(COUNTERS, 0)) for name in BREAKDOWNS}
+    for row in rows:
+        for counter in COUNTERS:
+            value = getattr(row, counter) or 0
+            totals[counter] += value
+            for name, column in BREAKDOWNS.items():
+                breakdowns[name][getattr(row, column)][counter] += value
+
+    stats = dict(totals)
+    for name, groups in breakdowns.items():
+        stats[name] = sorted(
+            ({"key": key, **counts} for key, counts in groups.items()),
+            key=lambda group: (-group["total_tickets"], group["key"] or ""),
+        )
+    return stats
+
+
+def get_ticket_stats(db: Session) -> dict:
+    """Cached ``compute_ticket_stats``."""
+    stats = ticket_stats_cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_ticket_stats(db)
+        ticket_stats_cache.set(STATS_CACHE_KEY, stats)
+    return stats
+
+
+def invalidate_ticket_stats():
+    ticket_stats_cache.delete(STATS_CACHE_KEY)
+
+
+event_bus.subscribe("tickets.*", lambda topic, payload: invalidate_ticket_stats())
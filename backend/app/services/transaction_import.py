@@ -0,0 +1,244 @@
+"""Streaming import of finance transactions from CSV or NDJSON.
+
+``POST /finance/transactions/import`` reads the raw request body chunk by
+chunk. The file is never held in memory or spooled to disk. Complete
+records are parsed as they arrive and validated against
+``TransactionCreate``. Valid rows are inserted ``transaction_import_batch_size``
+at a time, each batch in its own transaction with a single executemany
+INSERT.
+
+Imports are idempotent on ``reference``. Each row must carry one, and rows
+whose reference already exists (in the table or earlier in the same file)
+are counted as duplicates instead of being inserted again. Re-uploading a
+statement is therefore harmless. ``reference`` is unique in the table, so
+two uploads of the same statement, or an upload racing
+``POST /transactions/``, cannot both insert a row. A batch that hits the
+constraint is rolled back and retried without the references stored in the
+meantime.
+
+Progress is kept in ``import_progress`` for
+``GET /finance/transactions/import/{import_id}``, keyed by the uploading
+user, so one user can neither read nor overwrite another's import. That
+state belongs to the worker handling the upload.
+"""
+import codecs
+import csv
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.counts import invalidate_count
+from app.core.validation import validation_message
+from app.models.finance import Transaction
+from app.schemas.finance import TransactionCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# (user id, import id) -> progress counters of a running or recently finished import
+import_progress = TTLCache(ttl=3600, maxsize=256)
+
+# Attempts per batch when other writers keep storing its references first
+CONFLICT_RETRIES = 3
+
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """The explicit ``format`` parameter, else NDJSON for JSON content types, else CSV."""
+    if requested:
+        return requested
+    content_type = (content_type or "").lower()
+    return "ndjson" if "json" in content_type else "csv"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines (newline included), tolerating a UTF-8 BOM."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield ``(line, record, error)`` for each CSV row; the first row is the header."""
+    header = None
+    record, start_line, line_number = "", 0, 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record:
+            start_line = line_number
+        record += line
+        if record.count('"') % 2:
+            continue  # a quoted field continues on the next line
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start_line, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start_line, dict(zip(header, values)), None
+    if record.strip():
+        yield start_line, None, "unterminated quoted field"
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield ``(line, record, error)`` for each JSON object line."""
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, None, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+class TransactionImporter:
+    """Validates, de-duplicates and inserts transactions batch by batch."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        created_by: Optional[str],
+        import_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+    ):
+        self.db = db
+        self.created_by = created_by
+        self.batch_size = batch_size or settings.transaction_import_batch_size
+        self.max_errors = settings.transaction_import_max_errors if max_errors is None else max_errors
+        self.batch: List[Tuple[int, dict]] = []
+        self.seen_references = set()
+        self.errors: List[dict] = []
+        self.progress = {
+            "import_id": import_id or str(uuid.uuid4()),
+            "status": "running",
+            "rows": 0,
+            "inserted": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+        self.save_progress()
+
+    def save_progress(self):
+        import_progress.set((self.created_by, self.progress["import_id"]), dict(self.progress))
+
+    async def run(self, records: AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]) -> dict:
+        """Import every record and return the summary."""
+        try:
+            async for line, record, error in records:
+                await self.add(line, record, error)
+            await self.flush()
+        except Exception:
+            self.progress["status"] = "failed"
+            self.save_progress()
+            raise
+        finally:
+            if self.progress["inserted"]:
+                invalidate_count(Transaction)
+        self.progress["status"] = "completed"
+        self.save_progress()
+        return {**self.progress, "errors": self.errors, "errors_truncated": self.progress["failed"] > len(self.errors)}
+
+    def error(self, line: int, reference: Optional[str], message: str):
+        self.progress["failed"] += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "reference": reference, "error": message})
+
+    async def add(self, line: int, record: Optional[dict], error: Optional[str] = None):
+        self.progress["rows"] += 1
+        if error is not None:
+            self.error(line, None, error)
+            return
+        reference = record.get("reference")
+        try:
+            values = TransactionCreate.model_validate(record).model_dump()
+        except ValidationError as exc:
+            self.error(line, reference, validation_message(exc))
+            return
+        if not values["reference"]:
+            self.error(line, None, "reference: required for imports")
+            return
+        if values["reference"] in self.seen_references:
+            self.progress["duplicates"] += 1
+            return
+        self.seen_references.add(values["reference"])
+        self.batch.append((line, values))
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    async def existing_references(self, references: List[str]) -> set:
+        return set((await self.db.execute(
+            select(Transaction.reference).where(Transaction.reference.in_(references))
+        )).scalars())
+
+    async def insert_new(self, batch: List[Tuple[int, dict]]) -> int:
+        """Insert the rows of ``batch`` whose reference is not stored yet; returns how many."""
+        references = [values["reference"] for _, values in batch]
+        for attempt in range(CONFLICT_RETRIES):
+            existing = await self.existing_references(references)
+            now = datetime.utcnow()
+            rows = [
+                {**values, "id": str(uuid.uuid4()), "created_by": self.created_by, "created_at": now, "updated_at": now}
+                for _, values in batch if values["reference"] not in existing
+            ]
+            try:
+                if rows:
+                    await self.db.execute(insert(Transaction), rows)
+                await self.db.commit()
+                return len(rows)
+            except IntegrityError:
+                # Another writer stored some of these references after the lookup
+                await self.db.rollback()
+                if attempt == CONFLICT_RETRIES - 1:
+                    raise
+
+    async def flush(self):
+        """Insert the pending batch, skipping references already stored."""
+        batch, self.batch = self.batch, []
+        if not batch:
+            return
+        try:
+            inserted = await self.insert_new(batch)
+        except Exception as exc:
+            await self.db.rollback()
+            logger.exception("Transaction import batch failed")
+            for line, values in batch:
+                self.error(line, values["reference"], f"Batch rolled back: {exc.__class__.__name__}")
+        else:
+            self.progress["inserted"] += inserted
+            self.progress["duplicates"] += len(batch) - inserted
+        self.progress["batches"] += 1
+        self.save_progress()
+        logger.info("Transaction import %(import_id)s: %(rows)s rows, %(inserted)s inserted", self.progress)
+
+
+def get_import_progress(created_by: Optional[str], import_id: str) -> Optional[Dict]:
+    """Progress of ``created_by``'s import ``import_id``, if it is still known."""
+    return import_progress.get((created_by, import_id))
@@ -0,0 +1,106 @@
+"""The admin user directory behind ``GET /users``.
+
+Pages select only the columns the directory shows and are filtered in SQL
+by status, locked state and a name/email prefix. They are keyset-paginated
+on ``(created_at, id)``. Each page is serialized to JSON once and cached
+for ``user_directory_cache_seconds``. The endpoints that change a profile,
+its status, its lock or its existence call ``invalidate_user_directory``,
+which also drops the pages cached by the other workers through the event
+bus.
+"""
+from typing import Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.fast_json import dumps
+from app.core.events import event_bus
+from app.core.pagination import keyset_paginate, split_page
+from app.models import Profile
+
+DIRECTORY_COLUMNS = (
+    Profile.id, Profile.email, Profile.first_name, Profile.last_name, Profile.phone, Profile.job_title,
+    Profile.bio, Profile.status, Profile.last_login, Profile.account_locked, Profile.created_at,
+)
+DEFAULT_STATUS = "active"
+
+# (status, locked, search, cursor, skip, limit) -> (JSON body, next cursor)
+user_directory_cache = TTLCache(
+    ttl=settings.user_directory_cache_seconds, maxsize=settings.user_directory_cache_max_pages
+)
+
+
+def user_row(profile) -> dict:
+    """Directory entry for a profile or a projected profile row."""
+    return {
+        "id": profile.id,
+        "email": profile.email,
+        "first_name": profile.first_name,
+        "last_name": profile.last_name,
+        "phone": profile.phone,
+        "job_title": profile.job_title,
+        "bio": profile.bio,
+        "status": profile.status or DEFAULT_STATUS,
+        "last_login": profile.last_login.isoformat() if profile.last_login else None,
+        "account_locked": profile.account_locked or False,
+        "created_at": profile.created_at.isoformat(),
+    }
+
+
+def directory_query(
+    db: Session,
+    status: Optional[str] = None,
+    locked: Optional[bool] = None,
+    search: Optional[str] = None,
+):
+    """Projected, filtered profile query; unset status and lock count as active and unlocked."""
+    query = db.query(*DIRECTORY_COLUMNS)
+    if status:
+        condition = Profile.status == status
+        if status == DEFAULT_STATUS:
+            condition = or_(condition, Profile.status.is_(None))
+        query = query.filter(condition)
+    if locked is not None:
+        query = query.filter(
+            Profile.account_locked.is_(True) if locked
+            else or_(Profile.account_locked.is_(False), Profile.account_locked.is_(None))
+        )
+    if search and search.strip():
+        prefix = search.strip()
+        query = query.filter(or_(
+            Profile.email.startswith(prefix, autoescape=True),
+            Profile.first_name.startswith(prefix, autoescape=True),
+            Profile.last_name.startswith(prefix, autoescape=True),
+        ))
+    return query
+
+
+def get_user_page(
+    db: Session,
+    status: Optional[str] = None,
+    locked: Optional[bool] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[bytes, Optional[str]]:
+    """One serialized directory page and the cursor of the next one."""
+    key = (status, locked, search, cursor, skip, limit)
+    page = user_directory_cache.get(key)
+    if page is None:
+        query = keyset_paginate(
+            directory_query(db, status, locked, search), Profile.created_at, Profile.id, cursor, skip, limit
+        )
+        rows, next_cursor = split_page(query.all(), Profile.created_at, Profile.id, limit)
+        page = (dumps([user_row(row) for row in rows]), next_cursor)
+        user_directory_cache.set(key, page)
+    return page
+
+
+def invalidate_user_directory():
+    """Drop cached pages here and in every other worker."""
+    user_directory_cache.clear()
+    event_bus.publish("users.changed", {})
+
+
+event_bus.subscribe("users.*", lambda topic, payload: user_directory_cache.clear())
@@ -0,0 +1,103 @@
+"""Compare FastAPI's response_model serialization with FastJSONResponse.
+
+Serializes pages of ORM rows and Core result rows both ways and prints the
+time per page. The current path is what FastAPI's ``serialize_response`` does
+(validate into the schema, dump in JSON mode) followed by ``JSONResponse``.
+The check at the start fails if the two paths produce different JSON.
+
+    python benchmark_serialization.py [--rows 1000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from app.core.database import Base
+from app.core.fast_json import FastJSONResponse, orjson
+from app.models import Base as ModelsBase, InventoryItem
+from app.models.finance import Transaction
+from app.schemas import InventoryItemResponse
+from app.schemas.finance import TransactionList
+
+
+def seed(session: Session, rows: int):
+    now = datetime(2025, 1, 1)
+    session.execute(insert(InventoryItem), [
+        {
+            "id": str(uuid.uuid4()), "name": f"Item {i}", "category": "Parts", "stock": i,
+            "unit_price": Decimal("9.99"), "supplier": "Acme", "status": "in stock",
+            "created_at": now + timedelta(seconds=i), "updated_at": now,
+        }
+        for i in range(rows)
+    ])
+    session.execute(insert(Transaction), [
+        {
+            "id": str(uuid.uuid4()), "type": "income", "amount": 10.5 + i, "description": f"Sale {i}",
+            "date": now, "category": "sales", "reference": f"ref-{i}", "created_at": now, "updated_at": now,
+        }
+        for i in range(rows)
+    ])
+    session.commit()
+
+
+def current_path(schema, content) -> bytes:
+    # What fastapi.routing.serialize_response does for a response_model
+    field = create_response_field(name="benchmark", type_=schema)
+    value, errors = field.validate(content, {}, loc=("response",))
+    if errors:
+        raise ValueError(errors)
+    return JSONResponse(field.serialize(value, mode="json")).body
+
+
+def fast_path(schema, content) -> bytes:
+    return FastJSONResponse(content, schema=schema).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    ModelsBase.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+    seed(session, args.rows)
+
+    cases = {
+        "inventory ORM rows": (
+            List[InventoryItemResponse], session.scalars(select(InventoryItem)).all(),
+        ),
+        "inventory Core rows": (
+            List[InventoryItemResponse], session.execute(select(*InventoryItem.__table__.columns)).all(),
+        ),
+        "transactions envelope": (
+            TransactionList,
+            {"items": session.scalars(select(Transaction)).all(), "total": args.rows, "next_cursor": None},
+        ),
+    }
+
+    print(f"{args.rows} rows per page, best of {args.repeat}, encoder: {'orjson' if orjson else 'json'}")
+    for name, (schema, content) in cases.items():
+        if json.loads(current_path(schema, content)) != json.loads(fast_path(schema, content)):
+            raise SystemExit(f"{name}: outputs differ")
+        current = min(timeit.repeat(lambda: current_path(schema, content), number=1, repeat=args.repeat))
+        fast = min(timeit.repeat(lambda: fast_path(schema, content), number=1, repeat=args.repeat))
+        print(f"{name:24} response_model {current * 1000:8.2f} ms   fast {fast * 1000:8.2f} ms   {current / fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from app.core.database import SessionLocal, engine
 from app.models import *
 from app.models.finance import Transaction, FinanceInvoice, FinanceExpense
 from app.core.auth import get_password_hash
+from app.services.ticket_search import rebuild_ticket_search_index
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 import uuid
@@ -883,6 +884,7 @@ def seed_data():
         
         db.commit()
         print("✅ Tickets seeded successfully!")
+        rebuild_ticket_search_index(db)
         
         # Seed ticket comments
         print("Seeding ticket comments...")
@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, engine
 from app.models import Profile, Ticket, TicketComment, TicketAttachment, TicketHistory
+from app.services.ticket_search import rebuild_ticket_search_index
 from datetime import datetime, timedelta
 import uuid
 import random
@@ -274,6 +275,7 @@ def seed_tickets():
         
         db.commit()
         print(f"✅ Created {len(created_tickets)} tickets successfully!")
+        rebuild_ticket_search_index(db)
         
         # Add comments to tickets
         print("Adding comments to tickets...")
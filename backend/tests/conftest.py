@@ -1,19 +1,30 @@
 import pytest
+import asyncio
 import os
 import sys
 from unittest.mock import Mock
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from fastapi.testclient import TestClient
 
 # Add the backend directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_async_db, get_read_db, get_async_read_db
+from app.core.auth import principal_cache, profile_cache
+from app.services.display_names import display_name_cache
+from app.services.user_directory import user_directory_cache
+from app.api.endpoints.blogs import blog_cache
+from app.api.endpoints.docs import doc_cache
+from app.api.endpoints.faqs import faq_cache
+from app.models import Base as ModelsBase
 
 # Test database URL
 TEST_DATABASE_URL = "sqlite:///:memory:"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 @pytest.fixture(scope="session")
 def test_engine():
@@ -33,7 +44,27 @@ def test_db(test_engine):
     session.close()
 
 @pytest.fixture(scope="function")
-def client(test_db):
+def async_session_factory():
+    """Create an async SQLite database shared by every session of one test"""
+    engine = create_async_engine(
+        TEST_ASYNC_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(ModelsBase.metadata.create_all)
+    
+    asyncio.run(create_tables())
+    
+    yield async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    
+    asyncio.run(engine.dispose())
+
+@pytest.fixture(scope="function")
+def client(test_db, async_session_factory):
     """Create a test client with database override"""
     def override_get_db():
         try:
@@ -41,7 +72,14 @@ def client(test_db):
         finally:
             test_db.close()
     
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -99,4 +137,11 @@ def setup_test_environment():
     os.environ["ENVIRONMENT"] = "testing"
     os.environ["DATABASE_URL"] = TEST_DATABASE_URL
     yield
-    # Cleanup if needed
+    # Resolved users must not leak between tests
+    principal_cache.clear()
+    profile_cache.clear()
+    display_name_cache.clear()
+    user_directory_cache.clear()
+    blog_cache.clear()
+    doc_cache.clear()
+    faq_cache.clear()
@@ -0,0 +1,126 @@
+import pytest
+import asyncio
+import time
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.cache import TTLCache
+from app.core.auth import (
+    create_access_token, get_current_user, get_current_profile,
+    invalidate_principal, principal_cache, profile_cache
+)
+from app.models import User
+
+USER_ID = "00000000-0000-0000-0000-000000000010"
+USER_EMAIL = "cached@example.com"
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+class TestTTLCache:
+    """Test cases for the in-process TTL cache"""
+
+    def test_get_set_and_delete(self):
+        """Test basic reads, writes and deletes"""
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        cache.delete("a")
+        assert cache.get("a") is None
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    def test_entries_expire(self):
+        """Test that entries are dropped once their TTL passes"""
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+
+    def test_non_positive_ttl_is_not_stored(self):
+        """Test that already expired values are never cached"""
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1, ttl=-5)
+
+        assert len(cache) == 0
+
+    def test_oldest_entry_evicted_at_maxsize(self):
+        """Test that the oldest entry is evicted when the cache is full"""
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") == 3
+
+    def test_delete_where(self):
+        """Test removing entries by predicate"""
+        cache = TTLCache(ttl=60)
+        cache.set(("t1", "x"), 1)
+        cache.set(("t2", "x"), 2)
+        cache.set(("t3", "y"), 3)
+
+        assert cache.delete_where(lambda key, value: key[1] == "x") == 2
+        assert len(cache) == 1
+
+class TestCurrentUserCache:
+    """Test cases for caching in get_current_user and get_current_profile"""
+
+    def test_second_lookup_served_from_cache(self, async_session_factory):
+        """Test that a repeated token does not hit the database again"""
+        token = create_access_token(data={"sub": USER_EMAIL})
+
+        async def scenario():
+            async with async_session_factory() as db:
+                db.add(User(id=USER_ID, email=USER_EMAIL, password_hash="x"))
+                await db.commit()
+
+            async with async_session_factory() as db:
+                first = await get_current_user(credentials=bearer(token), db=db)
+            assert first.email == USER_EMAIL
+
+            # No session: the second call must not touch the database
+            second = await get_current_user(credentials=bearer(token), db=None)
+            assert second is first
+            assert principal_cache.hits == 1
+
+        asyncio.run(scenario())
+
+    def test_invalidate_forces_fresh_lookup(self, async_session_factory):
+        """Test that a deleted user is rejected once the cache is invalidated"""
+        token = create_access_token(data={"sub": USER_EMAIL})
+
+        async def scenario():
+            async with async_session_factory() as db:
+                user = User(id=USER_ID, email=USER_EMAIL, password_hash="x")
+                db.add(user)
+                await db.commit()
+                await get_current_user(credentials=bearer(token), db=db)
+                await get_current_profile(current_user=user, db=db)
+
+                await db.delete(await db.get(User, USER_ID))
+                await db.commit()
+                invalidate_principal(user_id=USER_ID)
+                assert len(principal_cache) == 0
+                assert len(profile_cache) == 0
+
+                with pytest.raises(HTTPException) as exc_info:
+                    await get_current_user(credentials=bearer(token), db=db)
+                assert exc_info.value.status_code == 401
+
+        asyncio.run(scenario())
+
+    def test_tokens_get_unique_ids(self):
+        """Test that each issued token carries its own cache key"""
+        from jose import jwt
+        from app.core.config import settings
+
+        first = jwt.decode(create_access_token(data={"sub": USER_EMAIL}), settings.secret_key, algorithms=[settings.algorithm])
+        second = jwt.decode(create_access_token(data={"sub": USER_EMAIL}), settings.secret_key, algorithms=[settings.algorithm])
+
+        assert first["jti"] != second["jti"]
@@ -0,0 +1,165 @@
+import pytest
+import asyncio
+import json
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Response
+from sqlalchemy import event
+from starlette.requests import Request
+
+from app.models import ChatMessage, Profile, User
+from app.api.endpoints.chat import get_messages
+from app.services.display_names import invalidate_display_name
+
+def make_user(user_id):
+    return User(id=user_id, email=f"{user_id}@example.com", password_hash="x")
+
+def make_request(headers=None):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]})
+
+def fetch_messages(session_factory, headers=None, **params):
+    """Call get_messages; returns (messages, or the 304 response, and the response headers)"""
+    async def scenario():
+        async with session_factory() as db:
+            result = await get_messages(make_request(headers), current_user=make_user("u1"), db=db, **{
+                "skip": 0, "limit": 100, "after": None, "before": None, **params,
+            })
+            return (json.loads(result.body) if result.status_code == 200 else result), result.headers
+    return asyncio.run(scenario())
+
+def count_statements(session_factory):
+    """Record the SQL statements executed on the factory's engine"""
+    statements = []
+    engine = session_factory.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+class TestChatDisplayNames:
+    """Test cases for batched display name lookups in chat"""
+
+    def seed(self, session_factory, message_count=30):
+        async def scenario():
+            async with session_factory() as db:
+                db.add_all([
+                    Profile(id="u1", email="u1@example.com", first_name="Ada", last_name="Lovelace"),
+                    Profile(id="u2", email="u2@example.com"),
+                    Profile(id="u3", email="u3@example.com", first_name="Alan", last_name="Turing"),
+                ])
+                start = datetime(2025, 1, 1)
+                db.add_all([
+                    ChatMessage(user_id=f"u{i % 3 + 1}", content=f"m{i}", created_at=start + timedelta(seconds=i))
+                    for i in range(message_count)
+                ])
+                await db.commit()
+        asyncio.run(scenario())
+
+    def test_constant_queries_per_page(self, async_session_factory):
+        """Test that a page of messages costs three queries regardless of its size"""
+        self.seed(async_session_factory)
+        statements = count_statements(async_session_factory)
+
+        async def scenario():
+            async with async_session_factory() as db:
+                return json.loads((await get_messages(make_request(), skip=0, limit=100, current_user=make_user("u1"), db=db)).body)
+
+        messages = asyncio.run(scenario())
+
+        assert len(messages) == 30
+        assert len(statements) == 3  # ETag validator, page, display names
+        names = {message["user_id"]: message["user_name"] for message in messages}
+        assert names == {"u1": "Ada Lovelace", "u2": "u2@example.com", "u3": "Alan Turing"}
+        assert messages[0]["content"] == "m0"
+
+    def test_cached_names_and_invalidation(self, async_session_factory):
+        """Test that cached names skip the profile query until invalidated"""
+        self.seed(async_session_factory, message_count=3)
+
+        async def fetch():
+            async with async_session_factory() as db:
+                return json.loads((await get_messages(make_request(), skip=0, limit=100, current_user=make_user("u1"), db=db)).body)
+
+        async def rename():
+            async with async_session_factory() as db:
+                profile = await db.get(Profile, "u2")
+                profile.first_name, profile.last_name = "Grace", "Hopper"
+                await db.commit()
+
+        asyncio.run(fetch())
+        statements = count_statements(async_session_factory)
+        asyncio.run(rename())
+        del statements[:]
+
+        stale = asyncio.run(fetch())
+        assert len(statements) == 2
+        assert {message["user_name"] for message in stale if message["user_id"] == "u2"} == {"u2@example.com"}
+
+        invalidate_display_name("u2")
+        fresh = asyncio.run(fetch())
+        assert {message["user_name"] for message in fresh if message["user_id"] == "u2"} == {"Grace Hopper"}
+
+class TestChatIncrementalSync:
+    """Test cases for after/before cursors and conditional requests on chat history"""
+
+    def seed(self, session_factory, start=0, count=5):
+        async def scenario():
+            async with session_factory() as db:
+                if start == 0:
+                    db.add(Profile(id="u1", email="u1@example.com", first_name="Ada", last_name="Lovelace"))
+                db.add_all([
+                    ChatMessage(user_id="u1", content=f"m{i}", created_at=datetime(2025, 1, 1) + timedelta(seconds=i))
+                    for i in range(start, start + count)
+                ])
+                await db.commit()
+        asyncio.run(scenario())
+
+    def test_after_returns_only_new_messages(self, async_session_factory):
+        """Test that polling with the next cursor only returns messages posted since"""
+        self.seed(async_session_factory)
+        messages, headers = fetch_messages(async_session_factory)
+        assert [m["content"] for m in messages] == ["m0", "m1", "m2", "m3", "m4"]
+
+        cursor = headers["X-Next-Cursor"]
+        empty, headers = fetch_messages(async_session_factory, after=cursor)
+        assert empty == []
+        assert headers["X-Next-Cursor"] == cursor
+
+        self.seed(async_session_factory, start=5, count=2)
+        new, _ = fetch_messages(async_session_factory, after=cursor)
+        assert [m["content"] for m in new] == ["m5", "m6"]
+
+    def test_before_pages_through_history(self, async_session_factory):
+        """Test that before walks backwards through older messages"""
+        self.seed(async_session_factory)
+        latest, headers = fetch_messages(async_session_factory, limit=2)
+        assert [m["content"] for m in latest] == ["m3", "m4"]
+
+        older, headers = fetch_messages(async_session_factory, limit=2, before=headers["X-Prev-Cursor"])
+        assert [m["content"] for m in older] == ["m1", "m2"]
+        assert "X-Next-Cursor" not in headers
+
+        oldest, headers = fetch_messages(async_session_factory, limit=2, before=headers["X-Prev-Cursor"])
+        assert [m["content"] for m in oldest] == ["m0"]
+        assert "X-Prev-Cursor" not in headers
+
+    def test_etag_not_modified(self, async_session_factory):
+        """Test that a matching If-None-Match gets a bodyless 304 until a message arrives"""
+        self.seed(async_session_factory)
+        _, headers = fetch_messages(async_session_factory)
+        etag = headers["ETag"]
+
+        statements = count_statements(async_session_factory)
+        result, _ = fetch_messages(async_session_factory, headers={"If-None-Match": etag})
+        assert isinstance(result, Response)
+        assert result.status_code == 304
+        assert result.body == b""
+        assert len(statements) == 1  # only the validator; the page is not loaded
+
+        self.seed(async_session_factory, start=5, count=1)
+        messages, headers = fetch_messages(async_session_factory, headers={"If-None-Match": etag})
+        assert messages[-1]["content"] == "m5"
+        assert headers["ETag"] != etag
+
+    def test_after_and_before_are_exclusive(self, async_session_factory):
+        """Test that combining both cursors is rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            fetch_messages(async_session_factory, after="x", before="y")
+        assert exc_info.value.status_code == 400
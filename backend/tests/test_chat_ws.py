@@ -0,0 +1,154 @@
+import pytest
+import asyncio
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints.tickets import create_ticket
+from app.core.auth import create_access_token
+from app.models import Base as ModelsBase, Profile, User
+from app.schemas.tickets import TicketCreate
+from app.services.chat_hub import ChatHub, TypingState, chat_hub, typing_state
+
+@pytest.fixture
+def chat_users(async_session_factory):
+    """Two users with profiles, and a token for each"""
+    async def scenario():
+        async with async_session_factory() as db:
+            for user_id, first_name in (("u1", "Ada"), ("u2", "Alan")):
+                db.add(User(id=user_id, email=f"{user_id}@example.com", password_hash="x"))
+                db.add(Profile(id=user_id, email=f"{user_id}@example.com", first_name=first_name, last_name="Test"))
+            await db.commit()
+    asyncio.run(scenario())
+    typing_state.clear()
+    yield {user_id: create_access_token(data={"sub": f"{user_id}@example.com"}) for user_id in ("u1", "u2")}
+    typing_state.clear()
+
+class TestChatHub:
+    """Test cases for the in-process chat hub"""
+
+    def test_publish_reaches_every_subscriber(self):
+        """Test fan-out to all subscribers"""
+        hub = ChatHub(queue_size=10)
+        first, second = hub.subscribe(), hub.subscribe()
+
+        hub.publish({"type": "message"})
+
+        assert first.queue.get_nowait() == {"type": "message"}
+        assert second.queue.get_nowait() == {"type": "message"}
+
+    def test_slow_subscriber_gets_resync(self):
+        """Test that an overflowing queue is replaced by a resync event"""
+        hub = ChatHub(queue_size=2)
+        subscription = hub.subscribe()
+        for i in range(3):
+            hub.publish({"type": "message", "n": i})
+
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait() == {"type": "resync"}
+
+class TestTypingState:
+    """Test cases for in-memory typing indicators"""
+
+    def test_entries_expire(self):
+        """Test that typing state disappears after its TTL"""
+        state = TypingState(ttl=0.01)
+        state.set("u1", "Ada", True)
+        assert [entry["user_id"] for entry in state.active()] == ["u1"]
+
+        time.sleep(0.02)
+        assert state.active() == []
+
+    def test_stop_typing_and_exclude(self):
+        """Test clearing and excluding the caller"""
+        state = TypingState(ttl=5)
+        state.set("u1", "Ada", True)
+        state.set("u2", "Alan", True)
+        state.set("u2", "Alan", False)
+
+        assert state.active(exclude_user_id="u1") == []
+        assert [entry["user_id"] for entry in state.active()] == ["u1"]
+
+class TestChatWebSocket:
+    """Test cases for the chat WebSocket endpoint"""
+
+    def test_rejects_missing_token(self, client):
+        """Test that an unauthenticated socket is closed"""
+        from starlette.websockets import WebSocketDisconnect
+
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/api/v1/chat/ws") as websocket:
+                websocket.receive_json()
+
+    def test_pushes_messages_and_typing(self, client, chat_users):
+        """Test that posted messages and typing changes are pushed to other clients"""
+        headers = {"Authorization": f"Bearer {chat_users['u1']}"}
+
+        with client.websocket_connect(f"/api/v1/chat/ws?token={chat_users['u2']}") as websocket:
+            response = client.post("/api/v1/chat/typing-indicators", json={"is_typing": True}, headers=headers)
+            assert response.status_code == 200
+            event = websocket.receive_json()
+            assert event["type"] == "typing"
+            assert event["typing"]["user_name"] == "Ada Test"
+            assert event["typing"]["is_typing"] is True
+
+            response = client.post("/api/v1/chat/messages", json={"content": "hello"}, headers=headers)
+            assert response.status_code == 200
+            event = websocket.receive_json()
+            assert event["type"] == "message"
+            assert event["message"]["content"] == "hello"
+
+        # The server side unsubscribes once it notices the disconnect
+        for _ in range(50):
+            if len(chat_hub) == 0:
+                break
+            time.sleep(0.01)
+        assert len(chat_hub) == 0
+
+    def test_ticket_events_are_pushed_as_notifications(self, client, chat_users):
+        """Test that a tickets.* event from the ticket endpoints is sent as JSON and keeps the socket open"""
+        engine = create_engine("sqlite:///:memory:")
+        ModelsBase.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+
+        with client.websocket_connect(f"/api/v1/chat/ws?token={chat_users['u2']}") as websocket:
+            ticket = create_ticket(
+                TicketCreate(title="Printer offline", description="Floor 5", priority="high"), db=db, current_user="u1"
+            )
+            event = websocket.receive_json()
+            assert event["type"] == "notification"
+            assert event["topic"] == "tickets.created"
+            assert event["data"]["id"] == ticket.id
+            assert (event["data"]["status"], event["data"]["priority"]) == ("open", "high")
+
+            websocket.send_json({"type": "typing", "is_typing": True})
+            for _ in range(50):
+                if typing_state.active():
+                    break
+                time.sleep(0.01)
+            assert [entry["user_id"] for entry in typing_state.active()] == ["u2"]
+        db.close()
+
+    def test_typing_sent_over_socket_is_visible_to_rest(self, client, chat_users):
+        """Test that typing state from the socket shows up in the REST endpoint"""
+        with client.websocket_connect("/api/v1/chat/ws", headers={"Authorization": f"Bearer {chat_users['u2']}"}) as websocket:
+            websocket.send_json({"type": "typing", "is_typing": True})
+            for _ in range(50):
+                if typing_state.active():
+                    break
+                time.sleep(0.01)
+
+            response = client.get("/api/v1/chat/typing-indicators", headers={"Authorization": f"Bearer {chat_users['u1']}"})
+            assert [entry["user_name"] for entry in response.json()] == ["Alan Test"]
+
+    @pytest.mark.parametrize("frame", [{"text": "{not json"}, {"bytes": b"\x00\x01"}])
+    def test_malformed_frame_closes_with_1003(self, client, chat_users, frame):
+        """Test that a frame that is not JSON text closes the socket instead of failing the server"""
+        from starlette.websockets import WebSocketDisconnect
+
+        with client.websocket_connect(f"/api/v1/chat/ws?token={chat_users['u2']}") as websocket:
+            websocket.send({"type": "websocket.receive", **frame})
+            with pytest.raises(WebSocketDisconnect) as exc_info:
+                websocket.receive_json()
+
+        assert exc_info.value.code == 1003
@@ -0,0 +1,89 @@
+import pytest
+import gzip
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, compressed_cache
+
+LARGE = b'{"rows":[' + b",".join(b'{"id":%d,"name":"Item"}' % i for i in range(500)) + b"]}"
+
+@pytest.fixture
+def client():
+    """Client for a small app behind the compression middleware"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return Response(LARGE, media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(LARGE), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([LARGE, LARGE]), media_type="application/x-ndjson")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    compressed_cache.clear()
+    return TestClient(app)
+
+def raw_get(client, path, accept_encoding="gzip"):
+    """GET without transparent decompression; returns (response, raw body)"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+class TestCompressionMiddleware:
+    """Test cases for response compression"""
+
+    def test_large_bodies_are_compressed(self, client):
+        """Test gzip encoding, Content-Length, Vary and the weakened ETag"""
+        response, body = raw_get(client, "/large")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"abc"'
+        assert int(response.headers["content-length"]) == len(body) < len(LARGE)
+        assert gzip.decompress(body) == LARGE
+
+    def test_bodies_left_alone(self, client):
+        """Test that small, already encoded, streaming and binary bodies pass through"""
+        response, _ = raw_get(client, "/small")
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+        response, body = raw_get(client, "/encoded")
+        assert gzip.decompress(body) == LARGE
+
+        response, body = raw_get(client, "/stream")
+        assert "content-encoding" not in response.headers
+        assert body == LARGE * 2
+
+        response, _ = raw_get(client, "/image")
+        assert "content-encoding" not in response.headers
+
+        response, body = raw_get(client, "/large", accept_encoding="identity, gzip;q=0")
+        assert "content-encoding" not in response.headers
+        assert body == LARGE
+
+    def test_cached_bodies_are_compressed_once(self, client, monkeypatch):
+        """Test that responses with a strong ETag reuse their compressed bytes"""
+        calls = []
+        original = compression.gzip.compress
+        monkeypatch.setattr(compression.gzip, "compress", lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs))
+
+        first = raw_get(client, "/large")[1]
+        second = raw_get(client, "/large")[1]
+
+        assert first == second
+        assert len(calls) == 1
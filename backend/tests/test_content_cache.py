@@ -0,0 +1,134 @@
+import pytest
+import json
+from datetime import datetime
+from fastapi import BackgroundTasks, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Blog, FAQ
+from app.schemas import BlogUpdate
+from app.api.endpoints.blogs import delete_blog, get_blogs, get_blog_by_slug, get_blog_summaries, update_blog
+from app.api.endpoints.faqs import get_faqs
+
+@pytest.fixture
+def content_db():
+    """Session on an in-memory database with published content"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Blog(id="b1", title="Hello", slug="hello", excerpt="Hi", content="Body", category="news",
+             published=True, publish_date=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 2)),
+        Blog(id="b2", title="Draft", slug="draft", excerpt="Soon", content="Body", category="news", published=False),
+        FAQ(id="f1", question="Why?", answer="Because", category="general", published=True, order_index=1),
+    ])
+    session.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.statements = statements
+    yield session
+    session.close()
+
+def make_request(headers=None):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]})
+
+def list_blogs(db, headers=None, **params):
+    return get_blogs(make_request(headers), db=db, **{"published_only": True, "category": None, **params})
+
+def blog_summaries(db, **params):
+    """Call get_blog_summaries; returns (summaries, next cursor)"""
+    params = {"published_only": True, "category": None, "skip": 0, "limit": 100, "cursor": None, **params}
+    page = get_blog_summaries(make_request(), db=db, **params)
+    return json.loads(page.body), page.headers.get("X-Next-Cursor")
+
+class TestContentCache:
+    """Test cases for cached blog, doc and FAQ responses"""
+
+    def test_repeat_requests_skip_the_database(self, content_db):
+        """Test that a second identical request is served from the cache with validators"""
+        first = list_blogs(content_db)
+        queries = len(content_db.statements)
+        second = list_blogs(content_db)
+
+        assert len(content_db.statements) == queries
+        assert second.body == first.body
+        assert [blog["slug"] for blog in json.loads(first.body)] == ["hello"]
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert first.headers["Cache-Control"].startswith("public, max-age=")
+        assert "Last-Modified" not in first.headers
+
+        everything = list_blogs(content_db, published_only=False)
+        assert len(json.loads(everything.body)) == 2
+
+    def test_conditional_requests(self, content_db):
+        """Test 304 responses for a matching If-None-Match or an unchanged If-Modified-Since"""
+        etag = list_blogs(content_db).headers["ETag"]
+
+        assert list_blogs(content_db, {"If-None-Match": etag}).status_code == 304
+        assert list_blogs(content_db, {"If-None-Match": '"stale"'}).status_code == 200
+
+        def blog(headers):
+            return get_blog_by_slug(make_request(headers), "hello", db=content_db)
+
+        assert blog({}).headers["Last-Modified"] == "Thu, 02 Jan 2025 00:00:00 GMT"
+        assert blog({"If-Modified-Since": "Fri, 03 Jan 2025 00:00:00 GMT"}).status_code == 304
+        assert blog({"If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"}).status_code == 200
+
+    def test_deleting_an_older_item_changes_the_list(self, content_db):
+        """Test that a list losing a row that is not the newest is not answered with 304"""
+        content_db.add(Blog(id="b3", title="Newer", slug="newer", excerpt="", content="Body", category="news",
+                            published=True, publish_date=datetime(2025, 2, 1), updated_at=datetime(2025, 2, 2)))
+        content_db.commit()
+        before = list_blogs(content_db)
+
+        delete_blog("b1", BackgroundTasks(), db=content_db, current_user={"sub": None})
+
+        assert list_blogs(content_db, {"If-None-Match": before.headers["ETag"]}).status_code == 200
+        assert list_blogs(content_db, {"If-Modified-Since": "Sat, 01 Mar 2025 00:00:00 GMT"}).status_code == 200
+        assert [blog["slug"] for blog in json.loads(list_blogs(content_db).body)] == ["newer"]
+
+    def test_writes_invalidate_only_their_namespace(self, content_db):
+        """Test that updating a blog refreshes blog responses but keeps cached FAQs"""
+        before = list_blogs(content_db)
+        single = get_blog_by_slug(make_request(), "hello", db=content_db)
+        get_faqs(make_request(), published_only=True, category=None, db=content_db)
+
+        update_blog("b1", BlogUpdate(title="Hello again"), BackgroundTasks(), db=content_db, current_user={"sub": None})
+        queries = len(content_db.statements)
+        get_faqs(make_request(), published_only=True, category=None, db=content_db)
+        assert len(content_db.statements) == queries
+
+        after = list_blogs(content_db, {"If-None-Match": before.headers["ETag"]})
+        assert after.status_code == 200
+        assert json.loads(after.body)[0]["title"] == "Hello again"
+        assert json.loads(get_blog_by_slug(make_request(), "hello", db=content_db).body)["title"] == "Hello again"
+        assert json.loads(single.body)["title"] == "Hello"
+
+class TestContentSummaries:
+    """Test cases for the body-less blog and doc index"""
+
+    def test_summaries_never_select_the_body(self, content_db):
+        """Test that summaries project their columns and leave out content"""
+        summaries, cursor = blog_summaries(content_db)
+
+        assert cursor is None
+        assert [summary["slug"] for summary in summaries] == ["hello"]
+        assert "content" not in summaries[0]
+        assert summaries[0]["excerpt"] == "Hi"
+        select_sql = [sql for sql in content_db.statements if sql.startswith("SELECT")]
+        assert select_sql and all("blogs.content" not in sql for sql in select_sql)
+
+    def test_cursor_walks_newest_first(self, content_db):
+        """Test that pages follow publish_date descending, undated posts last"""
+        for i in range(3):
+            content_db.add(Blog(id=f"n{i}", title=f"New {i}", slug=f"new-{i}", excerpt="", content="x" * 1000,
+                                category="news", published=True, publish_date=datetime(2025, 2, 1 + i)))
+        content_db.commit()
+
+        slugs, cursor = [], None
+        while True:
+            page, cursor = blog_summaries(content_db, published_only=False, limit=2, cursor=cursor)
+            slugs += [summary["slug"] for summary in page]
+            if cursor is None:
+                break
+        assert slugs == ["new-2", "new-1", "new-0", "hello", "draft"]
@@ -0,0 +1,124 @@
+import pytest
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from fastapi import BackgroundTasks, Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Blog, FAQ
+from app.schemas import BlogUpdate
+from app.api.endpoints import blogs
+from app.api.endpoints.blogs import blog_cache, get_blogs, get_blog_by_slug, update_blog
+from app.services.content_snapshots import ContentSnapshots, item_name, list_name
+
+@pytest.fixture
+def session_factory():
+    """Session factory on an in-memory database with published and draft content"""
+    # Background rebuilds run in a worker thread, so every thread shares one connection
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    session.add_all([
+        Blog(id="b1", title="Hello", slug="hello", excerpt="Hi", content="Body " * 200, category="news",
+             published=True, publish_date=datetime(2025, 1, 1)),
+        Blog(id="b2", title="Draft", slug="draft", excerpt="Soon", content="Body", category="drafts", published=False),
+        FAQ(id="f1", question="Why?", answer="Because", category="general", published=True, order_index=1),
+    ])
+    session.commit()
+    session.close()
+    return factory
+
+@pytest.fixture
+def snapshots(session_factory, tmp_path, monkeypatch):
+    """Snapshot store in a temporary directory, used by the blog endpoints"""
+    store = ContentSnapshots(str(tmp_path), max_age=3600, session_factory=session_factory)
+    store.build_all_job()
+    monkeypatch.setattr(blog_cache, "snapshots", store)
+    monkeypatch.setattr(blogs, "content_snapshots", store)
+    return store
+
+def make_request(headers=None):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]})
+
+class TestContentSnapshots:
+    """Test cases for pre-rendered content snapshots"""
+
+    def test_build_all_writes_published_content(self, snapshots, tmp_path):
+        """Test that published lists, categories and items are written with gzip copies"""
+        listing = json.loads((tmp_path / "blogs" / "list.json").read_bytes())
+        assert [blog["slug"] for blog in listing] == ["hello"]
+        assert json.loads((tmp_path / "blogs" / "categories.json").read_bytes()) == ["news"]
+        assert (tmp_path / "faqs" / "item-f1.json").exists()
+        assert not (tmp_path / "blogs" / "item-draft.json").exists()
+
+        entry = snapshots.load(item_name("blogs", "hello"))
+        assert gzip.decompress(entry.encoded["gzip"]) == entry.body
+
+        old = time.time() - 7200
+        os.utime(tmp_path / "blogs" / "list.json", (old, old))
+        assert snapshots.load(list_name("blogs")) is None
+
+    def test_api_serves_snapshots_without_queries(self, snapshots, session_factory):
+        """Test that fresh snapshots are sent precompressed and without touching the database"""
+        db = session_factory()
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        compressed = get_blogs(make_request({"Accept-Encoding": "gzip, br;q=0"}), published_only=True, category=None, db=db)
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["Vary"] == "Accept-Encoding"
+        assert json.loads(gzip.decompress(compressed.body))[0]["slug"] == "hello"
+
+        blog_cache.clear()
+        plain = get_blog_by_slug(make_request(), "hello", db=db)
+        assert "Content-Encoding" not in plain.headers
+        assert json.loads(plain.body)["title"] == "Hello"
+        assert statements == []
+        db.close()
+
+    def test_writes_rebuild_affected_snapshots(self, snapshots, session_factory, tmp_path):
+        """Test that a slug change drops stale snapshots at once and rebuilds them after the response"""
+        db = session_factory()
+        tasks = BackgroundTasks()
+        update_blog("b1", BlogUpdate(title="Renamed", slug="renamed"), tasks, db=db, current_user={"sub": None})
+
+        assert snapshots.load(list_name("blogs")) is None
+        assert snapshots.load(item_name("blogs", "hello")) is None
+        assert snapshots.load(list_name("faqs")) is not None
+
+        asyncio.run(tasks())
+        assert json.loads(snapshots.load(item_name("blogs", "renamed")).body)["title"] == "Renamed"
+        assert json.loads(snapshots.load(list_name("blogs")).body)[0]["slug"] == "renamed"
+        assert not (tmp_path / "blogs" / "item-hello.json").exists()
+        db.close()
+
+    def test_writes_win_over_a_running_full_rebuild(self, snapshots, session_factory, tmp_path):
+        """Test that a full rebuild rendered before a write does not overwrite the write's snapshots"""
+        db = session_factory()
+        write = snapshots.write
+        raced = []
+
+        def write_after_update(name, body, generation=None):
+            # The rebuild has rendered the list; a write commits and rebuilds before it is saved
+            if name == list_name("blogs") and not raced:
+                raced.append(name)
+                tasks = BackgroundTasks()
+                update_blog("b1", BlogUpdate(title="Renamed", slug="renamed"), tasks, db=db, current_user={"sub": None})
+                asyncio.run(tasks())
+            write(name, body, generation)
+
+        snapshots.write = write_after_update
+        snapshots.build_all_job()
+
+        assert raced
+        assert json.loads(snapshots.load(list_name("blogs")).body)[0]["slug"] == "renamed"
+        assert json.loads(snapshots.load(item_name("blogs", "renamed")).body)["title"] == "Renamed"
+        assert not (tmp_path / "blogs" / "item-hello.json").exists()
+        assert snapshots.load(list_name("faqs")) is not None
+        db.close()
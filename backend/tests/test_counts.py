@@ -0,0 +1,52 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.counts import table_count, invalidate_count, count_cache
+from app.models.finance import Transaction
+
+@pytest.fixture
+def finance_db():
+    """Session on an in-memory database with the finance tables"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    count_cache.clear()
+    yield session
+    session.close()
+    count_cache.clear()
+
+def add_transaction(db):
+    db.add(Transaction(type="income", amount=10.0, date=datetime(2025, 1, 1), category="sales"))
+    db.commit()
+
+class TestTableCount:
+    """Test cases for the list total count modes"""
+
+    def test_exact_count_sees_every_insert(self, finance_db):
+        """Test that exact mode always counts"""
+        add_transaction(finance_db)
+        assert table_count(finance_db, Transaction, "exact") == 1
+
+        add_transaction(finance_db)
+        assert table_count(finance_db, Transaction, "exact") == 2
+
+    def test_cached_count_reused_until_invalidated(self, finance_db):
+        """Test that cached mode serves the stored count until invalidation"""
+        add_transaction(finance_db)
+        assert table_count(finance_db, Transaction, "cached") == 1
+
+        add_transaction(finance_db)
+        assert table_count(finance_db, Transaction, "cached") == 1
+
+        invalidate_count(Transaction)
+        assert table_count(finance_db, Transaction, "cached") == 2
+
+    def test_estimated_falls_back_without_statistics(self, finance_db):
+        """Test that estimated mode uses the cached count on SQLite"""
+        add_transaction(finance_db)
+
+        assert table_count(finance_db, Transaction, "estimated") == 1
+        assert len(count_cache) == 1
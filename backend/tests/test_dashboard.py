@@ -0,0 +1,213 @@
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Base as ModelsBase, Employee, InventoryItem, SalesLead
+from app.models.finance import FinanceInvoice
+from app.models.dashboard import DashboardSnapshot
+from app.schemas import DashboardStats
+from app.services.dashboard import (
+    SNAPSHOT_ID, dashboard_metrics_query, dashboard_metrics,
+    top_employees_query, top_inventory_items_query, top_sales_leads_query,
+    get_dashboard_snapshot, rebuild_dashboard_snapshot, snapshot_metrics,
+    apply_snapshot_delta, snapshot_delta_statement,
+    inventory_contribution, invoice_contribution, lead_contribution
+)
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+@pytest.fixture(scope="function")
+def test_db():
+    """Create a test database session with the dashboard source tables"""
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    ModelsBase.metadata.create_all(bind=engine)
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+
+@pytest.fixture
+def populated_db(test_db):
+    """Database with a handful of invoices, employees, items and leads"""
+    for i, (amount, status) in enumerate([(100.0, "paid"), (250.5, "paid"), (75.0, "sent")]):
+        test_db.add(FinanceInvoice(
+            invoice_number=f"INV-{i}", client_name="Acme", amount=amount, status=status,
+            issue_date=datetime(2025, 1, 1), due_date=datetime(2025, 2, 1)
+        ))
+    for i in range(3):
+        test_db.add(Employee(
+            employee_id=f"EMP-{i}", name=f"Employee {i}", email=f"e{i}@example.com",
+            department="IT", position="Engineer", hire_date=date(2024, 1, i + 1)
+        ))
+    for i, (stock, status) in enumerate([(0, "out of stock"), (3, "low stock"), (40, "in stock"), (2, "low stock")]):
+        test_db.add(InventoryItem(
+            name=f"Item {i}", category="Parts", stock=stock, unit_price=Decimal("1.00"),
+            supplier="Supplier", status=status
+        ))
+    for i, value in enumerate([Decimal("500.00"), None, Decimal("1500.00")]):
+        test_db.add(SalesLead(name=f"Lead {i}", email=f"l{i}@example.com", status="new", value=value))
+    test_db.commit()
+    return test_db
+
+class TestDashboardMetrics:
+    """Test cases for the dashboard aggregation queries"""
+
+    def test_metrics_empty_tables(self, test_db):
+        """Test that empty tables aggregate to zeros"""
+        metrics = dashboard_metrics(test_db.execute(dashboard_metrics_query()).one())
+
+        assert metrics["totalRevenue"] == 0
+        assert metrics["totalOrders"] == 0
+        assert metrics["activeEmployees"] == 0
+        assert metrics["totalStock"] == 0
+        assert metrics["totalLeadsValue"] == 0
+
+    def test_metrics_match_python_aggregation(self, populated_db):
+        """Test that SQL aggregates match the previous in-Python computation"""
+        metrics = dashboard_metrics(populated_db.execute(dashboard_metrics_query()).one())
+        items = populated_db.query(InventoryItem).all()
+
+        assert metrics["totalRevenue"] == pytest.approx(350.5)
+        assert metrics["totalOrders"] == 3
+        assert metrics["activeEmployees"] == 3
+        assert metrics["totalInventoryItems"] == len(items)
+        assert metrics["totalStock"] == sum(item.stock for item in items)
+        assert metrics["lowStockItems"] == 2
+        assert metrics["outOfStockItems"] == 1
+        assert Decimal(str(metrics["totalLeadsValue"])) == Decimal("2000.00")
+
+    def test_top_lists_are_bounded(self, populated_db):
+        """Test that the top-N queries respect the limit and ordering"""
+        items = populated_db.execute(top_inventory_items_query(2)).scalars().all()
+        leads = populated_db.execute(top_sales_leads_query(1)).scalars().all()
+        employees = populated_db.execute(top_employees_query(2)).scalars().all()
+
+        assert [item.stock for item in items] == [0, 2]
+        assert leads[0].value == Decimal("1500.00")
+        assert employees[0].employee_id == "EMP-2"
+        assert len(employees) == 2
+
+    def test_unbounded_lists_for_legacy_mode(self, populated_db):
+        """Test that a limit of None returns every row"""
+        items = populated_db.execute(top_inventory_items_query(None)).scalars().all()
+
+        assert len(items) == 4
+
+    def test_dashboard_stats_schema(self, populated_db):
+        """Test that the aggregated metrics and ORM rows build a DashboardStats"""
+        metrics = dashboard_metrics(populated_db.execute(dashboard_metrics_query()).one())
+        stats = DashboardStats(
+            **metrics,
+            employees=populated_db.execute(top_employees_query(1)).scalars().all(),
+            inventoryItems=populated_db.execute(top_inventory_items_query(1)).scalars().all(),
+            salesLeads=populated_db.execute(top_sales_leads_query(1)).scalars().all()
+        )
+
+        assert stats.totalOrders == 3
+        assert len(stats.employees) == 1
+
+class TestDashboardSnapshot:
+    """Test cases for the materialized dashboard snapshot"""
+
+    def test_snapshot_built_on_first_read(self, populated_db):
+        """Test that the first lookup rebuilds the snapshot from source tables"""
+        snapshot = get_dashboard_snapshot(populated_db)
+        metrics = snapshot_metrics(snapshot)
+
+        assert snapshot.id == SNAPSHOT_ID
+        assert snapshot.refreshed_at is not None
+        assert metrics["totalOrders"] == 3
+        assert metrics["lowStockItems"] == 2
+
+    def test_incremental_updates_match_rebuild(self, populated_db):
+        """Test that applied deltas produce the same totals as a full rebuild"""
+        get_dashboard_snapshot(populated_db)
+
+        item = InventoryItem(
+            name="New", category="Parts", stock=5, unit_price=Decimal("1.00"),
+            supplier="Supplier", status="low stock"
+        )
+        populated_db.add(item)
+        apply_snapshot_delta(populated_db, {}, inventory_contribution(item))
+        populated_db.commit()
+
+        before = inventory_contribution(item)
+        item.stock = 0
+        item.status = "out of stock"
+        apply_snapshot_delta(populated_db, before, inventory_contribution(item))
+        populated_db.commit()
+
+        invoice = populated_db.query(FinanceInvoice).filter(FinanceInvoice.status == "sent").first()
+        before = invoice_contribution(invoice)
+        invoice.status = "paid"
+        apply_snapshot_delta(populated_db, before, invoice_contribution(invoice))
+        populated_db.commit()
+
+        lead = populated_db.query(SalesLead).filter(SalesLead.value.isnot(None)).first()
+        populated_db.delete(lead)
+        apply_snapshot_delta(populated_db, lead_contribution(lead), {})
+        populated_db.commit()
+
+        populated_db.expire_all()
+        incremental = snapshot_metrics(get_dashboard_snapshot(populated_db))
+        rebuilt = snapshot_metrics(rebuild_dashboard_snapshot(populated_db))
+
+        assert incremental["totalInventoryItems"] == rebuilt["totalInventoryItems"] == 5
+        assert incremental["outOfStockItems"] == rebuilt["outOfStockItems"] == 2
+        assert incremental["totalRevenue"] == pytest.approx(rebuilt["totalRevenue"])
+        assert incremental["totalLeadsValue"] == rebuilt["totalLeadsValue"]
+
+    def test_rebuild_locks_the_snapshot_before_reading_totals(self, populated_db):
+        """Test that the snapshot row is locked before the totals it is overwritten with are read"""
+        get_dashboard_snapshot(populated_db)
+        statements = []
+        event.listen(populated_db, "do_orm_execute",
+                     lambda state: statements.append(str(state.statement.compile(dialect=mysql.dialect()))))
+
+        rebuild_dashboard_snapshot(populated_db)
+
+        assert "FOR UPDATE" in statements[0] and "dashboard_snapshots" in statements[0]
+        assert "invoice_stats" in statements[1]
+
+    def test_concurrent_first_rebuild_keeps_one_row(self, tmp_path, monkeypatch):
+        """Test that a rebuild losing the race to insert the snapshot row still completes"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'dashboard.db'}")
+        Base.metadata.create_all(bind=engine)
+        ModelsBase.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        first, second = factory(), factory()
+        first.add(InventoryItem(name="Item", category="Parts", stock=4, unit_price=Decimal("1.00"),
+                                supplier="Supplier", status="in stock"))
+        first.commit()
+
+        get = second.get
+        calls = []
+
+        def miss_once(*args, **kwargs):
+            # The second rebuild looked before the first one inserted the row
+            calls.append(args)
+            if len(calls) == 1:
+                rebuild_dashboard_snapshot(first)
+                return None
+            return get(*args, **kwargs)
+
+        monkeypatch.setattr(second, "get", miss_once)
+        snapshot = rebuild_dashboard_snapshot(second)
+
+        assert snapshot.total_stock == 4 and snapshot.refreshed_at is not None
+        assert second.query(DashboardSnapshot).count() == 1
+        first.close()
+        second.close()
+        engine.dispose()
+
+    def test_no_statement_for_unchanged_contribution(self):
+        """Test that an update which does not affect any metric is skipped"""
+        assert snapshot_delta_statement({"total_stock": 3}, {"total_stock": 3}) is None
@@ -0,0 +1,142 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.events import EventBus, OutboxEventBus
+from app.models.events import EventOutbox
+from app.services import chat_hub as chat_hub_module
+from app.services.chat_hub import typing_state
+
+@pytest.fixture
+def outbox_sessions(tmp_path):
+    """Session factory on a file database shared by several buses"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+    EventOutbox.__table__.create(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+class TestEventBus:
+    """Test cases for in-process event delivery"""
+
+    def test_topic_and_family_subscribers(self):
+        """Test that a topic reaches exact and family.* subscribers only"""
+        bus = EventBus()
+        received = []
+        bus.subscribe("tickets.created", lambda topic, payload: received.append(("exact", topic)))
+        bus.subscribe("tickets.*", lambda topic, payload: received.append(("family", topic)))
+        bus.subscribe("inventory.*", lambda topic, payload: received.append(("other", topic)))
+
+        bus.publish("tickets.created", {"id": "t1"})
+        bus.publish("tickets.deleted", {"id": "t1"})
+
+        assert received == [
+            ("exact", "tickets.created"), ("family", "tickets.created"), ("family", "tickets.deleted"),
+        ]
+
+    def test_failing_handler_does_not_stop_others(self):
+        """Test that one broken handler does not block delivery"""
+        bus = EventBus()
+        received = []
+        bus.subscribe("chat.message", lambda topic, payload: 1 / 0)
+        bus.subscribe("chat.message", lambda topic, payload: received.append(payload))
+
+        bus.publish("chat.message", {"id": "m1"})
+
+        assert received == [{"id": "m1"}]
+
+class TestOutboxEventBus:
+    """Test cases for delivery between processes through the outbox"""
+
+    def test_event_reaches_other_worker(self, outbox_sessions):
+        """Test that a worker receives events another worker published"""
+        first, second = OutboxEventBus(outbox_sessions), OutboxEventBus(outbox_sessions)
+        received = []
+        second.subscribe("tickets.*", lambda topic, payload: received.append((topic, payload)))
+        second.poll()
+
+        first.publish("tickets.updated", {"id": "t1", "status": "closed"})
+
+        assert second.poll() == 1
+        assert received == [("tickets.updated", {"id": "t1", "status": "closed"})]
+        assert second.poll() == 0
+
+    def test_own_events_are_not_delivered_twice(self, outbox_sessions):
+        """Test that a worker skips its own rows when polling"""
+        bus = OutboxEventBus(outbox_sessions)
+        received = []
+        bus.subscribe("chat.message", lambda topic, payload: received.append(payload))
+        bus.poll()
+
+        bus.publish("chat.message", {"id": "m1"})
+        bus.poll()
+
+        assert received == [{"id": "m1"}]
+
+    def test_first_poll_skips_history(self, outbox_sessions):
+        """Test that a starting worker does not replay old events"""
+        OutboxEventBus(outbox_sessions).publish("chat.message", {"id": "old"})
+        late = OutboxEventBus(outbox_sessions)
+        received = []
+        late.subscribe("chat.message", lambda topic, payload: received.append(payload))
+
+        late.poll()
+        late.poll()
+
+        assert received == []
+
+    def test_late_commit_below_last_id_is_delivered_once(self, outbox_sessions):
+        """Test that a row committed after a higher id was read is picked up from the gaps"""
+        bus = OutboxEventBus(outbox_sessions)
+        received = []
+        bus.subscribe("tickets.*", lambda topic, payload: received.append(payload["id"]))
+        bus.poll()
+
+        def commit(row_id):
+            with outbox_sessions() as db:
+                db.add(EventOutbox(id=row_id, topic="tickets.updated", payload=f'{{"id": "t{row_id}"}}', origin="other"))
+                db.commit()
+
+        commit(2)  # id 1 was allocated first but its writer has not committed yet
+        assert bus.poll() == 1
+        assert bus.gaps.keys() == {1}
+
+        commit(1)
+        assert bus.poll() == 1
+        assert bus.poll() == 0
+        assert received == ["t2", "t1"]
+        assert bus.gaps == {}
+
+    def test_gaps_are_given_up_after_the_timeout(self, outbox_sessions):
+        """Test that ids of rolled-back inserts stop being re-checked"""
+        bus = OutboxEventBus(outbox_sessions, gap_timeout=-1)
+        bus.poll()
+        with outbox_sessions() as db:
+            db.add(EventOutbox(id=3, topic="chat.message", payload="{}", origin="other"))
+            db.commit()
+
+        bus.poll()
+        assert bus.gaps.keys() == {1, 2}
+        bus.poll()
+        assert bus.gaps == {}
+
+    def test_purge_removes_expired_rows(self, outbox_sessions):
+        """Test that rows older than the retention window are deleted"""
+        bus = OutboxEventBus(outbox_sessions, retention_seconds=-1)
+        bus.publish("chat.message", {"id": "m1"})
+
+        assert bus.purge() == 1
+        with outbox_sessions() as db:
+            assert db.query(EventOutbox).count() == 0
+
+    def test_remote_typing_updates_local_state(self, outbox_sessions):
+        """Test that typing from another worker shows up in this worker's typing state"""
+        local = OutboxEventBus(outbox_sessions)
+        local.subscribe("chat.typing", chat_hub_module._on_typing)
+        local.poll()
+        typing_state.clear()
+
+        OutboxEventBus(outbox_sessions).publish("chat.typing", {"user_id": "u2", "user_name": "Alan Test", "is_typing": True})
+        local.poll()
+
+        assert [entry["user_id"] for entry in typing_state.active()] == ["u2"]
+        typing_state.clear()
@@ -0,0 +1,96 @@
+import pytest
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.finance import Transaction
+from app.services.exports import export_batches, export_response, serialize_batches
+
+@pytest.fixture
+def finance_db(tmp_path):
+    """Session on a file database with five transactions"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Transaction(id=f"t{i}", type="income", amount=i * 1.5, description=f"line, {i}",
+                    date=datetime(2025, 1, i + 1), category="sales", reference=f"r{i}")
+        for i in range(5)
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+def read_body(response):
+    async def collect():
+        return "".join([chunk async for chunk in response.body_iterator])
+    return asyncio.run(collect())
+
+class TestExports:
+    """Test cases for streaming table exports"""
+
+    def test_batches_are_streamed_separately(self, finance_db):
+        """Test that rows are fetched and serialized in fixed-size batches"""
+        chunks = list(serialize_batches(export_batches(finance_db, Transaction, batch_size=2), "ndjson"))
+
+        assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+        assert json.loads(chunks[0].splitlines()[0])["reference"] == "r0"
+
+    def test_each_batch_is_a_bounded_query(self, finance_db):
+        """Test that batches are separate LIMITed queries seeking past the previous batch"""
+        statements = []
+        event.listen(finance_db.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters)))
+
+        batches = export_batches(finance_db, Transaction, batch_size=2)
+        first = next(batches)
+        assert len(statements) == 1  # later batches are not read yet
+        rows = [row for _, batch in [first, *batches] for row in batch]
+
+        assert [row.id for row in rows] == ["t0", "t1", "t2", "t3", "t4"]
+        assert len(statements) == 3
+        assert all("LIMIT" in statement for statement, _ in statements)
+        assert "t1" in statements[1][1] and "t3" in statements[2][1]
+
+    def test_csv_response(self, finance_db):
+        """Test the CSV download, its header row and quoting"""
+        response = export_response(finance_db, Transaction, "csv")
+
+        assert response.media_type == "text/csv"
+        assert response.headers["content-disposition"].startswith('attachment; filename="transactions-')
+        rows = list(csv.DictReader(io.StringIO(read_body(response))))
+        assert [row["id"] for row in rows] == ["t0", "t1", "t2", "t3", "t4"]
+        assert rows[2]["description"] == "line, 2"
+        assert rows[2]["date"] == "2025-01-03T00:00:00"
+
+    def test_columnar_row_groups(self, finance_db):
+        """Test that columnar output carries one column-oriented object per batch"""
+        groups = [json.loads(line) for chunk in serialize_batches(export_batches(finance_db, Transaction, batch_size=3), "columnar") for line in chunk.splitlines()]
+
+        assert [group["rows"] for group in groups] == [3, 2]
+        assert groups[1]["columns"]["reference"] == ["r3", "r4"]
+        assert groups[0]["columns"]["amount"] == [0.0, 1.5, 3.0]
+
+    def test_empty_table_still_has_a_csv_header(self, tmp_path):
+        """Test that an empty table exports the header row and no row groups"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+
+        lines = "".join(serialize_batches(export_batches(session, Transaction), "csv")).splitlines()
+        columnar = "".join(serialize_batches(export_batches(session, Transaction), "columnar"))
+        session.close()
+        engine.dispose()
+
+        assert lines == [",".join(column.key for column in Transaction.__table__.columns)]
+        assert columnar == ""
+
+    def test_ticket_export_requires_authentication(self, client):
+        """Test that the ticket export is not public"""
+        assert client.get("/api/v1/tickets/export").status_code == 403  # HTTPBearer: no credentials
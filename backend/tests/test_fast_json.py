@@ -0,0 +1,89 @@
+import pytest
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core import fast_json
+from app.core.fast_json import FastJSONResponse, compile_serializer
+from app.models import Base, InventoryItem
+from app.schemas import InventoryItemResponse
+from app.schemas.finance import TransactionList
+from app.models.finance import Transaction
+
+def response_model_body(schema, content):
+    """What FastAPI sends for ``content`` with ``response_model=schema``"""
+    field = create_response_field(name="test", type_=schema)
+    value, errors = field.validate(content, {}, loc=("response",))
+    assert not errors
+    return JSONResponse(field.serialize(value, mode="json")).body
+
+@pytest.fixture
+def inventory_db():
+    """Session on an in-memory database with a few inventory items"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+    session.add_all([
+        InventoryItem(id=f"i{i}", name=f"Item {i}", category="Parts", stock=i, unit_price=Decimal("9.90"),
+                      supplier="Acme", status="in stock", created_at=datetime(2025, 1, 1, 12, 0, 0, 5000 * i))
+        for i in range(3)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+class TestFastJSON:
+    """Test cases for schema-compiled JSON responses"""
+
+    def test_matches_response_model_for_orm_and_core_rows(self, inventory_db):
+        """Test that ORM objects and Core rows serialize exactly as response_model does"""
+        schema = List[InventoryItemResponse]
+        objects = inventory_db.scalars(select(InventoryItem)).all()
+        rows = inventory_db.execute(select(*InventoryItem.__table__.columns)).all()
+
+        expected = response_model_body(schema, objects)
+        assert FastJSONResponse(objects, schema=schema).body == expected
+        assert FastJSONResponse(rows, schema=schema).body == expected
+        assert json.loads(expected)[0]["unit_price"] == "9.90"
+
+    def test_envelopes_dicts_and_defaults(self):
+        """Test dict envelopes around ORM rows, float coercion and defaults of missing keys"""
+        envelope = {
+            "items": [Transaction(id="t1", type="income", amount=Decimal("10"), description="Sale",
+                                  date=datetime(2025, 1, 2), category="sales", created_at=datetime(2025, 1, 2))],
+            "total": 1,
+        }
+        assert FastJSONResponse(envelope, schema=TransactionList).body == response_model_body(TransactionList, envelope)
+
+        class Entry(BaseModel):
+            name: str
+            tags: Optional[List[str]] = None
+            featured: bool = False
+
+        assert compile_serializer(Entry)({"name": "a"}) == {"name": "a", "tags": None, "featured": False}
+
+    @pytest.mark.parametrize("encoder", ["orjson", "stdlib"])
+    def test_encoders_match_response_model(self, encoder, monkeypatch):
+        """Test that both encoders write raw UTF-8 and UTC datetimes as pydantic does"""
+        if encoder == "stdlib":
+            monkeypatch.setattr(fast_json, "orjson", None)
+        elif fast_json.orjson is None:
+            pytest.skip("orjson is not installed")
+
+        class Event(BaseModel):
+            title: str
+            at: datetime
+            local: datetime
+
+        rows = [{"title": "Caf\u00e9 \u2615", "at": datetime(2025, 1, 2, 3, 4, 5, 600, tzinfo=timezone.utc),
+                 "local": datetime(2025, 1, 2, 3, 4, 5)}]
+        body = FastJSONResponse(rows, schema=List[Event]).body
+
+        assert body == response_model_body(List[Event], rows)
+        assert "Café ☕".encode() in body and b'"2025-01-02T03:04:05.000600Z"' in body
@@ -0,0 +1,95 @@
+import pytest
+import asyncio
+from sqlalchemy import event, func, select
+
+from app.models import InventoryItem, Profile
+from app.schemas import InventoryBulkRequest
+from app.api.endpoints.inventory import bulk_inventory_items
+from app.services.dashboard import get_dashboard_snapshot, rebuild_dashboard_snapshot, snapshot_metrics
+from app.services.inventory_bulk import InventoryBulkWriter
+
+@pytest.fixture
+def current_profile():
+    """Profile used as the authenticated user"""
+    return Profile(id="00000000-0000-0000-0000-000000000001", email="admin@example.com")
+
+def item(i, **overrides):
+    return {
+        "name": f"Item {i}", "category": "Parts", "stock": i, "unit_price": "1.50",
+        "supplier": "Acme", "status": "in stock", **overrides,
+    }
+
+def count_statements(session_factory):
+    """Record the SQL statements executed on the factory's engine"""
+    statements = []
+    engine = session_factory.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+class TestInventoryBulk:
+    """Test cases for bulk inventory writes"""
+
+    def test_per_row_results(self, async_session_factory, current_profile):
+        """Test that invalid and missing rows fail alone while the rest are written"""
+        async def scenario():
+            async with async_session_factory() as db:
+                summary = await bulk_inventory_items(
+                    InventoryBulkRequest(create=[item(1), item(2, stock="many"), item(3)]),
+                    db=db, current_profile=current_profile,
+                )
+                assert (summary["created"], summary["failed"]) == (2, 1)
+                assert summary["results"][1]["status"] == "error"
+                assert "stock" in summary["results"][1]["error"]
+                first, third = summary["results"][0]["id"], summary["results"][2]["id"]
+
+                summary = await bulk_inventory_items(
+                    InventoryBulkRequest(
+                        update=[{"id": first, "stock": 0, "status": "out of stock"}, {"id": "missing", "stock": 1}, {"stock": 1}],
+                        delete=[third, third],
+                    ),
+                    db=db, current_profile=current_profile,
+                )
+                assert [(r["operation"], r["status"]) for r in summary["results"]] == [
+                    ("update", "updated"), ("update", "error"), ("update", "error"), ("delete", "deleted"), ("delete", "error"),
+                ]
+                rows = (await db.execute(select(InventoryItem.id, InventoryItem.stock, InventoryItem.created_by))).all()
+                assert [(row.id, row.stock, row.created_by) for row in rows] == [(first, 0, current_profile.id)]
+
+        asyncio.run(scenario())
+
+    def test_chunks_use_one_statement_each(self, async_session_factory, current_profile):
+        """Test that each chunk is a single executemany insert plus a commit"""
+        async def scenario():
+            async with async_session_factory() as db:
+                statements = count_statements(async_session_factory)
+                writer = InventoryBulkWriter(db, current_profile.id, chunk_size=100)
+                summary = await writer.apply(InventoryBulkRequest(create=[item(i) for i in range(250)]))
+                assert summary["created"] == 250
+                inserts = [statement for statement in statements if statement.startswith("INSERT INTO inventory_items")]
+                assert len(inserts) == 3
+                assert (await db.execute(select(func.count()).select_from(InventoryItem))).scalar() == 250
+
+        asyncio.run(scenario())
+
+    def test_snapshot_matches_rebuild(self, async_session_factory, current_profile):
+        """Test that the dashboard snapshot deltas from bulk writes match a full rebuild"""
+        async def scenario():
+            async with async_session_factory() as db:
+                await db.run_sync(rebuild_dashboard_snapshot)
+                writer = InventoryBulkWriter(db, current_profile.id, chunk_size=2)
+                summary = await writer.apply(InventoryBulkRequest(create=[item(i, status="low stock") for i in range(5)]))
+                ids = [result["id"] for result in summary["results"]]
+                await InventoryBulkWriter(db, current_profile.id, chunk_size=2).apply(InventoryBulkRequest(
+                    update=[{"id": ids[0], "stock": 0, "status": "out of stock"}, {"id": ids[1], "stock": 40}],
+                    delete=[ids[2]],
+                ))
+
+                db.expire_all()
+                incremental = await db.run_sync(lambda session: snapshot_metrics(get_dashboard_snapshot(session)))
+                rebuilt = await db.run_sync(lambda session: snapshot_metrics(rebuild_dashboard_snapshot(session)))
+                return incremental, rebuilt
+
+        incremental, rebuilt = asyncio.run(scenario())
+        for field in ("totalInventoryItems", "totalStock", "lowStockItems", "outOfStockItems"):
+            assert incremental[field] == rebuilt[field]
+        assert (rebuilt["totalInventoryItems"], rebuilt["lowStockItems"], rebuilt["outOfStockItems"]) == (4, 3, 1)
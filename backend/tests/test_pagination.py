@@ -0,0 +1,119 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.pagination import encode_cursor, decode_cursor, keyset_paginate, split_page
+from app.models import (
+    Base as ModelsBase, Customer, Employee, InventoryItem, Project, PurchaseOrder, SalesLead,
+    Supplier, Ticket, WorkOrder,
+)
+from app.models.finance import FinanceExpense, FinanceInvoice, Transaction
+
+@pytest.fixture
+def models_db():
+    """Session on an in-memory database with the core models"""
+    engine = create_engine("sqlite:///:memory:")
+    ModelsBase.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def fetch_all_pages(db, model, sort_column, limit, descending=False):
+    """Walk every page by following next_cursor"""
+    pages, cursor = [], None
+    while True:
+        query = keyset_paginate(db.query(model), sort_column, model.id, cursor, limit=limit, descending=descending)
+        rows, cursor = split_page(query.all(), sort_column, model.id, limit)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+class TestCursorEncoding:
+    """Test cases for opaque cursor tokens"""
+
+    def test_round_trip_datetime(self):
+        """Test that a datetime key survives encoding"""
+        created_at = datetime(2025, 7, 1, 12, 30, 15, 123456)
+        cursor = encode_cursor(created_at, "abc")
+
+        assert decode_cursor(cursor, Customer.created_at, Customer.id) == (created_at, "abc")
+
+    def test_invalid_cursor_rejected(self):
+        """Test that a garbled cursor is a 400"""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor("not-a-cursor", Customer.created_at, Customer.id)
+
+        assert exc_info.value.status_code == 400
+
+class TestKeysetPagination:
+    """Test cases for walking lists with cursors"""
+
+    def test_pages_cover_every_row_once_with_ties(self, models_db):
+        """Test that rows sharing a sort value are neither skipped nor repeated"""
+        same_time = datetime(2025, 1, 1)
+        for i in range(7):
+            models_db.add(Customer(name=f"c{i}", email=f"c{i}@example.com", created_at=same_time + timedelta(seconds=i // 3)))
+        models_db.commit()
+
+        pages = fetch_all_pages(models_db, Customer, Customer.created_at, limit=3)
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        names = [row.name for page in pages for row in page]
+        assert sorted(names) == [f"c{i}" for i in range(7)]
+
+    def test_descending_with_null_sort_values(self, models_db):
+        """Test that NULL sort values come last in descending order"""
+        for i in range(5):
+            models_db.add(Ticket(
+                ticket_number=f"TK-{i}", title=f"t{i}", description="d", created_by="u",
+                due_date=datetime(2025, 1, i + 1) if i % 2 == 0 else None
+            ))
+        models_db.commit()
+
+        pages = fetch_all_pages(models_db, Ticket, Ticket.due_date, limit=2, descending=True)
+        rows = [row for page in pages for row in page]
+
+        assert [row.title for row in rows[:3]] == ["t4", "t2", "t0"]
+        assert {row.title for row in rows[3:]} == {"t1", "t3"}
+
+    def test_offset_still_supported(self, models_db):
+        """Test that skip works when no cursor is given"""
+        for i in range(4):
+            models_db.add(Customer(name=f"c{i}", email=f"c{i}@example.com", created_at=datetime(2025, 1, 1, 0, 0, i)))
+        models_db.commit()
+
+        query = keyset_paginate(models_db.query(Customer), Customer.created_at, Customer.id, skip=2, limit=10)
+        rows, cursor = split_page(query.all(), Customer.created_at, Customer.id, 10)
+
+        assert [row.name for row in rows] == ["c2", "c3"]
+        assert cursor is None
+
+    @pytest.mark.parametrize("model", [
+        Customer, Employee, InventoryItem, Project, PurchaseOrder, SalesLead, Supplier, WorkOrder,
+        Transaction, FinanceInvoice, FinanceExpense,
+    ])
+    def test_cursor_pages_seek_on_an_index(self, model):
+        """Test that a cursor page is read from the (created_at, id) index, not scanned and sorted"""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(bind=engine)
+        ModelsBase.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        cursor = encode_cursor(datetime(2025, 1, 1), "abc")
+        query = keyset_paginate(session.query(model), model.created_at, model.id, cursor, limit=50)
+        statement = query.statement.compile(engine, compile_kwargs={"literal_binds": True})
+
+        plan = " | ".join(row[-1] for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}"))
+        session.close()
+
+        assert f"ix_{model.__tablename__}_created_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_unknown_sort_column_is_a_bad_request(self, client):
+        """Test that sorting tickets by a missing column is a 400"""
+        response = client.get("/api/v1/tickets/", params={"sort_by": "bogus"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Cannot sort by bogus"
@@ -0,0 +1,97 @@
+import pytest
+import asyncio
+import threading
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.hashing import PasswordHashPool
+from app.core import auth
+from app.api.endpoints.auth import login
+from app.models import User
+from app.schemas import UserLogin
+
+class TestPasswordHashPool:
+    """Test cases for the bounded password hashing pool"""
+
+    def test_runs_job_off_the_event_loop(self):
+        """Test that jobs run on a pool thread and are counted"""
+        pool = PasswordHashPool(workers=2, max_queue=4)
+
+        async def scenario():
+            return await pool.run(lambda: threading.current_thread().name)
+
+        try:
+            thread_name = asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+
+        assert thread_name.startswith("password-hash")
+        snapshot = pool.snapshot()
+        assert snapshot["completed"] == 1
+        assert snapshot["queued"] == 0
+        assert snapshot["running"] == 0
+
+    def test_rejects_when_queue_is_full(self):
+        """Test that jobs beyond the queue limit get a 503"""
+        pool = PasswordHashPool(workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def scenario():
+            blocking = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+            await asyncio.sleep(0)
+            with pytest.raises(HTTPException) as exc_info:
+                await pool.run(lambda: "rejected")
+            release.set()
+            await blocking
+            assert await queued == "queued"
+            return exc_info.value
+
+        try:
+            error = asyncio.run(scenario())
+        finally:
+            release.set()
+            pool.shutdown()
+
+        assert error.status_code == 503
+        assert pool.snapshot()["rejected"] == 1
+
+class TestRehashOnLogin:
+    """Test cases for upgrading password hashes when the bcrypt cost changes"""
+
+    def test_login_rehashes_outdated_cost(self, async_session_factory, monkeypatch):
+        """Test that a hash made with another cost is replaced after login"""
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+        monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5))
+
+        async def scenario():
+            async with async_session_factory() as db:
+                db.add(User(id="00000000-0000-0000-0000-000000000020", email="rehash@example.com", password_hash=old_hash))
+                await db.commit()
+
+                token = await login(UserLogin(email="rehash@example.com", password="secret"), db=db)
+                assert token["token_type"] == "bearer"
+
+                user = await db.get(User, "00000000-0000-0000-0000-000000000020")
+                return user.password_hash
+
+        new_hash = asyncio.run(scenario())
+
+        assert new_hash.startswith("$2b$05$")
+        assert auth.pwd_context.verify("secret", new_hash)
+
+    def test_login_rejects_wrong_password(self, async_session_factory):
+        """Test that a wrong password is still rejected"""
+        async def scenario():
+            async with async_session_factory() as db:
+                db.add(User(
+                    id="00000000-0000-0000-0000-000000000021", email="wrong@example.com",
+                    password_hash=CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+                ))
+                await db.commit()
+                with pytest.raises(HTTPException) as exc_info:
+                    await login(UserLogin(email="wrong@example.com", password="nope"), db=db)
+                return exc_info.value
+
+        assert asyncio.run(scenario()).status_code == 401
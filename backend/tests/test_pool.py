@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+from app.core.pool import PoolMetrics, pool_options, instrumented_pool_class, instrument_engine
+
+@pytest.fixture
+def metrics():
+    """Fresh pool metrics"""
+    return PoolMetrics("test")
+
+@pytest.fixture
+def small_engine(tmp_path, metrics):
+    """File-backed SQLite engine on an instrumented single-connection QueuePool"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    instrument_engine(engine, metrics)
+    yield engine
+    engine.dispose()
+
+class TestPoolOptions:
+    """Test cases for building engine pool options from settings"""
+
+    def test_mysql_gets_sized_instrumented_pool(self, metrics, monkeypatch):
+        """Test that pool sizing settings are applied to server databases"""
+        monkeypatch.setattr(settings, "db_pool_size", 12)
+        monkeypatch.setattr(settings, "db_max_overflow", 3)
+        monkeypatch.setattr(settings, "db_pool_pre_ping", "never")
+
+        options = pool_options("mysql+mysqlconnector://root@localhost/erpnew", metrics)
+
+        assert options["pool_size"] == 12
+        assert options["max_overflow"] == 3
+        assert options["pool_use_lifo"] is True
+        assert options["pool_pre_ping"] is False
+        assert issubclass(options["poolclass"], QueuePool)
+
+    def test_sqlite_skips_pool_sizing(self, metrics):
+        """Test that SQLite keeps its default pool"""
+        options = pool_options("sqlite:///:memory:", metrics)
+
+        assert "pool_size" not in options
+        assert "poolclass" not in options
+
+    def test_always_pre_ping_policy(self, metrics, monkeypatch):
+        """Test that the always policy enables SQLAlchemy's built-in pre-ping"""
+        monkeypatch.setattr(settings, "db_pool_pre_ping", "always")
+
+        assert pool_options("sqlite:///:memory:", metrics)["pool_pre_ping"] is True
+
+    def test_invalid_pre_ping_policy(self, metrics, monkeypatch):
+        """Test that an unknown pre-ping policy is rejected"""
+        monkeypatch.setattr(settings, "db_pool_pre_ping", "sometimes")
+
+        with pytest.raises(ValueError):
+            pool_options("sqlite:///:memory:", metrics)
+
+class TestPoolMetrics:
+    """Test cases for the connection pool metrics"""
+
+    def test_checkout_counted(self, small_engine, metrics):
+        """Test that checkouts, checked out connections and creations are tracked"""
+        with small_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert metrics.snapshot()["checked_out"] == 1
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkouts"] == 1
+        assert snapshot["checked_out"] == 0
+        assert snapshot["connections_created"] == 1
+        assert snapshot["waiters"] == 0
+
+    def test_checkout_timeout_counted(self, small_engine, metrics):
+        """Test that an exhausted pool records a timeout"""
+        with small_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                small_engine.connect()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkout_timeouts"] == 1
+        assert snapshot["waiters"] == 0
+
+    def test_recycle_counted(self, small_engine, metrics, monkeypatch):
+        """Test that connections older than db_pool_recycle count as recycled"""
+        monkeypatch.setattr(settings, "db_pool_recycle", 0)
+        small_engine.pool._recycle = 0
+        with small_engine.connect():
+            pass
+        with small_engine.connect():
+            pass
+
+        assert metrics.snapshot()["connections_recycled"] >= 1
+
+    def test_idle_pre_ping(self, tmp_path, metrics, monkeypatch):
+        """Test that the idle policy pings connections that sat in the pool"""
+        monkeypatch.setattr(settings, "db_pool_pre_ping", "idle")
+        monkeypatch.setattr(settings, "db_pool_pre_ping_idle_seconds", 0)
+        engine = instrument_engine(create_engine(f"sqlite:///{tmp_path / 'ping.db'}"), metrics)
+
+        with engine.connect():
+            pass
+        with engine.connect():
+            pass
+        engine.dispose()
+
+        assert metrics.snapshot()["pre_pings"] == 1
@@ -0,0 +1,88 @@
+import pytest
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, Session
+
+import app.core.database as database
+from app.core.config import settings
+from app.core.database import ReadYourWritesMiddleware, get_db, get_read_db
+
+@pytest.fixture
+def primary_and_replica(tmp_path, monkeypatch):
+    """Two SQLite files standing in for the primary and a read replica"""
+    factories = {}
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE origin (name TEXT)"))
+            conn.execute(text("INSERT INTO origin VALUES (:name)"), {"name": name})
+        factories[name] = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    monkeypatch.setattr(database, "SessionLocal", factories["primary"])
+    monkeypatch.setattr(database, "ReplicaSessionLocal", factories["replica"])
+    monkeypatch.setattr(database, "_primary_pins", {})
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 60)
+    return factories
+
+@pytest.fixture
+def routing_client(primary_and_replica):
+    """Minimal app exposing which database served a read"""
+    test_app = FastAPI()
+    test_app.add_middleware(ReadYourWritesMiddleware)
+
+    @test_app.get("/origin")
+    def read_origin(db: Session = Depends(get_read_db)):
+        return {"origin": db.execute(text("SELECT name FROM origin")).scalar()}
+
+    @test_app.post("/write")
+    def write(db: Session = Depends(get_db)):
+        return {"origin": db.execute(text("SELECT name FROM origin")).scalar()}
+
+    @test_app.post("/fail")
+    def fail():
+        raise HTTPException(status_code=400, detail="nope")
+
+    return TestClient(test_app)
+
+class TestReadReplicaRouting:
+    """Test cases for sending reads to the replica"""
+
+    def test_reads_use_replica(self, routing_client):
+        """Test that read-only handlers are served by the replica"""
+        response = routing_client.get("/origin", headers={"Authorization": "Bearer a"})
+
+        assert response.json() == {"origin": "replica"}
+
+    def test_writes_use_primary(self, routing_client):
+        """Test that get_db keeps going to the primary"""
+        response = routing_client.post("/write", headers={"Authorization": "Bearer a"})
+
+        assert response.json() == {"origin": "primary"}
+
+    def test_read_your_writes(self, routing_client):
+        """Test that a client's reads stick to the primary after it writes"""
+        routing_client.post("/write", headers={"Authorization": "Bearer a"})
+
+        own = routing_client.get("/origin", headers={"Authorization": "Bearer a"})
+        other = routing_client.get("/origin", headers={"Authorization": "Bearer b"})
+
+        assert own.json() == {"origin": "primary"}
+        assert other.json() == {"origin": "replica"}
+
+    def test_failed_write_does_not_pin(self, routing_client):
+        """Test that an error response does not pin the client to the primary"""
+        routing_client.post("/fail", headers={"Authorization": "Bearer a"})
+
+        response = routing_client.get("/origin", headers={"Authorization": "Bearer a"})
+
+        assert response.json() == {"origin": "replica"}
+
+    def test_pin_expires(self, routing_client, monkeypatch):
+        """Test that stickiness ends after read_your_writes_seconds"""
+        monkeypatch.setattr(settings, "read_your_writes_seconds", 0)
+        routing_client.post("/write", headers={"Authorization": "Bearer a"})
+
+        response = routing_client.get("/origin", headers={"Authorization": "Bearer a"})
+
+        assert response.json() == {"origin": "replica"}
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from fastapi import Response
+
+from app.models import Base as ModelsBase, Ticket
+from app.models.tickets import TICKET_INDEXES
+from app.api.endpoints.tickets import get_tickets
+
+@pytest.fixture
+def plan_db():
+    """Session on an in-memory database with the ticket tables"""
+    engine = create_engine("sqlite:///:memory:")
+    ModelsBase.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def query_plan(db, **params):
+    """EXPLAIN QUERY PLAN of the statement get_tickets runs for ``params``"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM tickets" in statement:
+            captured.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        get_tickets(response=Response(), skip=0, limit=50, db=db, **params)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return " | ".join(row[-1] for row in rows)
+
+class TestTicketIndexes:
+    """Test cases guarding the index usage of the ticket queue queries"""
+
+    def test_declared_on_both_ticket_models(self):
+        """Test that both mappings of the tickets table carry the index set"""
+        from app.models.tickets import Ticket as LegacyTicket
+
+        expected = {name for name, _ in TICKET_INDEXES}
+        assert expected <= {index.name for index in Ticket.__table__.indexes}
+        assert expected <= {index.name for index in LegacyTicket.__table__.indexes}
+
+    @pytest.mark.parametrize("params, index_name", [
+        ({"status": "open"}, "ix_tickets_status_created_at"),
+        ({"priority": "urgent"}, "ix_tickets_priority_created_at"),
+        ({"assigned_to": "agent-1", "sort_by": "due_date", "sort_order": "asc"}, "ix_tickets_assigned_status_due"),
+        ({"department": "IT", "sort_by": "priority"}, "ix_tickets_department_priority"),
+        ({"ticket_type": "bug"}, "ix_tickets_type_created_at"),
+        ({"created_by": "user-1"}, "ix_tickets_created_by_created_at"),
+        ({}, "ix_tickets_created_at"),
+    ])
+    def test_hot_queries_use_an_index(self, plan_db, params, index_name):
+        """Test that each queue view is served by its index instead of a table scan"""
+        plan = query_plan(plan_db, **params)
+
+        assert index_name in plan, plan
+        assert "SCAN tickets" not in plan.replace(f"SCAN tickets USING INDEX {index_name}", ""), plan
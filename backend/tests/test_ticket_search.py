@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi import Response
+
+from app.models import Base as ModelsBase, Ticket, TicketSearchTerm
+from sqlalchemy.dialects import mysql
+from app.services.ticket_search import tokenize, index_ticket, rebuild_ticket_search_index, _fulltext_search
+from app.api.endpoints.tickets import get_tickets
+
+@pytest.fixture
+def search_db():
+    """Session on an in-memory database with the ticket tables"""
+    engine = create_engine("sqlite:///:memory:")
+    ModelsBase.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def add_ticket(db, number, title, description, department="IT"):
+    ticket = Ticket(ticket_number=number, title=title, description=description, created_by="u", department=department)
+    db.add(ticket)
+    db.flush()
+    index_ticket(db, ticket)
+    db.commit()
+    return ticket
+
+def search(db, text, **filters):
+    return get_tickets(response=Response(), skip=0, limit=50, search=text, db=db, **filters)
+
+class TestTokenize:
+    """Test cases for splitting ticket text into index terms"""
+
+    def test_lowercases_and_keeps_short_words(self):
+        """Test that words are normalised and one-letter words kept"""
+        assert tokenize("Login FAILS on a Safari-17 build") == ["login", "fails", "on", "a", "safari", "17", "build"]
+
+    def test_empty_text(self):
+        """Test that missing text yields no terms"""
+        assert tokenize(None) == []
+
+class TestTicketSearch:
+    """Test cases for ranked ticket search on the inverted index"""
+
+    def test_title_match_ranks_above_description_match(self, search_db):
+        """Test relevance ordering by field weight"""
+        add_ticket(search_db, "TK-1", "Dashboard is slow", "Printer offline")
+        add_ticket(search_db, "TK-2", "Printer offline", "The dashboard shows nothing")
+
+        results = search(search_db, "printer")
+
+        assert [ticket.ticket_number for ticket in results] == ["TK-2", "TK-1"]
+
+    def test_all_words_must_match_and_last_is_prefix(self, search_db):
+        """Test AND semantics with a prefix on the last word"""
+        add_ticket(search_db, "TK-1", "Invoice export fails", "CSV download")
+        add_ticket(search_db, "TK-2", "Invoice layout", "Logo misplaced")
+
+        assert [ticket.ticket_number for ticket in search(search_db, "invoice expo")] == ["TK-1"]
+
+    def test_combines_with_filters(self, search_db):
+        """Test that search keeps the department filter"""
+        add_ticket(search_db, "TK-1", "VPN drops", "Reconnect needed", department="IT")
+        add_ticket(search_db, "TK-2", "VPN access request", "New hire", department="HR")
+
+        results = search(search_db, "vpn", department="HR")
+
+        assert [ticket.ticket_number for ticket in results] == ["TK-2"]
+
+    def test_reindex_on_update_and_rebuild(self, search_db):
+        """Test that stale terms disappear after re-indexing"""
+        ticket = add_ticket(search_db, "TK-1", "Old title", "Body")
+        ticket.title = "Fresh title"
+        index_ticket(search_db, ticket)
+        search_db.commit()
+
+        assert search(search_db, "old") == []
+        assert len(search(search_db, "fresh")) == 1
+
+        assert rebuild_ticket_search_index(search_db) == 1
+        assert search_db.query(TicketSearchTerm).filter(TicketSearchTerm.term == "fresh").count() == 1
+
+    def test_short_words_match_as_substrings(self, search_db):
+        """Test that words below the index length fall back to LIKE, alone or with indexed words"""
+        add_ticket(search_db, "TK-2025", "Printer on floor 5", "Paper jam")
+        add_ticket(search_db, "TK-1999", "Printer offline", "Needs a restart")
+
+        assert [ticket.ticket_number for ticket in search(search_db, "5")] == ["TK-2025"]
+        assert [ticket.ticket_number for ticket in search(search_db, "printer 5")] == ["TK-2025"]
+        assert {ticket.ticket_number for ticket in search(search_db, "a")} == {"TK-2025", "TK-1999"}
+
+    def test_fulltext_ranking_is_weighted_per_column(self, search_db):
+        """Test that the MySQL ORDER BY weights each column's MATCH score"""
+        query, relevance = _fulltext_search(search_db.query(Ticket), ["printer", "offl"], prefix=True)
+        sql = str(query.order_by(relevance.desc()).statement.compile(dialect=mysql.dialect()))
+
+        assert "MATCH (tickets.title, tickets.description, tickets.ticket_number) AGAINST" in sql
+        for column in ("ticket_number", "title", "description"):
+            assert f"MATCH (tickets.{column}) AGAINST" in sql
+
+    def test_relevance_search_rejects_a_cursor(self, client):
+        """Test that a cursor without sort_by is a 400 for relevance-ranked search"""
+        response = client.get("/api/v1/tickets/", params={"search": "printer", "cursor": "abc"})
+
+        assert response.status_code == 400
+        assert "pass sort_by" in response.json()["detail"]
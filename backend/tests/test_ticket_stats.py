@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base as ModelsBase, Ticket, TicketStatus, TicketPriority
+from app.services.ticket_stats import compute_ticket_stats, get_ticket_stats, invalidate_ticket_stats, ticket_stats_cache
+
+NOW = datetime(2025, 7, 1, 12, 0)
+
+@pytest.fixture
+def stats_db():
+    """Session on an in-memory database with the ticket tables"""
+    engine = create_engine("sqlite:///:memory:")
+    ModelsBase.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    ticket_stats_cache.clear()
+    yield session
+    session.close()
+    ticket_stats_cache.clear()
+
+def add_ticket(db, number, status=TicketStatus.open, priority=TicketPriority.medium, department=None,
+               module=None, assigned_to=None, due_date=None):
+    db.add(Ticket(
+        ticket_number=number, title=number, description="d", created_by="u", status=status, priority=priority,
+        department=department, module=module, assigned_to=assigned_to, due_date=due_date
+    ))
+    db.commit()
+
+class TestTicketStats:
+    """Test cases for single-pass ticket statistics"""
+
+    def test_totals_and_breakdowns(self, stats_db):
+        """Test that totals and breakdowns agree with the rows"""
+        add_ticket(stats_db, "TK-1", priority=TicketPriority.urgent, department="IT", module="Auth", assigned_to="a1",
+                   due_date=NOW - timedelta(days=1))
+        add_ticket(stats_db, "TK-2", status=TicketStatus.in_progress, priority=TicketPriority.high, department="IT",
+                   module="Billing", assigned_to="a1")
+        add_ticket(stats_db, "TK-3", status=TicketStatus.resolved, department="HR", module="Auth",
+                   due_date=NOW - timedelta(days=1))
+        add_ticket(stats_db, "TK-4", status=TicketStatus.closed)
+
+        stats = compute_ticket_stats(stats_db, now=NOW)
+
+        assert stats["total_tickets"] == 4
+        assert stats["open_tickets"] == 1
+        assert stats["in_progress_tickets"] == 1
+        assert stats["resolved_tickets"] == 1
+        assert stats["closed_tickets"] == 1
+        assert stats["urgent_tickets"] == 1
+        assert stats["high_priority_tickets"] == 1
+        assert stats["overdue_tickets"] == 1
+
+        by_department = {group["key"]: group["total_tickets"] for group in stats["by_department"]}
+        assert by_department == {"IT": 2, "HR": 1, None: 1}
+        assert stats["by_department"][0]["key"] == "IT"
+        by_module = {group["key"]: group for group in stats["by_module"]}
+        assert by_module["Auth"]["total_tickets"] == 2
+        assert by_module["Auth"]["overdue_tickets"] == 1
+        assert {group["key"]: group["total_tickets"] for group in stats["by_assignee"]} == {"a1": 2, None: 2}
+
+    def test_single_query(self, stats_db):
+        """Test that all statistics come from one statement"""
+        add_ticket(stats_db, "TK-1", department="IT")
+        statements = []
+        event.listen(stats_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        compute_ticket_stats(stats_db, now=NOW)
+
+        assert len(statements) == 1
+
+    def test_cache_until_invalidated(self, stats_db):
+        """Test that cached stats are served until a ticket write invalidates them"""
+        add_ticket(stats_db, "TK-1")
+        assert get_ticket_stats(stats_db)["total_tickets"] == 1
+
+        add_ticket(stats_db, "TK-2")
+        assert get_ticket_stats(stats_db)["total_tickets"] == 1
+
+        invalidate_ticket_stats()
+        assert get_ticket_stats(stats_db)["total_tickets"] == 2
@@ -0,0 +1,133 @@
+import pytest
+import asyncio
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.core.auth import create_access_token
+from app.models import User
+from app.models.finance import Transaction
+from app.services.transaction_import import TransactionImporter, iter_csv_records, import_progress
+
+CSV_HEADER = "type,amount,description,date,category,reference\n"
+
+def csv_row(reference, amount="10.5", description="Coffee"):
+    return f"income,{amount},{description},2025-01-02T00:00:00,sales,{reference}\n"
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+def chunked_sync(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+@pytest.fixture
+def auth_headers(async_session_factory):
+    """Bearer header for a user stored in the async test database"""
+    async def scenario():
+        async with async_session_factory() as db:
+            db.add(User(id="u1", email="u1@example.com", password_hash="x"))
+            db.add(User(id="u2", email="u2@example.com", password_hash="x"))
+            await db.commit()
+    asyncio.run(scenario())
+    import_progress.clear()
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': 'u1@example.com'})}"}
+
+class TestCsvParsing:
+    """Test cases for incremental CSV parsing"""
+
+    def test_records_split_across_chunks(self):
+        """Test that tiny chunks, quoted newlines and a BOM parse like a whole file"""
+        data = ("﻿" + CSV_HEADER + csv_row("r1", description='"multi\nline, with comma"') + csv_row("r2")).encode()
+
+        async def collect():
+            return [record async for record in iter_csv_records(chunked(data, 3))]
+
+        records = asyncio.run(collect())
+
+        assert [(line, record["reference"]) for line, record, _ in records] == [(2, "r1"), (4, "r2")]
+        assert records[0][1]["description"] == "multi\nline, with comma"
+        assert list(records[0][1])[0] == "type"
+
+class TestTransactionImport:
+    """Test cases for the streaming transaction import endpoint"""
+
+    def test_import_is_idempotent_on_reference(self, client, auth_headers, async_session_factory):
+        """Test that a re-upload inserts nothing and reports duplicates"""
+        body = (CSV_HEADER + csv_row("r1") + csv_row("r2") + csv_row("r2") + csv_row("r3", amount="abc")).encode()
+        headers = {**auth_headers, "Content-Type": "text/csv"}
+
+        first = client.post("/api/v1/finance/transactions/import", content=chunked_sync(body, 7), headers=headers).json()
+        assert (first["rows"], first["inserted"], first["duplicates"], first["failed"]) == (4, 2, 1, 1)
+        assert first["errors"][0]["line"] == 5
+        assert "amount" in first["errors"][0]["error"]
+
+        again = client.post("/api/v1/finance/transactions/import", content=body, headers=headers).json()
+        assert (again["inserted"], again["duplicates"]) == (0, 3)
+
+        async def references():
+            async with async_session_factory() as db:
+                return sorted((await db.execute(select(Transaction.reference))).scalars())
+        assert asyncio.run(references()) == ["r1", "r2"]
+
+    def test_ndjson_with_progress(self, client, auth_headers):
+        """Test NDJSON rows, missing references and the progress endpoint"""
+        lines = [
+            {"type": "expense", "amount": 5, "description": "Paper", "date": "2025-01-03T00:00:00", "category": "office", "reference": f"n{i}"}
+            for i in range(3)
+        ]
+        lines.append({"type": "expense", "amount": 1, "description": "No ref", "date": "2025-01-03T00:00:00", "category": "office"})
+        body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+
+        summary = client.post(
+            "/api/v1/finance/transactions/import?import_id=stmt-1", content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        ).json()
+
+        assert (summary["inserted"], summary["failed"]) == (3, 2)
+        assert [error["line"] for error in summary["errors"]] == [4, 5]
+        progress = client.get("/api/v1/finance/transactions/import/stmt-1", headers=auth_headers).json()
+        assert (progress["status"], progress["inserted"]) == ("completed", 3)
+
+    def test_progress_is_scoped_to_the_uploader(self, client, auth_headers):
+        """Test that other users cannot read an import and a running id cannot be reused"""
+        body = CSV_HEADER + csv_row("s1")
+        headers = {**auth_headers, "Content-Type": "text/csv"}
+        client.post("/api/v1/finance/transactions/import?import_id=stmt-2", content=body, headers=headers)
+
+        other = {"Authorization": f"Bearer {create_access_token(data={'sub': 'u2@example.com'})}"}
+        assert client.get("/api/v1/finance/transactions/import/stmt-2", headers=other).status_code == 404
+
+        import_progress.set(("u1", "stmt-3"), {"import_id": "stmt-3", "status": "running"})
+        response = client.post("/api/v1/finance/transactions/import?import_id=stmt-3", content=body, headers=headers)
+        assert response.status_code == 400
+
+    def test_batch_racing_another_writer_is_retried(self, async_session_factory):
+        """Test that a reference stored between the lookup and the INSERT is counted as a duplicate"""
+        async def scenario():
+            async with async_session_factory() as db:
+                db.add(Transaction(type="income", amount=1, description="Manual", date=datetime(2025, 1, 2),
+                                   category="sales", reference="r2"))
+                await db.commit()
+
+            async with async_session_factory() as db:
+                importer = TransactionImporter(db, "u1")
+                lookup = importer.existing_references
+                calls = []
+
+                async def stale_lookup(references):
+                    calls.append(references)
+                    return set() if len(calls) == 1 else await lookup(references)
+
+                importer.existing_references = stale_lookup
+                summary = await importer.run(iter_csv_records(chunked((CSV_HEADER + csv_row("r1") + csv_row("r2")).encode(), 64)))
+                references = sorted((await db.execute(select(Transaction.reference))).scalars())
+            return summary, references, len(calls)
+
+        summary, references, lookups = asyncio.run(scenario())
+
+        assert (summary["inserted"], summary["duplicates"], summary["failed"]) == (1, 1, 0)
+        assert references == ["r1", "r2"]
+        assert lookups == 2
@@ -0,0 +1,85 @@
+import pytest
+import json
+from datetime import datetime, timedelta
+from fastapi import Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Profile, User
+from app.api.endpoints.users import get_users, update_user_status, unlock_user_account, UserStatusUpdate
+
+@pytest.fixture
+def directory_db():
+    """Session on an in-memory database with a few profiles"""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    start = datetime(2025, 1, 1)
+    people = [
+        ("p1", "ada@example.com", "Ada", "Lovelace", None, False),
+        ("p2", "alan@example.com", "Alan", "Turing", "inactive", False),
+        ("p3", "grace@example.com", "Grace", "Hopper", "active", True),
+        ("p4", "linus@example.com", None, None, "active", None),
+    ]
+    for i, (profile_id, email, first_name, last_name, status, locked) in enumerate(people):
+        session.add(Profile(
+            id=profile_id, email=email, first_name=first_name, last_name=last_name,
+            status=status, account_locked=locked, created_at=start + timedelta(minutes=i),
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+def list_users(db, **params):
+    """Call get_users; returns (ids, next cursor)"""
+    params = {"skip": 0, "limit": 100, "cursor": None, "status": None, "locked": None, "search": None, **params}
+    page = get_users(Response(), current_user=User(id="admin"), db=db, **params)
+    return [user["id"] for user in json.loads(page.body)], page.headers.get("X-Next-Cursor")
+
+class TestUserDirectory:
+    """Test cases for the paginated, cached user directory"""
+
+    def test_filters(self, directory_db):
+        """Test status, lock and prefix filters, with unset status/lock treated as active/unlocked"""
+        assert list_users(directory_db, status="active")[0] == ["p1", "p3", "p4"]
+        assert list_users(directory_db, status="inactive")[0] == ["p2"]
+        assert list_users(directory_db, locked=True)[0] == ["p3"]
+        assert list_users(directory_db, locked=False)[0] == ["p1", "p2", "p4"]
+        assert list_users(directory_db, search="Tur")[0] == ["p2"]
+        assert list_users(directory_db, search="lin")[0] == ["p4"]
+        assert list_users(directory_db, search="a")[0] == ["p1", "p2"]
+
+    def test_cursor_pagination(self, directory_db):
+        """Test that the cursor walks through every profile once"""
+        ids, cursor = list_users(directory_db, limit=3)
+        assert ids == ["p1", "p2", "p3"]
+        rest, cursor = list_users(directory_db, limit=3, cursor=cursor)
+        assert rest == ["p4"]
+        assert cursor is None
+
+    def test_projection_and_serialized_fields(self, directory_db):
+        """Test that only directory columns are selected and defaults are applied"""
+        statements = []
+        event.listen(directory_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        page = get_users(Response(), skip=0, limit=1, cursor=None, status=None, locked=None, search=None,
+                         current_user=User(id="admin"), db=directory_db)
+
+        assert "avatar_url" not in statements[0]
+        assert json.loads(page.body)[0]["status"] == "active"
+        assert json.loads(page.body)[0]["account_locked"] is False
+
+    def test_pages_are_cached_until_a_write(self, directory_db):
+        """Test that repeated pages skip the database and admin writes invalidate them"""
+        list_users(directory_db, status="inactive")
+        statements = []
+        event.listen(directory_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        assert list_users(directory_db, status="inactive")[0] == ["p2"]
+        assert statements == []
+
+        update_user_status("p1", UserStatusUpdate(status="inactive"), current_user=User(id="admin"), db=directory_db)
+        assert list_users(directory_db, status="inactive")[0] == ["p1", "p2"]
+
+        unlock_user_account("p3", current_user=User(id="admin"), db=directory_db)
+        assert list_users(directory_db, locked=True)[0] == []
@@ -189,6 +189,24 @@ CREATE INDEX idx_tickets_compound_status_priority ON tickets(status, priority);
 CREATE INDEX idx_tickets_compound_department_module ON tickets(department, module);
 CREATE INDEX idx_tickets_due_date_status ON tickets(due_date, status);
 
+-- Composite indexes for the GET /tickets filter and sort combinations
+-- (kept in sync with TICKET_INDEXES in backend/app/models/tickets.py)
+CREATE INDEX ix_tickets_status_created_at ON tickets(status, created_at);
+CREATE INDEX ix_tickets_priority_created_at ON tickets(priority, created_at);
+CREATE INDEX ix_tickets_assigned_status_due ON tickets(assigned_to, status, due_date);
+CREATE INDEX ix_tickets_department_priority ON tickets(department, priority);
+CREATE INDEX ix_tickets_type_created_at ON tickets(ticket_type, created_at);
+CREATE INDEX ix_tickets_created_by_created_at ON tickets(created_by, created_at);
+CREATE INDEX ix_tickets_created_at ON tickets(created_at);
+CREATE INDEX ix_tickets_due_date ON tickets(due_date);
+
+-- Full-text indexes used by ticket search (GET /tickets?search=...): the
+-- combined one filters, the per-column ones weight the ranking
+CREATE FULLTEXT INDEX ft_tickets_search ON tickets(title, description, ticket_number);
+CREATE FULLTEXT INDEX ft_tickets_ticket_number ON tickets(ticket_number);
+CREATE FULLTEXT INDEX ft_tickets_title ON tickets(title);
+CREATE FULLTEXT INDEX ft_tickets_description ON tickets(description);
+
 -- Display table creation summary
 SELECT 
     'Ticket System Tables Created Successfully' as message,
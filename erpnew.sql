@@ -26,6 +26,7 @@ CREATE TABLE `blogs` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   UNIQUE KEY `slug` (`slug`),
+  KEY `ix_blogs_published_publish_date_id` (`published`,`publish_date`,`id`),
   KEY `created_by` (`created_by`),
   KEY `updated_by` (`updated_by`),
   CONSTRAINT `blogs_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`),
@@ -54,7 +55,8 @@ CREATE TABLE `finance_expenses` (
   `updated_at` datetime DEFAULT (now()),
   `created_by` char(36) DEFAULT NULL,
   PRIMARY KEY (`id`),
-  UNIQUE KEY `expense_number` (`expense_number`)
+  UNIQUE KEY `expense_number` (`expense_number`),
+  KEY `ix_finance_expenses_created_at_id` (`created_at`,`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 #
@@ -81,7 +83,8 @@ CREATE TABLE `finance_invoices` (
   `updated_at` datetime DEFAULT (now()),
   `created_by` char(36) DEFAULT NULL,
   PRIMARY KEY (`id`),
-  UNIQUE KEY `invoice_number` (`invoice_number`)
+  UNIQUE KEY `invoice_number` (`invoice_number`),
+  KEY `ix_finance_invoices_created_at_id` (`created_at`,`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 #
@@ -130,7 +133,11 @@ CREATE TABLE `profiles` (
   `created_at` datetime NOT NULL,
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
-  UNIQUE KEY `email` (`email`)
+  UNIQUE KEY `email` (`email`),
+  KEY `ix_profiles_status_locked` (`status`,`account_locked`),
+  KEY `ix_profiles_first_name` (`first_name`),
+  KEY `ix_profiles_last_name` (`last_name`),
+  KEY `ix_profiles_created_at_id` (`created_at`,`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 #
@@ -183,6 +190,7 @@ CREATE TABLE `inventory_items` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_inventory_items_created_at_id` (`created_at`,`id`),
   CONSTRAINT `inventory_items_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -317,6 +325,7 @@ CREATE TABLE `employees` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `employee_id` (`employee_id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_employees_created_at_id` (`created_at`,`id`),
   CONSTRAINT `employees_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -400,6 +409,7 @@ CREATE TABLE `customers` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_customers_created_at_id` (`created_at`,`id`),
   CONSTRAINT `customers_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -443,6 +453,7 @@ CREATE TABLE `chat_messages` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `user_id` (`user_id`),
+  KEY `ix_chat_messages_created_at_id` (`created_at`,`id`),
   CONSTRAINT `chat_messages_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -496,6 +507,7 @@ CREATE TABLE `projects` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_projects_created_at_id` (`created_at`,`id`),
   CONSTRAINT `projects_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -548,6 +560,7 @@ CREATE TABLE `sales_leads` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_sales_leads_created_at_id` (`created_at`,`id`),
   CONSTRAINT `sales_leads_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -607,6 +620,7 @@ CREATE TABLE `suppliers` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_suppliers_created_at_id` (`created_at`,`id`),
   CONSTRAINT `suppliers_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -636,6 +650,7 @@ CREATE TABLE `purchase_orders` (
   PRIMARY KEY (`id`),
   KEY `supplier_id` (`supplier_id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_purchase_orders_created_at_id` (`created_at`,`id`),
   CONSTRAINT `purchase_orders_ibfk_1` FOREIGN KEY (`supplier_id`) REFERENCES `suppliers` (`id`),
   CONSTRAINT `purchase_orders_ibfk_2` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -740,7 +755,9 @@ CREATE TABLE `transactions` (
   `created_at` datetime DEFAULT (now()),
   `updated_at` datetime DEFAULT (now()),
   `created_by` char(36) DEFAULT NULL,
-  PRIMARY KEY (`id`)
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `ix_transactions_reference` (`reference`),
+  KEY `ix_transactions_created_at_id` (`created_at`,`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 #
@@ -894,6 +911,7 @@ CREATE TABLE `work_orders` (
   `updated_at` datetime NOT NULL,
   PRIMARY KEY (`id`),
   KEY `created_by` (`created_by`),
+  KEY `ix_work_orders_created_at_id` (`created_at`,`id`),
   CONSTRAINT `work_orders_ibfk_1` FOREIGN KEY (`created_by`) REFERENCES `profiles` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 